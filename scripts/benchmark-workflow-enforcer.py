@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+SPARC Workflow Enforcer Benchmarks
+Times the workflow enforcer on synthetic design document trees and compares against a baseline
+"""
+
+import importlib.util
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+def load_enforcer_module():
+    """Import sparc-workflow-enforcer.py, whose file name is not a valid module name"""
+    script_path = Path(__file__).parent / "sparc-workflow-enforcer.py"
+    spec = importlib.util.spec_from_file_location("sparc_workflow_enforcer", script_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+enforcer_module = load_enforcer_module()
+SPARCWorkflowEnforcer = enforcer_module.SPARCWorkflowEnforcer
+
+FILLER_WORDS = (
+    "system user data service request response latency cache index module interface "
+    "component deployment schema endpoint validation workflow release metric"
+).split()
+
+# Full matrix; --quick drops the largest documents and project counts
+DOCUMENT_SIZES = [1_000, 100_000, 1_000_000, 10_000_000]
+SECTION_DENSITIES = [0.1, 2.0]  # headings per KB of document
+PROJECT_COUNTS = [1, 10, 100]
+
+def generate_document(required_sections: List[str], size: int, density: float, rng: random.Random) -> str:
+    """Build a Markdown document of roughly ``size`` bytes containing the required sections"""
+    heading_count = max(len(required_sections), int(size / 1000 * density))
+    titles = list(required_sections) + [f"Appendix {i}" for i in range(heading_count - len(required_sections))]
+    rng.shuffle(titles)
+
+    body_size = max(1, size // len(titles))
+    parts = ["# Synthetic Design Document\n\n"]
+    for title in titles:
+        parts.append(f"## {title}\n\n")
+        written = 0
+        while written < body_size:
+            line = " ".join(rng.choice(FILLER_WORDS) for _ in range(12)) + ".\n"
+            parts.append(line)
+            written += len(line)
+        parts.append("\n")
+    return "".join(parts)
+
+def generate_design_tree(root: Path, project_count: int, size: int, density: float, seed: int = 0):
+    """Create ``project_count`` projects with a full set of design documents each"""
+    rng = random.Random(seed)
+    agents = SPARCWorkflowEnforcer().agent_sequence
+    template = {a["output_file"]: generate_document(a["required_sections"], size, density, rng) for a in agents}
+
+    for i in range(project_count):
+        project_dir = root / f"project-{i:04d}"
+        project_dir.mkdir(parents=True)
+        for file_name, content in template.items():
+            (project_dir / file_name).write_text(content, encoding="utf-8")
+
+def time_call(func: Callable, repeat: int) -> float:
+    """Median wall time of ``func`` over ``repeat`` runs"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def run_benchmarks(quick: bool = False, repeat: int = 3) -> Dict[str, float]:
+    """Run the benchmark matrix and return median seconds per scenario
+
+    Every enforcer uses the synthetic tree as its source root, so import and
+    manifest scans cover that tree rather than the current directory.
+    """
+    sizes = DOCUMENT_SIZES[:-1] if quick else DOCUMENT_SIZES
+    project_counts = PROJECT_COUNTS[:-1] if quick else PROJECT_COUNTS
+    results = {}
+
+    work_dir = Path(tempfile.mkdtemp(prefix="sparc-bench-"))
+    try:
+        # Single project: document size x section density
+        for size in sizes:
+            for density in SECTION_DENSITIES:
+                root = work_dir / f"size-{size}-density-{density}"
+                generate_design_tree(root, 1, size, density)
+                design_root = str(root)
+                key = f"size={size},density={density}"
+                print(f"⏱️  {key}", file=sys.stderr)
+
+                results[f"get_agent_status[{key}]"] = time_call(
+                    lambda: SPARCWorkflowEnforcer("project-0000", design_root, source_root=design_root)
+                    .get_agent_status("tdd-guard-tester"),
+                    repeat)
+                results[f"get_workflow_status[{key}]"] = time_call(
+                    lambda: SPARCWorkflowEnforcer("project-0000", design_root, source_root=design_root)
+                    .get_workflow_status(),
+                    repeat)
+
+                warm = SPARCWorkflowEnforcer("project-0000", design_root, source_root=design_root)
+                warm.get_workflow_status()
+                results[f"get_workflow_status_warm[{key}]"] = time_call(warm.get_workflow_status, repeat)
+                results[f"generate_compliance_report[{key}]"] = time_call(
+                    lambda: SPARCWorkflowEnforcer("project-0000", design_root, source_root=design_root)
+                    .generate_compliance_report(),
+                    repeat)
+
+                shutil.rmtree(root)
+
+        # Many small projects
+        for count in project_counts:
+            root = work_dir / f"projects-{count}"
+            generate_design_tree(root, count, 1_000, 2.0)
+            design_root = str(root)
+            key = f"projects={count}"
+            print(f"⏱️  {key}", file=sys.stderr)
+
+            results[f"get_workflow_status_all_projects[{key}]"] = time_call(
+                lambda: [SPARCWorkflowEnforcer(p, design_root, source_root=design_root).get_workflow_status()
+                         for p in enforcer_module.discover_projects(design_root)],
+                repeat)
+            results[f"iter_project_statuses[{key}]"] = time_call(
+                lambda: list(enforcer_module.iter_project_statuses(design_root, source_root=design_root)), repeat)
+
+            shutil.rmtree(root)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+def compare_results(results: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[str]:
+    """Print a comparison table and return the scenarios that regressed"""
+    regressions = []
+    print(f"{'Scenario':<70} {'Baseline':>10} {'Current':>10} {'Change':>8}")
+    for name, seconds in sorted(results.items()):
+        if name not in baseline:
+            print(f"{name:<70} {'-':>10} {seconds:>10.4f} {'new':>8}")
+            continue
+
+        change = seconds / baseline[name] - 1 if baseline[name] else 0.0
+        marker = ""
+        if change > tolerance:
+            regressions.append(name)
+            marker = " ❌"
+        print(f"{name:<70} {baseline[name]:>10.4f} {seconds:>10.4f} {change:>+8.1%}{marker}")
+    return regressions
+
+def main():
+    """CLI interface for workflow enforcer benchmarks"""
+    if len(sys.argv) < 2:
+        print("Usage: python benchmark-workflow-enforcer.py <command> [args...]")
+        print("Commands:")
+        print("  run [--output <results.json>] [--baseline <baseline.json>] [--tolerance 0.2] [--quick]")
+        print("  compare <results.json> <baseline.json> [--tolerance 0.2]")
+        sys.exit(1)
+
+    command = sys.argv[1]
+    args = sys.argv[2:]
+
+    def option(name: str, default=None):
+        if name not in args:
+            return default
+        index = args.index(name) + 1
+        if index >= len(args) or args[index].startswith("--"):
+            print(f"❌ {name} needs a value")
+            sys.exit(1)
+        return args[index]
+
+    try:
+        tolerance = float(option("--tolerance", 0.2))
+    except ValueError:
+        print(f"❌ --tolerance takes a number, got: {option('--tolerance')}")
+        sys.exit(1)
+
+    if command == "run":
+        # Read before the run, so a bad option fails at startup rather than after minutes of timing
+        output = option("--output")
+        baseline_path = option("--baseline")
+        results = run_benchmarks(quick="--quick" in args)
+        report = {
+            "generated": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "results": results
+        }
+
+        if output:
+            with open(output, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"📄 Results written to {output}")
+
+        if baseline_path:
+            with open(baseline_path) as f:
+                baseline = json.load(f)["results"]
+            if compare_results(results, baseline, tolerance):
+                print("❌ Performance regressions detected")
+                sys.exit(1)
+            print("✅ No performance regressions")
+        else:
+            for name, seconds in sorted(results.items()):
+                print(f"{name:<70} {seconds:>10.4f}s")
+
+    elif command == "compare":
+        if len(args) < 2:
+            print("Usage: compare <results.json> <baseline.json> [--tolerance 0.2]")
+            sys.exit(1)
+
+        with open(args[0]) as f:
+            results = json.load(f)["results"]
+        with open(args[1]) as f:
+            baseline = json.load(f)["results"]
+
+        if compare_results(results, baseline, tolerance):
+            print("❌ Performance regressions detected")
+            sys.exit(1)
+        print("✅ No performance regressions")
+
+    else:
+        print(f"Unknown command: {command}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,11 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 import subprocess
 
+from sparc_agent_graph import AgentGraph
+
+# Agents up to the project planner write design documents; later outputs are implementation reports
+LAST_DESIGN_PHASE = 7
+
 class FrameworkIntegrationHooks:
     """Integration hooks for Claude Code and SPARC framework"""
     
@@ -130,16 +135,7 @@ class FrameworkIntegrationHooks:
     
     def _is_design_document(self, file_path: str) -> bool:
         """Check if file is a SPARC design document"""
-        design_patterns = [
-            'product_requirements.md',
-            'architecture_guide.md',
-            'ux_design.md',
-            'visual_concepts.md',
-            'database_design.md',
-            'api_specification.md',
-            'implementation_plan.md',
-            'technology-lock.json'
-        ]
+        design_patterns = list(self._design_documents()) + ['technology-lock.json']
         
         file_name = Path(file_path).name
         return any(pattern in file_name for pattern in design_patterns)
@@ -195,6 +191,15 @@ class FrameworkIntegrationHooks:
         try:
             agent_name = self._get_agent_for_document(file_path)
             if agent_name:
+                # Required sections are checked against the document's heading index. Drafts are
+                # saved incomplete many times, so the score is reported without blocking the edit.
+                cmd = ["python", "scripts/sparc-workflow-enforcer.py", "check-document", file_path]
+                result = subprocess.run(cmd, capture_output=True, text=True, cwd=self.project_root)
+                
+                if result.returncode != 0:
+                    print(f"⚠️  Design document {file_path} is not complete yet")
+                    print(result.stdout)
+                
                 cmd = ["python", "scripts/sparc-workflow-enforcer.py", "validate-agent", agent_name]
                 result = subprocess.run(cmd, capture_output=True, text=True, cwd=self.project_root)
                 
@@ -209,20 +214,14 @@ class FrameworkIntegrationHooks:
             print(f"⚠️  Workflow validation error: {e}")
             return True
     
+    def _design_documents(self) -> Dict[str, str]:
+        """Design document file names mapped to the agent that writes them"""
+        return {agent["output_file"]: agent["name"] for agent in AgentGraph.load().agents
+                if agent["phase"] <= LAST_DESIGN_PHASE}
+    
     def _get_agent_for_document(self, file_path: str) -> Optional[str]:
         """Get the agent responsible for a design document"""
-        document_to_agent = {
-            'product_requirements.md': 'product-manager',
-            'architecture_guide.md': 'solution-architect',
-            'ux_design.md': 'ux-designer',
-            'visual_concepts.md': 'visual-style-specialist',
-            'database_design.md': 'data-architect',
-            'api_specification.md': 'senior-api-developer',
-            'implementation_plan.md': 'project-planner'
-        }
-        
-        file_name = Path(file_path).name
-        return document_to_agent.get(file_name)
+        return self._design_documents().get(Path(file_path).name)
     
     def _has_corresponding_tests(self, file_path: str) -> bool:
         """Check if source file has corresponding tests"""
@@ -260,10 +259,22 @@ class FrameworkIntegrationHooks:
         try:
             with open(tech_lock_file) as f:
                 json.load(f)  # Validate JSON
-            return True
         except Exception:
             print("❌ technology-lock.json is invalid")
             return False
+        
+        # Source imports and declared dependencies must be allowed by the lock's package rules
+        passed = True
+        for check in ["check-imports", "check-dependencies"]:
+            try:
+                cmd = ["python", "scripts/sparc-workflow-enforcer.py", check]
+                result = subprocess.run(cmd, capture_output=True, text=True, cwd=self.project_root)
+                if result.returncode != 0:
+                    print(result.stdout)
+                    passed = False
+            except Exception:
+                pass  # Don't block if validation unavailable
+        return passed
     
     def _run_test_suite(self) -> bool:
         """Run test suite"""
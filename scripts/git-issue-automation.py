@@ -12,6 +12,8 @@ from datetime import datetime
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+from sparc_agent_graph import AgentGraph
+
 @dataclass
 class FrameworkViolation:
     """Represents a SPARC framework violation that needs Git issue tracking"""
@@ -265,17 +267,10 @@ This issue blocks all commits until resolved.
     
     def _get_blocked_agents(self, violation: FrameworkViolation) -> str:
         """Determine which agents are blocked by this violation"""
-        agent_sequence = [
-            "product-manager", "solution-architect", "ux-designer", 
-            "visual-style-specialist", "data-architect", "senior-api-developer", 
-            "project-planner", "senior-coder", "tdd-guard-tester"
-        ]
-        
         try:
-            current_index = agent_sequence.index(violation.agent.lower().replace(" ", "-"))
-            blocked = agent_sequence[current_index + 1:]
+            blocked = AgentGraph.load().blocked_by(violation.agent.lower().replace(" ", "-"))
             return ", ".join(blocked)
-        except ValueError:
+        except (KeyError, OSError, ValueError):
             return "All subsequent agents"
     
     def check_open_blockers(self) -> List[Dict]:
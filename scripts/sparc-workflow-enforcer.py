@@ -4,15 +4,40 @@ SPARC Workflow Enforcement System
 Validates agent sequence compliance and document completeness
 """
 
+import hashlib
+import html
 import os
 import json
+import mmap
+import select
+import sqlite3
+import struct
 import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
+from bisect import bisect_right
+from functools import lru_cache
 import re
 
+from sparc_agent_graph import AgentGraph
+from sparc_design_index import DesignIndexCache
+from sparc_tech_lock import ImportScanner, ManifestScanner, PackagePolicy
+
+# Minimum document completeness for an agent's output to unblock its dependents
+VALIDATION_THRESHOLD = 0.8
+
+# Version of the document scoring rules; bump it so stored scores are not reused after a change
+SCORER_VERSION = 2
+
+# Local history of evaluated statuses (see StatusSnapshotStore)
+DEFAULT_SNAPSHOT_DB = Path(".claude") / "sparc-status.db"
+
 @dataclass
 class AgentStatus:
     """Represents the status of a SPARC agent"""
@@ -34,174 +59,1124 @@ class WorkflowViolation:
     blocking: bool = True
     resolution_steps: List[str] = None
 
+@dataclass
+class HeadingNode:
+    """A Markdown heading and the section it opens"""
+    level: int
+    title: str
+    start: int  # byte offset of the heading line
+    end: int    # byte offset where the section (including subsections) ends
+    word_count: int = 0
+    bullet_count: int = 0
+    code_block_count: int = 0
+    table_count: int = 0
+    children: List["HeadingNode"] = field(default_factory=list)
+
+@dataclass
+class SectionDepth:
+    """Minimum content a required section must hold to count as present"""
+    min_words: int = 0
+    min_bullets: int = 0
+    min_code_blocks: int = 0
+    min_tables: int = 0
+    
+    @classmethod
+    def from_config(cls, agent_config: Dict) -> Dict[str, "SectionDepth"]:
+        """Per-section minimums from an agent's optional ``section_depth`` mapping"""
+        return {section: cls(**limits) for section, limits in agent_config.get("section_depth", {}).items()}
+    
+    def shortfalls(self, node: HeadingNode) -> List[str]:
+        """Describe each minimum the section does not reach"""
+        checks = [
+            (node.word_count, self.min_words, "words"),
+            (node.bullet_count, self.min_bullets, "bullets"),
+            (node.code_block_count, self.min_code_blocks, "code blocks"),
+            (node.table_count, self.min_tables, "tables")
+        ]
+        return [f"{actual}/{minimum} {label}" for actual, minimum, label in checks if actual < minimum]
+
+class _OutlineParser:
+    """Incremental heading-tree builder shared by the outline readers"""
+    
+    # MULTILINE so ``^`` also anchors at a line start inside a larger buffer
+    HEADING_RE = re.compile(rb"^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$", re.MULTILINE)
+    FENCE_RE = re.compile(rb"^ {0,3}(`{3,}|~{3,})", re.MULTILINE)
+    CLOSING_FENCE_RE = re.compile(rb"[ \t\n\r\x0b\x0c]*(`+|~+)[ \t\n\r\x0b\x0c]*")
+    BULLET_RE = re.compile(rb"[ \t]*(?:[-*+]|[0-9]{1,9}[.)])[ \t]+\S")
+    TABLE_RE = re.compile(rb"[ \t]*\|")
+    
+    def __init__(self):
+        self.root = HeadingNode(level=0, title="", start=0, end=0)
+        self.stack = [self.root]
+        self.fence = None
+        self.table_continues_at = -1  # start of the line that would extend the current table
+    
+    def structural_line(self, buffer, start: int, end: int, line_start: int) -> bool:
+        """Apply the line ``buffer[start:end]`` if it is a fence delimiter or heading
+        
+        Returns False for content lines, whose words the caller counts.
+        """
+        # Fence delimiters are markup, not content
+        if self.fence:
+            closing = self.CLOSING_FENCE_RE.fullmatch(buffer, start, end)
+            if (closing and closing.group(1)[:1] == self.fence[:1]
+                    and len(closing.group(1)) >= len(self.fence)):
+                self.fence = None
+                return True
+            return False
+        
+        fence = self.FENCE_RE.match(buffer, start, end)
+        if fence:
+            self.fence = fence.group(1)
+            self.stack[-1].code_block_count += 1
+            return True
+        
+        heading = self.HEADING_RE.match(buffer, start, end)
+        if not heading:
+            return False
+        
+        level = len(heading.group(1))
+        while self.stack[-1].level >= level:
+            self._close(line_start)
+        
+        title = (heading.group(2) or b"").decode("utf-8", errors="replace")
+        node = HeadingNode(level=level, title=title.strip("*_` \t"), start=line_start, end=line_start)
+        self.stack[-1].children.append(node)
+        self.stack.append(node)
+        return True
+    
+    def content_line(self, buffer, start: int, end: int, line_start: int, next_line_start: int):
+        """Credit a bullet or table to the innermost open section if the content line starts one"""
+        if self.fence:
+            return
+        if self.TABLE_RE.match(buffer, start, end):
+            if line_start != self.table_continues_at:
+                self.stack[-1].table_count += 1
+            self.table_continues_at = next_line_start
+        elif self.BULLET_RE.match(buffer, start, end):
+            self.stack[-1].bullet_count += 1
+    
+    def add_words(self, count: int):
+        """Credit words to the innermost open section"""
+        self.stack[-1].word_count += count
+    
+    def _close(self, end: int):
+        """Close the innermost open section and roll its size up to the parent"""
+        node = self.stack.pop()
+        node.end = end
+        parent = self.stack[-1]
+        parent.word_count += node.word_count
+        parent.bullet_count += node.bullet_count
+        parent.code_block_count += node.code_block_count
+        parent.table_count += node.table_count
+    
+    def finish(self, end: int) -> HeadingNode:
+        """Close all open sections at the end of the document"""
+        while len(self.stack) > 1:
+            self._close(end)
+        self.root.end = end
+        return self.root
+
+class MarkdownOutline:
+    """Heading tree of a Markdown document, built in one streaming pass
+    
+    Only ATX headings (``#`` to ``######``) outside fenced code blocks are
+    indexed. Documents are read line by line, or for large files through a
+    memory map in fixed-size chunks, so memory is bounded by the number of
+    headings rather than the size of the file. Each section's word, bullet,
+    code block and table counts are collected in the same pass.
+    """
+    
+    MMAP_THRESHOLD = 8 * 1024 * 1024
+    MMAP_CHUNK_SIZE = 256 * 1024
+    # Superset of the lines the parser treats specially (fences and headings);
+    # the newline-prefixed form lets the regex engine skip ahead by literal search
+    CANDIDATE_RE = re.compile(rb"[ \t\r\x0b\x0c]*(?:```|~~~|#)")
+    NEXT_CANDIDATE_RE = re.compile(rb"\n(?=[ \t\r\x0b\x0c]*(?:```|~~~|#))")
+    # Bullet lines and runs of table lines in the content between candidates,
+    # newline-prefixed for the same reason
+    NEXT_BULLET_RE = re.compile(rb"\n[ \t]*(?:[-*+]|[0-9]{1,9}[.)])[ \t]+\S")
+    TABLE_BLOCK_RE = re.compile(rb"[ \t]*\|[^\n]*(?:\n[ \t]*\|[^\n]*)*")
+    NEXT_TABLE_BLOCK_RE = re.compile(rb"\n[ \t]*\|[^\n]*(?:\n[ \t]*\|[^\n]*)*")
+    
+    def __init__(self, root: HeadingNode):
+        self.root = root
+        self._heading_index: Optional["HeadingIndex"] = None
+        self._title_text: Optional[Tuple[str, List[int], List[HeadingNode]]] = None
+    
+    @classmethod
+    def from_file(cls, file_path: Path, use_mmap: Optional[bool] = None) -> "MarkdownOutline":
+        """Build the outline of a Markdown file
+        
+        ``use_mmap`` defaults to memory-mapping files of MMAP_THRESHOLD bytes or more.
+        """
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if use_mmap is None:
+                use_mmap = size >= cls.MMAP_THRESHOLD
+            if not use_mmap or size == 0:
+                return cls.from_lines(f)
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                return cls.from_buffer(buffer)
+    
+    @classmethod
+    def from_lines(cls, lines: Iterable[bytes]) -> "MarkdownOutline":
+        """Build the outline from raw document lines (line endings included)"""
+        parser = _OutlineParser()
+        offset = 0
+        
+        for line in lines:
+            text = line.rstrip(b"\r\n")
+            if not parser.structural_line(text, 0, len(text), offset):
+                parser.content_line(text, 0, len(text), offset, offset + len(line))
+                parser.add_words(len(text.split()))
+            offset += len(line)
+        
+        return cls(parser.finish(offset))
+    
+    @classmethod
+    def from_buffer(cls, buffer, chunk_size: int = MMAP_CHUNK_SIZE) -> "MarkdownOutline":
+        """Build the outline from a bytes-like buffer such as an mmap
+        
+        Candidate fence and heading lines are located by regex directly in the
+        buffer; words in the text between them are counted chunk by chunk and
+        bullets and tables by regex over the same range, so
+        no line or copy larger than ``chunk_size`` is materialized (apart from
+        heading titles). The result is identical to from_lines().
+        """
+        parser = _OutlineParser()
+        size = len(buffer)
+        content_start = 0
+        
+        for line_start in cls._candidate_lines(buffer):
+            newline = buffer.find(b"\n", line_start)
+            line_end = size if newline == -1 else newline
+            text_end = line_end
+            while text_end > line_start and buffer[text_end - 1] == 0x0d:
+                text_end -= 1
+            
+            cls._add_content(parser, buffer, content_start, line_start, chunk_size)
+            content_start = line_start
+            if parser.structural_line(buffer, line_start, text_end, line_start):
+                content_start = min(line_end + 1, size)
+        
+        cls._add_content(parser, buffer, content_start, size, chunk_size)
+        return cls(parser.finish(size))
+    
+    @classmethod
+    def _candidate_lines(cls, buffer) -> Iterator[int]:
+        """Start offsets of the lines that may be fences or headings"""
+        if cls.CANDIDATE_RE.match(buffer):
+            yield 0
+        for match in cls.NEXT_CANDIDATE_RE.finditer(buffer):
+            yield match.end()
+    
+    @classmethod
+    def _add_content(cls, parser: _OutlineParser, buffer, start: int, end: int, chunk_size: int):
+        """Credit the words, bullets and tables of ``buffer[start:end]``, which holds no fences or headings"""
+        parser.add_words(cls._count_words(buffer, start, end, chunk_size))
+        if parser.fence or start >= end:
+            return
+        
+        # ``start`` is a line start: begin at the newline before it, or match the first line directly
+        node = parser.stack[-1]
+        bullets_from = tables_from = start - 1
+        if start == 0:
+            bullets_from = tables_from = 0
+            node.bullet_count += bool(parser.BULLET_RE.match(buffer, 0, end))
+            table = cls.TABLE_BLOCK_RE.match(buffer, 0, end)
+            if table:
+                node.table_count += 1
+                tables_from = table.end()
+        node.bullet_count += sum(1 for _ in cls.NEXT_BULLET_RE.finditer(buffer, bullets_from, end))
+        node.table_count += sum(1 for _ in cls.NEXT_TABLE_BLOCK_RE.finditer(buffer, tables_from, end))
+    
+    @staticmethod
+    def _count_words(buffer, start: int, end: int, chunk_size: int) -> int:
+        """Count whitespace-separated words in ``buffer[start:end]`` one chunk at a time"""
+        words = 0
+        in_word = False
+        for chunk_start in range(start, end, chunk_size):
+            chunk = buffer[chunk_start:min(chunk_start + chunk_size, end)]
+            words += len(chunk.split())
+            # A word cut by the chunk boundary was counted on both sides
+            if in_word and not chunk[:1].isspace():
+                words -= 1
+            in_word = not chunk[-1:].isspace()
+        return words
+    
+    def headings(self) -> Iterator[HeadingNode]:
+        """Iterate over all headings in document order"""
+        pending = list(reversed(self.root.children))
+        while pending:
+            node = pending.pop()
+            yield node
+            pending.extend(reversed(node.children))
+    
+    @property
+    def heading_index(self) -> "HeadingIndex":
+        """Token index of the headings, built on first use"""
+        if self._heading_index is None:
+            self._heading_index = HeadingIndex(list(self.headings()))
+        return self._heading_index
+    
+    def find_sections(self, required_sections: List[str], threshold: float = 1.0) -> Dict[str, HeadingNode]:
+        """Map each required section to the heading that names it
+        
+        The first heading whose title contains the section name wins. With a
+        ``threshold`` below 1.0, sections still missing are matched to the
+        most similar unclaimed heading scoring at least the threshold.
+        """
+        # One scan over all titles; newline separators keep matches within a title
+        if self._title_text is None:
+            nodes = list(self.headings())
+            text = "\n".join(node.title for node in nodes)
+            offsets, position = [], 0
+            for title in (text if len(text.lower()) == len(text) else text.lower()).split("\n"):
+                offsets.append(position)
+                position += len(title.encode("utf-8")) + 1
+            self._title_text = (text, offsets, nodes)
+        
+        text, offsets, nodes = self._title_text
+        matcher = SectionMatcher.for_sections(tuple(required_sections))
+        found: Dict[str, HeadingNode] = {
+            section: nodes[bisect_right(offsets, offset) - 1] for section, offset in matcher.scan(text).items()
+        }
+        
+        if threshold < 1.0 and len(found) < len(required_sections):
+            index = self.heading_index
+            claimed = {id(node) for node in found.values()}
+            used = [i for i, node in enumerate(index.nodes) if id(node) in claimed]
+            for section in required_sections:
+                if section in found:
+                    continue
+                match = index.best_match(section, threshold, exclude=used)
+                if match:
+                    found[section] = index.nodes[match[0]]
+                    used.append(match[0])
+        
+        return found
+
+class SectionMatcher:
+    """Finds required section names in heading titles in a single scan
+    
+    Every section name is compiled into one prefix-trie regex that is tried
+    at each position of the lowercased, newline-joined titles. The longest
+    name wins at a position and sections whose names are prefixes of it are
+    credited as well, so the result matches testing each name separately.
+    """
+    
+    def __init__(self, required_sections: List[str]):
+        self.required_sections = list(required_sections)
+        
+        pattern_sections: Dict[str, set] = {}
+        for section in self.required_sections:
+            pattern_sections.setdefault(section.lower(), set()).add(section)
+        
+        self._hit_sections = {
+            pattern: frozenset().union(*(sections for prefix, sections in pattern_sections.items()
+                                         if pattern.startswith(prefix)))
+            for pattern in pattern_sections
+        }
+        self._regex = re.compile(f"(?=({self._trie_regex(pattern_sections)}))")
+    
+    @classmethod
+    @lru_cache(maxsize=None)
+    def for_sections(cls, required_sections: Tuple[str, ...]) -> "SectionMatcher":
+        """Get the shared matcher for an agent's required sections"""
+        return cls(list(required_sections))
+    
+    @staticmethod
+    def _trie_regex(patterns) -> str:
+        """Render literal patterns as a regex that shares common prefixes"""
+        trie: Dict = {}
+        for pattern in patterns:
+            node = trie
+            for char in pattern:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        
+        def render(node: Dict) -> str:
+            branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+            # Optional greedy tail: prefer the longest pattern, fall back to this one
+            return f"(?:{body})?" if "" in node else body
+        
+        return render(trie)
+    
+    def scan(self, content: str) -> Dict[str, int]:
+        """Return the byte offset of the first hit of every section found"""
+        text = content.lower()
+        # Lowercasing can change the length of a few characters; fall back to offsets in the lowered text
+        source = content if len(text) == len(content) else text
+        
+        found: Dict[str, int] = {}
+        char_offset = byte_offset = 0
+        for match in self._regex.finditer(text):
+            new_sections = self._hit_sections[match.group(1)].difference(found)
+            if not new_sections:
+                continue
+            
+            byte_offset += len(source[char_offset:match.start()].encode("utf-8"))
+            char_offset = match.start()
+            for section in sorted(new_sections, key=self.required_sections.index):
+                found[section] = byte_offset
+            
+            if len(found) == len(self.required_sections):
+                break
+        
+        return found
+
+# Tolerant section matching: words that carry little meaning in a heading
+SECTION_STOPWORDS = {"a", "an", "and", "the", "of", "for", "to", "in", "on", "with"}
+GENERIC_SECTION_WORDS = {"overview", "consideration", "specification", "requirement", "design",
+                         "strategy", "note", "detail", "api"}
+GENERIC_WORD_WEIGHT = 0.25
+MIN_TOKEN_SIMILARITY = 0.6
+SECTION_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+def section_tokens(title: str) -> List[str]:
+    """Normalize a heading or section name into lowercase singular word tokens"""
+    tokens = []
+    for token in SECTION_TOKEN_RE.findall(title.lower()):
+        if token in SECTION_STOPWORDS or token.isdigit():
+            continue
+        if token.endswith("ies") and len(token) > 4:
+            token = token[:-3] + "y"
+        elif token.endswith("s") and len(token) > 3 and not token.endswith(("ss", "us", "is")):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+def _token_weight(token: str) -> float:
+    return GENERIC_WORD_WEIGHT if token in GENERIC_SECTION_WORDS else 1.0
+
+def _trigrams(token: str) -> set:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+class HeadingIndex:
+    """Normalized token and trigram index over a document's headings
+    
+    Built once per outline. A required section is scored only against the
+    headings that share a (possibly abbreviated or misspelled) token with
+    it, found through the inverted indexes rather than by comparing every
+    heading. Scores weight recall of the section's words over extra words
+    in the heading, and generic words such as "Overview" count for less.
+    """
+    
+    def __init__(self, nodes: List[HeadingNode]):
+        self.nodes = nodes
+        self.heading_tokens = [set(section_tokens(node.title)) for node in nodes]
+        self.heading_weights = [sum(_token_weight(t) for t in tokens) for tokens in self.heading_tokens]
+        self.postings: Dict[str, List[int]] = {}
+        for i, tokens in enumerate(self.heading_tokens):
+            for token in tokens:
+                self.postings.setdefault(token, []).append(i)
+        
+        self.trigram_postings: Dict[str, List[str]] = {}
+        for token in self.postings:
+            for trigram in _trigrams(token):
+                self.trigram_postings.setdefault(trigram, []).append(token)
+    
+    def similar_tokens(self, token: str) -> Dict[str, float]:
+        """Heading vocabulary tokens matching a token, with the credit each earns
+        
+        Exact tokens and abbreviations (one token a prefix of the other, at
+        least three characters) earn full credit; misspellings earn partial
+        credit that grows with their trigram similarity.
+        """
+        matches = {token: 1.0} if token in self.postings else {}
+        trigrams = _trigrams(token)
+        candidates = {c for trigram in trigrams for c in self.trigram_postings.get(trigram, ())}
+        for candidate in candidates - matches.keys():
+            if candidate.startswith(token) or token.startswith(candidate):
+                matches[candidate] = 1.0
+                continue
+            other = _trigrams(candidate)
+            similarity = len(trigrams & other) / len(trigrams | other)
+            if similarity >= MIN_TOKEN_SIMILARITY:
+                matches[candidate] = (1.0 + similarity) / 2
+        return matches
+    
+    def best_match(self, section: str, threshold: float, exclude: Iterable[int] = ()) -> Optional[Tuple[int, float]]:
+        """Position and score of the best heading for a section, if any reaches the threshold"""
+        required = set(section_tokens(section))
+        if not required:
+            return None
+        
+        # heading -> {required token: credit} and {heading token: credit}
+        recall_credit: Dict[int, Dict[str, float]] = {}
+        precision_credit: Dict[int, Dict[str, float]] = {}
+        for token in required:
+            for candidate, credit in self.similar_tokens(token).items():
+                for i in self.postings[candidate]:
+                    by_required = recall_credit.setdefault(i, {})
+                    by_required[token] = max(by_required.get(token, 0.0), credit)
+                    by_heading = precision_credit.setdefault(i, {})
+                    by_heading[candidate] = max(by_heading.get(candidate, 0.0), credit)
+        
+        required_weight = sum(_token_weight(t) for t in required)
+        excluded = set(exclude)
+        best = None
+        for i in sorted(recall_credit):
+            if i in excluded:
+                continue
+            recall = sum(_token_weight(t) * c for t, c in recall_credit[i].items()) / required_weight
+            precision = sum(_token_weight(t) * c for t, c in precision_credit[i].items()) / self.heading_weights[i]
+            score = 0.75 * recall + 0.25 * precision
+            if score >= threshold and (best is None or score > best[1]):
+                best = (i, score)
+        return best
+
+class DesignDocumentWatcher:
+    """Reports which files change in a design documents directory
+    
+    Uses Linux inotify (through ctypes) when available and falls back to
+    polling file signatures on other platforms or when the directory does not
+    exist yet.
+    """
+    
+    # inotify event masks (see inotify(7))
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    EVENT_HEADER = struct.Struct("iIII")
+    
+    def __init__(self, directory: Path, poll_interval: float = 1.0, debounce: float = 0.1):
+        self.directory = Path(directory)
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self._inotify_fd = self._init_inotify()
+        self._snapshot = self._scan() if self._inotify_fd is None else {}
+    
+    @property
+    def backend(self) -> str:
+        """Name of the change detection mechanism in use"""
+        return "inotify" if self._inotify_fd is not None else "polling"
+    
+    def _init_inotify(self) -> Optional[int]:
+        """Set up an inotify watch, returning None when unavailable"""
+        if not sys.platform.startswith("linux") or not self.directory.is_dir():
+            return None
+        
+        try:
+            import ctypes
+            import ctypes.util
+            
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(os.O_CLOEXEC)
+            if fd < 0:
+                return None
+            
+            mask = (self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_FROM |
+                    self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE)
+            if libc.inotify_add_watch(fd, os.fsencode(self.directory), mask) < 0:
+                os.close(fd)
+                return None
+            return fd
+        except (OSError, AttributeError):
+            return None
+    
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """Snapshot file signatures for polling"""
+        try:
+            with os.scandir(self.directory) as entries:
+                return {
+                    entry.name: (entry.stat().st_mtime_ns, entry.stat().st_size)
+                    for entry in entries if entry.is_file()
+                }
+        except OSError:
+            return {}
+    
+    def wait_for_changes(self, timeout: Optional[float] = None) -> set:
+        """Block until files change and return their names (empty on timeout)"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if self._inotify_fd is not None:
+                changed = self._read_inotify(remaining)
+            else:
+                time.sleep(self.poll_interval if remaining is None else min(self.poll_interval, remaining))
+                snapshot = self._scan()
+                changed = {name for name in snapshot.keys() | self._snapshot.keys()
+                           if snapshot.get(name) != self._snapshot.get(name)}
+                self._snapshot = snapshot
+            
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+    
+    def _read_inotify(self, timeout: Optional[float]) -> set:
+        """Collect changed file names from inotify, coalescing bursts of events"""
+        changed = set()
+        ready, _, _ = select.select([self._inotify_fd], [], [], timeout)
+        
+        while ready:
+            buffer = os.read(self._inotify_fd, 64 * 1024)
+            offset = 0
+            while offset < len(buffer):
+                _, _, _, name_length = self.EVENT_HEADER.unpack_from(buffer, offset)
+                offset += self.EVENT_HEADER.size
+                name = buffer[offset:offset + name_length].rstrip(b"\0")
+                offset += name_length
+                if name:
+                    changed.add(os.fsdecode(name))
+            
+            # Editors write files in several steps; wait briefly for the burst to finish
+            ready, _, _ = select.select([self._inotify_fd], [], [], self.debounce)
+        
+        return changed
+    
+    def close(self):
+        """Release the inotify descriptor"""
+        if self._inotify_fd is not None:
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
+
+class GitObjectReader:
+    """Reads git objects through one long-lived ``git cat-file --batch`` process"""
+    
+    def __init__(self, repo_dir: str = "."):
+        self._process = subprocess.Popen(
+            ["git", "cat-file", "--batch"], cwd=repo_dir,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+        # Directory tree entry lookups, keyed by (tree id, entry name)
+        self._entries: Dict[Tuple[str, bytes], Optional[str]] = {}
+    
+    def read(self, object_name: str) -> Tuple[str, bytes]:
+        """Get the type and contents of an object"""
+        self._process.stdin.write(object_name.encode() + b"\n")
+        self._process.stdin.flush()
+        header = self._process.stdout.readline().split()
+        if len(header) != 3:
+            raise KeyError(f"Git object not found: {object_name}")
+        
+        data = self._process.stdout.read(int(header[2]) + 1)
+        return header[1].decode(), data[:-1]
+    
+    @staticmethod
+    def parse_tree(data: bytes) -> Dict[bytes, str]:
+        """Map entry names to object ids in a raw tree object"""
+        entries = {}
+        pos = 0
+        while pos < len(data):
+            name_start = data.index(b" ", pos) + 1
+            name_end = data.index(b"\0", name_start)
+            entries[data[name_start:name_end]] = data[name_end + 1:name_end + 21].hex()
+            pos = name_end + 21
+        return entries
+    
+    def tree_entry(self, tree_id: str, name: bytes) -> Optional[str]:
+        """Get the object id of one entry in a tree, or None if it is absent"""
+        key = (tree_id, name)
+        if key not in self._entries:
+            object_type, data = self.read(tree_id)
+            self._entries[key] = self.parse_tree(data).get(name) if object_type == "tree" else None
+        return self._entries[key]
+    
+    def directory_tree(self, commit_id: str, path_parts: Iterable[str]) -> Optional[str]:
+        """Get the tree id of a directory at a commit, or None if it does not exist"""
+        _, commit = self.read(commit_id)
+        tree_id = commit.split(b"\n", 1)[0].split()[1].decode()
+        for part in path_parts:
+            tree_id = self.tree_entry(tree_id, part.encode())
+            if tree_id is None:
+                return None
+        return tree_id
+    
+    def close(self):
+        """Stop the cat-file process"""
+        if self._process.poll() is None:
+            self._process.stdin.close()
+            self._process.wait()
+
+class StatusSnapshotStore:
+    """Append-only SQLite history of evaluated agent statuses
+    
+    Every full evaluation pass is stored as one row per agent, keyed by
+    project, agent, document content hash and timestamp. Scores are also
+    looked up by content hash, so a document whose contents have already
+    been scored is never scored again. Only the latest ``max_passes``
+    passes of each project are kept.
+    """
+    
+    MAX_PASSES = 5000
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS agent_snapshots (
+            project TEXT NOT NULL,
+            agent TEXT NOT NULL,
+            content_hash TEXT,
+            recorded_at REAL NOT NULL,
+            phase INTEGER NOT NULL,
+            completed INTEGER NOT NULL,
+            validation_score REAL NOT NULL,
+            dependencies_met INTEGER NOT NULL,
+            sections_hash TEXT NOT NULL,
+            PRIMARY KEY (project, agent, recorded_at)
+        );
+        CREATE INDEX IF NOT EXISTS idx_snapshots_project_time ON agent_snapshots (project, recorded_at);
+        CREATE INDEX IF NOT EXISTS idx_snapshots_agent_time ON agent_snapshots (agent, recorded_at);
+        CREATE INDEX IF NOT EXISTS idx_snapshots_content ON agent_snapshots (content_hash, agent, sections_hash);
+    """
+    
+    def __init__(self, db_path: Path = DEFAULT_SNAPSHOT_DB, max_passes: int = MAX_PASSES):
+        self.db_path = Path(db_path)
+        self.max_passes = max_passes
+        if str(db_path) != ":memory:":
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(db_path), timeout=30)
+        self._connection.executescript(self.SCHEMA)
+    
+    @staticmethod
+    def sections_hash(required_sections: List[str], threshold: float = 1.0,
+                      section_depth: Optional[Dict[str, Dict]] = None) -> str:
+        """Fingerprint of the rules a score was computed against"""
+        rules = {"sections": required_sections, "threshold": threshold, "scorer": SCORER_VERSION}
+        if section_depth:
+            rules["depth"] = section_depth
+        rules = json.dumps(rules, sort_keys=True)
+        return hashlib.sha256(rules.encode("utf-8")).hexdigest()[:16]
+    
+    def find_score(self, agent_name: str, content_hash: str, sections_hash: str) -> Optional[float]:
+        """Get a previously stored score for identical document contents, if any"""
+        row = self._connection.execute(
+            "SELECT validation_score FROM agent_snapshots "
+            "WHERE content_hash = ? AND agent = ? AND sections_hash = ? LIMIT 1",
+            (content_hash, agent_name, sections_hash)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def record(self, project_name: str, statuses: Dict[str, AgentStatus],
+               content_hashes: Dict[str, str], sections_hashes: Dict[str, str],
+               recorded_at: Optional[float] = None):
+        """Append one evaluation pass (all agents share the same timestamp), dropping passes beyond the limit"""
+        recorded_at = time.time() if recorded_at is None else recorded_at
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO agent_snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(project_name, name, content_hashes.get(name), recorded_at, status.phase,
+                  int(status.completed), status.validation_score, int(status.dependencies_met),
+                  sections_hashes[name])
+                 for name, status in statuses.items()]
+            )
+            self._prune(project_name)
+    
+    def _prune(self, project_name: str):
+        """Delete a project's passes older than its latest ``max_passes``"""
+        self._connection.execute(
+            "DELETE FROM agent_snapshots WHERE project = ? AND recorded_at < ("
+            "SELECT recorded_at FROM (SELECT DISTINCT recorded_at FROM agent_snapshots WHERE project = ? "
+            "ORDER BY recorded_at DESC LIMIT 1 OFFSET ?))",
+            (project_name, project_name, self.max_passes - 1)
+        )
+    
+    def score_history(self, agent_name: str, project_name: Optional[str] = None) -> List[Dict]:
+        """Validation scores of an agent over time, oldest first"""
+        query = ("SELECT project, recorded_at, validation_score, completed, content_hash "
+                 "FROM agent_snapshots WHERE agent = ?")
+        params: List = [agent_name]
+        if project_name is not None:
+            query += " AND project = ?"
+            params.append(project_name)
+        
+        return [
+            {"project": project, "recorded_at": recorded_at, "validation_score": score,
+             "completed": bool(completed), "content_hash": content_hash}
+            for project, recorded_at, score, completed, content_hash
+            in self._connection.execute(query + " ORDER BY recorded_at", params)
+        ]
+    
+    def phase_history(self, project_name: str) -> List[Tuple[float, int]]:
+        """Current phase of a project at every recorded evaluation pass"""
+        return self._connection.execute(
+            "SELECT recorded_at, MAX(CASE WHEN completed AND validation_score >= ? THEN phase ELSE 0 END) "
+            "FROM agent_snapshots WHERE project = ? GROUP BY recorded_at ORDER BY recorded_at",
+            (VALIDATION_THRESHOLD, project_name)
+        ).fetchall()
+    
+    def time_in_phase(self, project_name: str, until: Optional[float] = None) -> Dict[int, float]:
+        """Seconds a project spent in each phase, from consecutive snapshots
+        
+        The most recent phase is counted up to ``until`` (default: now).
+        """
+        history = self.phase_history(project_name)
+        until = time.time() if until is None else until
+        durations: Dict[int, float] = {}
+        for (started, phase), (ended, _) in zip(history, history[1:] + [(until, None)]):
+            durations[phase] = durations.get(phase, 0.0) + max(0.0, ended - started)
+        return durations
+    
+    def close(self):
+        """Close the database connection"""
+        self._connection.close()
+
 class SPARCWorkflowEnforcer:
     """Enforces SPARC agent workflow sequence and validation"""
     
-    def __init__(self, project_name: str = "", design_docs_path: str = "docs/design"):
+    def __init__(self, project_name: str = "", design_docs_path: str = "docs/design",
+                 config_path: Optional[str] = None, snapshot_store: Optional[StatusSnapshotStore] = None,
+                 source_root: str = "."):
         self.project_name = project_name
         self.design_docs_path = Path(design_docs_path) / project_name if project_name else Path(design_docs_path)
         
-        # Define SPARC agent sequence with dependencies
-        self.agent_sequence = [
-            {
-                "name": "product-manager",
-                "phase": 1,
-                "output_file": "product_requirements.md",
-                "dependencies": [],
-                "required_sections": [
-                    "Elevator Pitch", "Who is this app for", "Functional Requirements",
-                    "User Stories", "User Interface Overview", "Success Metrics",
-                    "Constraints & Assumptions", "Roadmap Overview"
-                ]
-            },
-            {
-                "name": "solution-architect", 
-                "phase": 2,
-                "output_file": "architecture_guide.md",
-                "dependencies": ["product-manager"],
-                "required_sections": [
-                    "Architecture Overview", "Technology Stack", "System Design",
-                    "Security Considerations", "Performance Requirements", "Deployment Strategy"
-                ]
-            },
-            {
-                "name": "ux-designer",
-                "phase": 3,
-                "output_file": "ux_design.md",
-                "dependencies": ["product-manager", "solution-architect"],
-                "required_sections": [
-                    "User Interface Design", "User Experience Flow", "Responsive Design",
-                    "Accessibility", "Wireframes", "Component Specifications"
-                ]
-            },
-            {
-                "name": "visual-style-specialist",
-                "phase": 4,
-                "output_file": "visual_concepts.md",
-                "dependencies": ["ux-designer"],
-                "required_sections": [
-                    "Visual Style Concepts", "Color Palettes", "Typography",
-                    "Visual Elements", "Brand Guidelines", "Implementation Notes"
-                ]
-            },
-            {
-                "name": "data-architect",
-                "phase": 5,
-                "output_file": "database_design.md",
-                "dependencies": ["solution-architect", "ux-designer"],
-                "required_sections": [
-                    "Database Schema", "Entity Relationships", "Data Models",
-                    "Performance Considerations", "Migration Strategy", "Security"
-                ]
-            },
-            {
-                "name": "senior-api-developer",
-                "phase": 6,
-                "output_file": "api_specification.md",
-                "dependencies": ["data-architect", "solution-architect"],
-                "required_sections": [
-                    "API Overview", "Endpoint Specifications", "Request/Response Models",
-                    "Authentication", "Error Handling", "Rate Limiting"
-                ]
-            },
-            {
-                "name": "project-planner",
-                "phase": 7,
-                "output_file": "implementation_plan.md",
-                "dependencies": ["senior-api-developer", "visual-style-specialist"],
-                "required_sections": [
-                    "Implementation Phases", "Task Breakdown", "Timeline",
-                    "Resource Requirements", "Risk Assessment", "Success Criteria"
-                ]
-            },
-            {
-                "name": "senior-coder",
-                "phase": 8,
-                "output_file": "implementation_status.md",
-                "dependencies": ["project-planner"],
-                "required_sections": [
-                    "Implementation Progress", "Code Quality Metrics", "TDD Compliance",
-                    "Performance Metrics", "Security Validation", "Integration Status"
-                ]
-            },
-            {
-                "name": "tdd-guard-tester",
-                "phase": 9,
-                "output_file": "testing_report.md",
-                "dependencies": ["senior-coder"],
-                "required_sections": [
-                    "Test Coverage Report", "Quality Assurance Results", "Performance Tests",
-                    "Security Tests", "Integration Tests", "Deployment Validation"
-                ]
-            }
-        ]
+        # Source tree and manifests checked against the technology lock's package rules
+        self.import_scanner = ImportScanner(source_root)
+        self.manifest_scanner = ManifestScanner(source_root)
+        
+        # Entity and endpoint indexes of the design documents, cached by content hash
+        self.design_index = DesignIndexCache()
+        
+        # SPARC agent sequence with dependencies, compiled from the shared agent graph config
+        self.agent_graph = AgentGraph.load(config_path)
+        self.agent_sequence = self.agent_graph.agents
+        self.section_match_threshold = self.agent_graph.section_match_threshold
+        
+        # Dependency order is fixed per graph; document scores are memoized by file signature
+        self._evaluation_order = [self.agent_sequence[i] for i in self.agent_graph.topological_order]
+        self._section_depths = {a["name"]: SectionDepth.from_config(a) for a in self.agent_sequence}
+        self._document_scores: Dict[str, Tuple[Tuple[int, int], float, Optional[str]]] = {}
+        self._document_outlines: Dict[str, Tuple[Tuple[int, int], MarkdownOutline]] = {}
+        
+        # Last evaluated statuses, updated incrementally by refresh_statuses(), and the
+        # signatures of the documents they were evaluated from
+        self._statuses: Dict[str, AgentStatus] = {}
+        self._status_signatures: Dict[str, Optional[Tuple[int, int]]] = {}
+        
+        # Optional status history; full evaluation passes are appended to it
+        self.snapshot_store = snapshot_store
+        self._sections_hashes = {
+            a["name"]: StatusSnapshotStore.sections_hash(a["required_sections"], self.section_match_threshold,
+                                                         a.get("section_depth"))
+            for a in self.agent_sequence
+        }
     
     def get_agent_status(self, agent_name: str) -> AgentStatus:
         """Get current status of a specific agent"""
-        agent_config = next((a for a in self.agent_sequence if a["name"] == agent_name), None)
-        if not agent_config:
-            raise ValueError(f"Unknown agent: {agent_name}")
+        self._get_agent_config(agent_name)
+        return self._evaluate_statuses([agent_name])[agent_name]
+    
+    def _get_agent_config(self, agent_name: str) -> Dict:
+        """Look up an agent's configuration by name"""
+        return self.agent_graph.get_agent(agent_name)
+    
+    def _evaluate_statuses(self, agent_names: Optional[List[str]] = None) -> Dict[str, AgentStatus]:
+        """Evaluate agents exactly once each, in dependency order
+        
+        Only the requested agents and their transitive dependencies are evaluated
+        (all agents when none are given). Dependency checks read the statuses
+        computed earlier in the same pass instead of re-evaluating them.
+        """
+        for name in agent_names or []:
+            self._get_agent_config(name)
+        required = self.agent_graph.closure_bits(agent_names) if agent_names is not None else None
+        statuses: Dict[str, AgentStatus] = {}
+        
+        for agent_config in self._evaluation_order:
+            if required is not None and not required >> self.agent_graph.index[agent_config["name"]] & 1:
+                continue
+            
+            status = self._evaluate_agent(agent_config)
+            status.dependencies_met = all(
+                self._dependency_satisfied(statuses[dep]) for dep in agent_config["dependencies"]
+            )
+            statuses[agent_config["name"]] = status
+        
+        if agent_names is None:
+            self._record_snapshot(statuses)
+        return statuses
+    
+    def refresh_statuses(self, changed_agents: Optional[Iterable[str]] = None) -> Dict[str, AgentStatus]:
+        """Incrementally update the in-memory statuses after documents change
+        
+        Only the changed agents and their downstream dependents are
+        re-evaluated; everything else keeps its previous status. Returns the
+        statuses that were recomputed (all of them on the first call).
+        """
+        if not self._statuses or changed_agents is None:
+            self._status_signatures = {a["name"]: self._document_signature(a) for a in self.agent_sequence}
+            self._statuses = self._evaluate_statuses()
+            return dict(self._statuses)
+        
+        affected = self.agent_graph.closure_bits(changed_agents, downstream=True)
+        recomputed = {}
+        for agent_config in self._evaluation_order:
+            if not affected >> self.agent_graph.index[agent_config["name"]] & 1:
+                continue
+            
+            self._status_signatures[agent_config["name"]] = self._document_signature(agent_config)
+            status = self._evaluate_agent(agent_config)
+            status.dependencies_met = all(
+                self._dependency_satisfied(self._statuses[dep]) for dep in agent_config["dependencies"]
+            )
+            self._statuses[agent_config["name"]] = recomputed[agent_config["name"]] = status
+        
+        self._record_snapshot(self._statuses)
+        return recomputed
+    
+    def _document_signature(self, agent_config: Dict) -> Optional[Tuple[int, int]]:
+        """Modification time and size of an agent's document, None if it does not exist"""
+        try:
+            stat = (self.design_docs_path / agent_config["output_file"]).stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _record_snapshot(self, statuses: Dict[str, AgentStatus]):
+        """Append a full evaluation pass to the snapshot store, if one is configured"""
+        if self.snapshot_store is None:
+            return
+        
+        content_hashes = {}
+        for name, status in statuses.items():
+            cached = self._document_scores.get(status.output_file) if status.output_file else None
+            if cached:
+                content_hashes[name] = cached[2]
+        self.snapshot_store.record(self.project_name, statuses, content_hashes, self._sections_hashes)
+    
+    def what_if(self, agent_name: str) -> List[str]:
+        """List the agents that become unblocked once an agent's document passes validation
+        
+        Answered from the in-memory statuses through the reverse-dependency
+        index. Each document is stat'ed first and only agents whose document
+        changed since their status was evaluated are refreshed.
+        """
+        self._get_agent_config(agent_name)
+        if not self._statuses:
+            self.refresh_statuses()
+        else:
+            changed = [a["name"] for a in self.agent_sequence
+                       if self._document_signature(a) != self._status_signatures.get(a["name"])]
+            if changed:
+                self.refresh_statuses(changed)
+        
+        graph = self.agent_graph
+        satisfied = sum(1 << graph.index[name] for name, status in self._statuses.items()
+                        if self._dependency_satisfied(status))
+        if satisfied >> graph.index[agent_name] & 1:
+            return []
+        
+        satisfied |= 1 << graph.index[agent_name]
+        return [
+            dependent for dependent in graph.dependents[agent_name]
+            if not self._statuses[dependent].dependencies_met
+            and graph.dependency_bits[graph.index[dependent]] & ~satisfied == 0
+        ]
+    
+    def historical_durations(self) -> Dict[str, float]:
+        """Average time each agent took, from document mtimes across all projects
+        
+        An agent's duration is the gap between its document's mtime and the
+        latest mtime among its dependencies' documents. Only file metadata is
+        read, never document contents.
+        """
+        root = self.design_docs_path.parent if self.project_name else self.design_docs_path
+        project_dirs = [root / name for name in discover_projects(str(root))] if self.project_name else [root]
+        samples: Dict[str, List[float]] = {a["name"]: [] for a in self.agent_sequence}
+        
+        for project_dir in project_dirs:
+            mtimes = {}
+            for agent_config in self.agent_sequence:
+                try:
+                    mtimes[agent_config["name"]] = (project_dir / agent_config["output_file"]).stat().st_mtime
+                except OSError:
+                    continue
+            
+            for agent_config in self.agent_sequence:
+                name, deps = agent_config["name"], agent_config["dependencies"]
+                if name in mtimes and deps and all(d in mtimes for d in deps):
+                    duration = mtimes[name] - max(mtimes[d] for d in deps)
+                    if duration > 0:
+                        samples[name].append(duration)
+        
+        return {name: sum(values) / len(values) for name, values in samples.items() if values}
+    
+    def get_execution_plan(self, statuses: Optional[Dict[str, AgentStatus]] = None,
+                           durations: Optional[Dict[str, float]] = None) -> Dict:
+        """Schedule the remaining agents into waves that can run concurrently
+        
+        Wave 0 holds every agent whose dependencies are met now; each later
+        wave only depends on agents in earlier waves. The critical path is the
+        chain of remaining agents with the longest expected duration, using
+        historical durations (agents without history get the average).
+        """
+        if statuses is None:
+            statuses = self._evaluate_statuses()
+        if durations is None:
+            durations = self.historical_durations()
+        default_duration = sum(durations.values()) / len(durations) if durations else 1.0
+        
+        pending = [a for a in self._evaluation_order if not self._dependency_satisfied(statuses[a["name"]])]
+        pending_names = {a["name"] for a in pending}
+        wave_of: Dict[str, int] = {}
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        
+        # Evaluation order is topological, so every open dependency is scheduled first
+        for agent_config in pending:
+            name = agent_config["name"]
+            open_deps = [d for d in agent_config["dependencies"] if d in pending_names]
+            wave_of[name] = 1 + max(wave_of[d] for d in open_deps) if open_deps else 0
+            previous[name] = max(open_deps, key=finish.get, default=None)
+            finish[name] = durations.get(name, default_duration) + (finish[previous[name]] if previous[name] else 0.0)
+        
+        waves: List[List[str]] = [[] for _ in range(max(wave_of.values(), default=-1) + 1)]
+        for agent_config in self.agent_sequence:
+            if agent_config["name"] in wave_of:
+                waves[wave_of[agent_config["name"]]].append(agent_config["name"])
+        
+        critical_path = []
+        last = max(finish, key=finish.get, default=None)
+        critical_seconds = finish[last] if last else 0.0
+        while last:
+            critical_path.append(last)
+            last = previous[last]
         
+        return {
+            "ready": waves[0] if waves else [],
+            "waves": waves,
+            "critical_path": critical_path[::-1],
+            "critical_path_seconds": critical_seconds
+        }
+    
+    def watch(self, on_update, watcher: Optional[DesignDocumentWatcher] = None,
+              max_updates: Optional[int] = None):
+        """Keep the workflow status current as design documents change
+        
+        ``on_update`` is called with the recomputed agent statuses and the
+        overall workflow status, once initially and again after every change.
+        """
+        watcher = watcher or DesignDocumentWatcher(self.design_docs_path)
+        on_update(self.refresh_statuses(), self.get_workflow_status(self._statuses))
+        
+        updates = 0
+        try:
+            while max_updates is None or updates < max_updates:
+                changed_files = watcher.wait_for_changes()
+                changed_agents = {self.get_agent_for_document(name) for name in changed_files} - {None}
+                if not changed_agents and "technology-lock.json" not in changed_files:
+                    continue
+                
+                recomputed = self.refresh_statuses(changed_agents)
+                on_update(recomputed, self.get_workflow_status(self._statuses))
+                updates += 1
+        finally:
+            watcher.close()
+    
+    def _evaluate_agent(self, agent_config: Dict) -> AgentStatus:
+        """Compute a single agent's document status (dependencies are filled in by the caller)"""
         output_path = self.design_docs_path / agent_config["output_file"]
         
+        try:
+            stat = output_path.stat()
+        except OSError:
+            return AgentStatus(name=agent_config["name"], phase=agent_config["phase"], completed=False)
+        
         status = AgentStatus(
-            name=agent_name,
+            name=agent_config["name"],
             phase=agent_config["phase"],
-            completed=output_path.exists(),
-            output_file=str(output_path) if output_path.exists() else None
+            completed=True,
+            output_file=str(output_path),
+            completion_time=datetime.fromtimestamp(stat.st_mtime)
         )
         
-        if status.completed:
-            # Validate document completeness
-            status.validation_score = self._validate_document_completeness(
-                output_path, agent_config["required_sections"]
-            )
-            status.completion_time = datetime.fromtimestamp(output_path.stat().st_mtime)
+        # Re-score only when the document changed since it was last scored
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._document_scores.get(str(output_path))
+        if cached and cached[0] == signature:
+            status.validation_score = cached[1]
+            return status
         
-        # Check dependencies
-        status.dependencies_met = self._check_dependencies_met(agent_config["dependencies"])
+        # With a snapshot store, identical contents reuse the stored score
+        content_hash = None
+        score = None
+        if self.snapshot_store is not None:
+            content_hash, score = self._find_stored_score(agent_config["name"], output_path)
+        if score is None:
+            score = self._validate_document_completeness(output_path, agent_config["required_sections"])
         
+        status.validation_score = score
+        self._document_scores[str(output_path)] = (signature, score, content_hash)
         return status
     
+    def _find_stored_score(self, agent_name: str, file_path: Path) -> Tuple[Optional[str], Optional[float]]:
+        """Content hash of a document and its stored score, if any
+        
+        The document is read once: on a miss, its outline is built from the
+        same buffer and cached, so scoring it does not read it again.
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                use_mmap = stat.st_size >= MarkdownOutline.MMAP_THRESHOLD
+                with (mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if use_mmap else nullcontext(f.read())) as data:
+                    content_hash = hashlib.sha256(data).hexdigest()
+                    score = self.snapshot_store.find_score(agent_name, content_hash, self._sections_hashes[agent_name])
+                    if score is None:
+                        self._document_outlines[str(file_path)] = ((stat.st_mtime_ns, stat.st_size),
+                                                                   MarkdownOutline.from_buffer(data))
+        except OSError:
+            return None, None
+        return content_hash, score
+    
+    @staticmethod
+    def _dependency_satisfied(status: AgentStatus) -> bool:
+        """Check if an agent's output is complete enough to unblock its dependents"""
+        return status.completed and status.validation_score >= VALIDATION_THRESHOLD
+    
     def _validate_document_completeness(self, file_path: Path, required_sections: List[str]) -> float:
-        """Validate that document contains all required sections"""
+        """Validate that document contains all required sections with enough content"""
         if not file_path.exists():
             return 0.0
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            sections_found = 0
-            for section in required_sections:
-                # Look for section headers in various formats
-                patterns = [
-                    f"# {section}",
-                    f"## {section}",
-                    f"### {section}",
-                    f"**{section}**",
-                    f"{section}:",
-                    section.lower().replace(" ", "")
-                ]
-                
-                if any(pattern.lower() in content.lower() for pattern in patterns):
-                    sections_found += 1
-            
-            return sections_found / len(required_sections)
+            section_depths = self._section_depths.get(self.get_agent_for_document(str(file_path)))
+            return self._score_outline(self.get_document_outline(file_path), required_sections,
+                                       self.section_match_threshold, section_depths)
         
         except Exception:
             return 0.0
     
-    def _check_dependencies_met(self, dependencies: List[str]) -> bool:
-        """Check if all dependency agents have completed"""
-        for dep_agent in dependencies:
-            dep_status = self.get_agent_status(dep_agent)
-            if not dep_status.completed or dep_status.validation_score < 0.8:
-                return False
-        return True
+    @staticmethod
+    def _score_outline(outline: MarkdownOutline, required_sections: List[str], threshold: float = 1.0,
+                       section_depths: Optional[Dict[str, SectionDepth]] = None) -> float:
+        """Fraction of the required sections present in a document outline with enough content"""
+        found = outline.find_sections(required_sections, threshold)
+        if section_depths:
+            found = {s: node for s, node in found.items()
+                     if s not in section_depths or not section_depths[s].shortfalls(node)}
+        return len(found) / len(required_sections)
+    
+    def get_document_outline(self, file_path: Path) -> MarkdownOutline:
+        """Get the heading index of a document, rebuilt only when the file changes"""
+        stat = file_path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._document_outlines.get(str(file_path))
+        if cached and cached[0] == signature:
+            return cached[1]
+        
+        outline = MarkdownOutline.from_file(file_path)
+        self._document_outlines[str(file_path)] = (signature, outline)
+        return outline
     
-    def validate_agent_execution_readiness(self, agent_name: str) -> Tuple[bool, List[WorkflowViolation]]:
-        """Validate if agent can be executed based on workflow rules"""
+    def get_agent_for_document(self, file_path: str) -> Optional[str]:
+        """Get the agent responsible for a design document"""
+        return self.agent_graph.agent_for_document(file_path)
+    
+    def validate_agent_execution_readiness(self, agent_name: str,
+                                           statuses: Optional[Dict[str, AgentStatus]] = None) -> Tuple[bool, List[WorkflowViolation]]:
+        """Validate if agent can be executed based on workflow rules
+        
+        ``statuses`` may carry the results of an earlier evaluation pass so
+        dependencies are not evaluated again.
+        """
         violations = []
         
         agent_config = next((a for a in self.agent_sequence if a["name"] == agent_name), None)
@@ -214,9 +1189,12 @@ class SPARCWorkflowEnforcer:
             ))
             return False, violations
         
+        if statuses is None:
+            statuses = self._evaluate_statuses(agent_config["dependencies"])
+        
         # Check dependencies
         for dep_agent in agent_config["dependencies"]:
-            dep_status = self.get_agent_status(dep_agent)
+            dep_status = statuses[dep_agent]
             
             if not dep_status.completed:
                 violations.append(WorkflowViolation(
@@ -227,7 +1205,7 @@ class SPARCWorkflowEnforcer:
                     resolution_steps=[f"Execute {dep_agent} agent first", "Ensure output document is generated"]
                 ))
             
-            elif dep_status.validation_score < 0.8:
+            elif dep_status.validation_score < VALIDATION_THRESHOLD:
                 violations.append(WorkflowViolation(
                     agent=agent_name,
                     violation_type="incomplete_dependency",
@@ -241,17 +1219,40 @@ class SPARCWorkflowEnforcer:
             tech_lock_violations = self._check_technology_lock_compliance()
             violations.extend(tech_lock_violations)
         
+        # Check that the API, data model and plan agree (once their documents exist)
+        if agent_name in ["project-planner", "senior-coder"]:
+            violations.extend(self._check_design_consistency())
+        
         # Determine if execution can proceed
         blocking_violations = [v for v in violations if v.blocking and v.severity in ["critical", "high"]]
         
         return len(blocking_violations) == 0, violations
     
+    def locate_document_sections(self, agent_name: str) -> Dict[str, int]:
+        """Get the byte offset of the heading of each required section in an agent's document"""
+        agent_config = self._get_agent_config(agent_name)
+        output_path = self.design_docs_path / agent_config["output_file"]
+        if not output_path.exists():
+            return {}
+        
+        found = self.get_document_outline(output_path).find_sections(agent_config["required_sections"],
+                                                                     self.section_match_threshold)
+        return {section: node.start for section, node in found.items()}
+    
+    def _read_technology_lock(self) -> Optional[bytes]:
+        """Get the raw technology-lock.json contents, or None if it does not exist"""
+        try:
+            with open(self.design_docs_path / "technology-lock.json", 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+    
     def _check_technology_lock_compliance(self) -> List[WorkflowViolation]:
         """Check technology lock file compliance"""
         violations = []
         
-        tech_lock_path = self.design_docs_path / "technology-lock.json"
-        if not tech_lock_path.exists():
+        raw_tech_lock = self._read_technology_lock()
+        if raw_tech_lock is None:
             violations.append(WorkflowViolation(
                 agent="solution-architect",
                 violation_type="missing_technology_lock",
@@ -261,8 +1262,7 @@ class SPARCWorkflowEnforcer:
             ))
         else:
             try:
-                with open(tech_lock_path) as f:
-                    tech_lock = json.load(f)
+                tech_lock = json.loads(raw_tech_lock)
                 
                 required_fields = ["frontend", "backend", "database", "deployment"]
                 for field in required_fields:
@@ -274,6 +1274,9 @@ class SPARCWorkflowEnforcer:
                             severity="medium",
                             blocking=False
                         ))
+                
+                violations.extend(self._check_source_imports(tech_lock))
+                violations.extend(self._check_dependency_manifests(tech_lock))
             except json.JSONDecodeError:
                 violations.append(WorkflowViolation(
                     agent="solution-architect",
@@ -284,8 +1287,72 @@ class SPARCWorkflowEnforcer:
         
         return violations
     
-    def get_workflow_status(self) -> Dict:
-        """Get complete workflow status"""
+    def _check_source_imports(self, tech_lock: Dict) -> List[WorkflowViolation]:
+        """Report source imports not allowed by the technology lock's import rules"""
+        policy = PackagePolicy.from_technology_lock(tech_lock, "imports")
+        if policy is None:
+            return []
+        
+        return [
+            WorkflowViolation(
+                agent="senior-coder",
+                violation_type="unauthorized_technology_import",
+                description=f"{path}:{line} imports '{package}', which is {reason}",
+                severity="high",
+                resolution_steps=[f"Remove the '{package}' import or use an approved alternative",
+                                  "Get Solution Architect approval to add it to technology-lock.json"]
+            )
+            for path, line, package, reason in self.import_scanner.find_violations(policy)
+        ]
+    
+    def _check_dependency_manifests(self, tech_lock: Dict) -> List[WorkflowViolation]:
+        """Report manifest and lockfile packages or versions not allowed by the technology lock"""
+        policy = PackagePolicy.from_technology_lock(tech_lock, "dependencies")
+        if policy is None:
+            return []
+        
+        return [
+            WorkflowViolation(
+                agent="senior-coder",
+                violation_type="unauthorized_technology_dependency",
+                description=f"{path} declares '{package}': {reason}",
+                severity="high",
+                resolution_steps=[f"Remove '{package}' or align it with technology-lock.json",
+                                  "Get Solution Architect approval for any technology change"]
+            )
+            for path, package, reason in self.manifest_scanner.find_violations(policy)
+        ]
+    
+    def _check_design_consistency(self) -> List[WorkflowViolation]:
+        """Report API entities missing from the data model and plan endpoints missing from the API"""
+        api_path, database_path, plan_path = (
+            self.design_docs_path / self._get_agent_config(name)["output_file"]
+            for name in ["senior-api-developer", "data-architect", "project-planner"]
+        )
+        
+        violations = []
+        for kind, path, line, description in self.design_index.check(api_path, database_path, plan_path):
+            if kind == "api_entity_not_in_data_model":
+                agent = "senior-api-developer"
+                resolution = f"Define the entity in {database_path.name} or remove it from the API"
+            else:
+                agent = "project-planner"
+                resolution = f"Specify the endpoint in {api_path.name} or drop it from the plan"
+            violations.append(WorkflowViolation(
+                agent=agent,
+                violation_type=kind,
+                description=f"{path}:{line} {description}",
+                severity="medium",
+                blocking=False,  # A report only: the indexes are heuristic
+                resolution_steps=[resolution]
+            ))
+        return violations
+    
+    def get_workflow_status(self, statuses: Optional[Dict[str, AgentStatus]] = None) -> Dict:
+        """Get complete workflow status
+        
+        ``statuses`` may carry the results of an earlier evaluation pass.
+        """
         status = {
             "project_name": self.project_name,
             "current_phase": 0,
@@ -298,9 +1365,11 @@ class SPARCWorkflowEnforcer:
         
         completed_phases = 0
         total_phases = len(self.agent_sequence)
+        if statuses is None:
+            statuses = self._evaluate_statuses()
         
         for agent_config in self.agent_sequence:
-            agent_status = self.get_agent_status(agent_config["name"])
+            agent_status = statuses[agent_config["name"]]
             status["agents"][agent_config["name"]] = {
                 "phase": agent_status.phase,
                 "completed": agent_status.completed,
@@ -309,7 +1378,7 @@ class SPARCWorkflowEnforcer:
                 "output_file": agent_status.output_file
             }
             
-            if agent_status.completed and agent_status.validation_score >= 0.8:
+            if self._dependency_satisfied(agent_status):
                 completed_phases += 1
                 status["current_phase"] = max(status["current_phase"], agent_status.phase)
         
@@ -317,9 +1386,9 @@ class SPARCWorkflowEnforcer:
         
         # Determine next action
         for agent_config in self.agent_sequence:
-            agent_status = self.get_agent_status(agent_config["name"])
+            agent_status = statuses[agent_config["name"]]
             if not agent_status.completed:
-                ready, violations = self.validate_agent_execution_readiness(agent_config["name"])
+                ready, violations = self.validate_agent_execution_readiness(agent_config["name"], statuses)
                 if ready:
                     status["next_action"] = f"Execute {agent_config['name']} agent"
                     break
@@ -333,11 +1402,7 @@ class SPARCWorkflowEnforcer:
         
         # Check if ready for implementation
         design_agents = [a for a in self.agent_sequence if a["phase"] <= 7]
-        design_complete = all(
-            self.get_agent_status(a["name"]).completed and 
-            self.get_agent_status(a["name"]).validation_score >= 0.8
-            for a in design_agents
-        )
+        design_complete = all(self._dependency_satisfied(statuses[a["name"]]) for a in design_agents)
         status["ready_for_implementation"] = design_complete
         
         return status
@@ -356,8 +1421,9 @@ class SPARCWorkflowEnforcer:
             ))
             return False, violations
         
+        statuses = self._evaluate_statuses([a["name"] for a in phase_agents])
         for agent_config in phase_agents:
-            agent_status = self.get_agent_status(agent_config["name"])
+            agent_status = statuses[agent_config["name"]]
             
             if not agent_status.completed:
                 violations.append(WorkflowViolation(
@@ -367,7 +1433,7 @@ class SPARCWorkflowEnforcer:
                     severity="critical"
                 ))
             
-            elif agent_status.validation_score < 0.8:
+            elif agent_status.validation_score < VALIDATION_THRESHOLD:
                 violations.append(WorkflowViolation(
                     agent=agent_config["name"],
                     violation_type="incomplete_document",
@@ -379,61 +1445,59 @@ class SPARCWorkflowEnforcer:
     
     def generate_compliance_report(self) -> str:
         """Generate comprehensive compliance report"""
-        status = self.get_workflow_status()
+        record = self.get_report_record()
         
         report = [
             "# SPARC Framework Compliance Report",
             f"**Project:** {self.project_name or 'Unknown'}",
             f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            f"**Overall Progress:** {status['completion_percentage']:.1f}%",
-            "",
-            "## Agent Status Overview",
-            ""
+            *markdown_project_report(record)
         ]
         
-        for agent_name, agent_info in status["agents"].items():
-            emoji = "✅" if agent_info["completed"] else "❌"
-            score = f"{agent_info['validation_score']:.1%}" if agent_info["completed"] else "N/A"
+        return "\n".join(report)
+    
+    def get_report_record(self) -> Dict:
+        """Workflow status plus each agent's missing sections, from one evaluation pass"""
+        statuses = self._evaluate_statuses()
+        record = self.get_workflow_status(statuses)
+        record["missing_sections"] = self.get_missing_sections(statuses)
+        return record
+    
+    def get_missing_sections(self, statuses: Dict[str, AgentStatus]) -> Dict[str, List[str]]:
+        """Required sections absent or too shallow in each generated document (outlines come from the scoring cache)"""
+        missing_sections = {}
+        for agent_config in self.agent_sequence:
+            output_file = statuses[agent_config["name"]].output_file
+            if not output_file:
+                continue
             
-            report.append(f"{emoji} **{agent_name.replace('-', ' ').title()}** (Phase {agent_info['phase']})")
-            report.append(f"   - Completed: {agent_info['completed']}")
-            report.append(f"   - Validation Score: {score}")
-            report.append(f"   - Dependencies Met: {agent_info['dependencies_met']}")
-            if agent_info["output_file"]:
-                report.append(f"   - Output: {agent_info['output_file']}")
-            report.append("")
-        
-        if status["blocking_issues"]:
-            report.extend([
-                "## Blocking Issues",
-                ""
-            ])
-            for issue in status["blocking_issues"]:
-                report.append(f"❌ {issue}")
-            report.append("")
-        
-        if status["next_action"]:
-            report.extend([
-                "## Next Action Required",
-                f"🎯 {status['next_action']}",
-                ""
-            ])
-        
-        report.extend([
-            "## Implementation Readiness",
-            f"{'✅ Ready for Implementation' if status['ready_for_implementation'] else '❌ Design Phase Incomplete'}",
-            ""
-        ])
+            required_sections = agent_config["required_sections"]
+            try:
+                found = self.get_document_outline(Path(output_file)).find_sections(required_sections,
+                                                                                   self.section_match_threshold)
+            except OSError:
+                found = {}
+            depths = self._section_depths[agent_config["name"]]
+            missing = []
+            for section in required_sections:
+                shortfalls = depths[section].shortfalls(found[section]) if section in found and section in depths else []
+                if section not in found:
+                    missing.append(section)
+                elif shortfalls:
+                    missing.append(f"{section} (too shallow: {', '.join(shortfalls)})")
+            if missing:
+                missing_sections[agent_config["name"]] = missing
         
-        return "\n".join(report)
+        return missing_sections
     
     def create_workflow_issue_if_needed(self) -> Optional[str]:
         """Create Git issue if workflow violations exist"""
         # Check for critical violations
         violations = []
+        statuses = self._evaluate_statuses()
         
         for agent_config in self.agent_sequence:
-            ready, agent_violations = self.validate_agent_execution_readiness(agent_config["name"])
+            ready, agent_violations = self.validate_agent_execution_readiness(agent_config["name"], statuses)
             violations.extend([v for v in agent_violations if v.severity in ["critical", "high"]])
         
         if not violations:
@@ -470,26 +1534,331 @@ class SPARCWorkflowEnforcer:
             print(f"Warning: Could not create workflow issue: {e}")
             return None
 
+def discover_projects(design_docs_path: str = "docs/design") -> List[str]:
+    """List the SPARC projects (subdirectories) under the design docs path"""
+    try:
+        with os.scandir(design_docs_path) as entries:
+            return sorted(e.name for e in entries if e.is_dir() and not e.name.startswith("."))
+    except OSError:
+        return []
+
+def _project_status_record(design_docs_path: str, project_name: str, report: bool = False,
+                           source_root: str = ".") -> Dict:
+    """Evaluate one project's workflow status (process pool worker)"""
+    try:
+        enforcer = SPARCWorkflowEnforcer(project_name, design_docs_path, source_root=source_root)
+        return enforcer.get_report_record() if report else enforcer.get_workflow_status()
+    except Exception as e:
+        return {"project_name": project_name, "error": str(e)}
+
+def iter_project_statuses(design_docs_path: str = "docs/design", max_workers: Optional[int] = None,
+                          report: bool = False, source_root: str = ".") -> Iterator[Dict]:
+    """Evaluate every project concurrently, yielding each status as soon as it is ready
+    
+    At most a few tasks per worker are in flight at once, so memory stays flat
+    no matter how many projects exist. ``max_workers=1`` evaluates in-process.
+    With ``report`` each record also carries its agents' missing sections.
+    ``source_root`` is the tree whose imports and manifests are checked.
+    """
+    projects = discover_projects(design_docs_path)
+    max_workers = max_workers or os.cpu_count() or 1
+    
+    if max_workers == 1 or len(projects) <= 1:
+        for project_name in projects:
+            yield _project_status_record(design_docs_path, project_name, report, source_root)
+        return
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending_projects = iter(projects)
+        in_flight = set()
+        while True:
+            for project_name in pending_projects:
+                in_flight.add(executor.submit(_project_status_record, design_docs_path, project_name, report,
+                                             source_root))
+                if len(in_flight) >= max_workers * 4:
+                    break
+            if not in_flight:
+                return
+            
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+def markdown_project_report(record: Dict, heading: str = "##") -> Iterator[str]:
+    """Markdown lines for one project's report record, below its title lines"""
+    yield f"**Overall Progress:** {record['completion_percentage']:.1f}%"
+    yield ""
+    yield f"{heading} Agent Status Overview"
+    yield ""
+    
+    missing_sections = record.get("missing_sections", {})
+    for agent_name, agent_info in record["agents"].items():
+        emoji = "✅" if agent_info["completed"] else "❌"
+        score = f"{agent_info['validation_score']:.1%}" if agent_info["completed"] else "N/A"
+        
+        yield f"{emoji} **{agent_name.replace('-', ' ').title()}** (Phase {agent_info['phase']})"
+        yield f"   - Completed: {agent_info['completed']}"
+        yield f"   - Validation Score: {score}"
+        yield f"   - Dependencies Met: {agent_info['dependencies_met']}"
+        if agent_info["output_file"]:
+            yield f"   - Output: {agent_info['output_file']}"
+            if missing_sections.get(agent_name):
+                yield f"   - Missing Sections: {', '.join(missing_sections[agent_name])}"
+        yield ""
+    
+    if record["blocking_issues"]:
+        yield f"{heading} Blocking Issues"
+        yield ""
+        for issue in record["blocking_issues"]:
+            yield f"❌ {issue}"
+        yield ""
+    
+    if record["next_action"]:
+        yield f"{heading} Next Action Required"
+        yield f"🎯 {record['next_action']}"
+        yield ""
+    
+    yield f"{heading} Implementation Readiness"
+    yield f"{'✅ Ready for Implementation' if record['ready_for_implementation'] else '❌ Design Phase Incomplete'}"
+    yield ""
+
+class ComplianceReportRenderer:
+    """Streams a multi-project compliance report to a file handle
+    
+    Each project's section is written and flushed as soon as its record
+    arrives, so output starts before the last project is evaluated and
+    memory does not grow with the number of projects.
+    """
+    
+    FORMATS = ("markdown", "json", "html")
+    
+    def __init__(self, output: TextIO, report_format: str = "markdown"):
+        if report_format not in self.FORMATS:
+            raise ValueError(f"Unknown report format: {report_format}")
+        self.output = output
+        self.report_format = report_format
+    
+    def render(self, records: Iterable[Dict]) -> int:
+        """Write the report for a stream of report records; returns the number of projects"""
+        chunks = getattr(self, f"_{self.report_format}_chunks")
+        summary = {"projects": 0, "ready": 0, "errors": 0}
+        
+        for chunk in chunks(self._counted(records, summary), summary):
+            self.output.write(chunk)
+            self.output.flush()
+        return summary["projects"]
+    
+    @staticmethod
+    def _counted(records: Iterable[Dict], summary: Dict) -> Iterator[Dict]:
+        """Pass records through while tallying the report summary"""
+        for record in records:
+            summary["projects"] += 1
+            if "error" in record:
+                summary["errors"] += 1
+            elif record["ready_for_implementation"]:
+                summary["ready"] += 1
+            yield record
+    
+    def _markdown_chunks(self, records: Iterable[Dict], summary: Dict) -> Iterator[str]:
+        yield ("# SPARC Framework Compliance Report\n"
+               f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        for record in records:
+            lines = ["", f"## Project: {record['project_name']}"]
+            if "error" in record:
+                lines.append(f"❌ Evaluation failed: {record['error']}")
+            else:
+                lines.extend(markdown_project_report(record, heading="###"))
+            yield "\n".join(lines) + "\n"
+        
+        yield ("\n## Summary\n"
+               f"- Projects: {summary['projects']}\n"
+               f"- Ready for Implementation: {summary['ready']}\n"
+               f"- Evaluation Errors: {summary['errors']}\n")
+    
+    def _json_chunks(self, records: Iterable[Dict], summary: Dict) -> Iterator[str]:
+        yield f'{{"generated": {json.dumps(datetime.now().isoformat())}, "projects": ['
+        for i, record in enumerate(records):
+            yield ("," if i else "") + "\n" + json.dumps(record)
+        yield f'\n], "summary": {json.dumps(summary)}}}\n'
+    
+    def _html_chunks(self, records: Iterable[Dict], summary: Dict) -> Iterator[str]:
+        yield ("<!DOCTYPE html>\n<html>\n<head><meta charset=\"utf-8\">"
+               "<title>SPARC Framework Compliance Report</title></head>\n<body>\n"
+               "<h1>SPARC Framework Compliance Report</h1>\n"
+               f"<p><strong>Generated:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>\n")
+        for record in records:
+            yield self._html_project(record)
+        
+        yield ("<h2>Summary</h2>\n<ul>"
+               f"<li>Projects: {summary['projects']}</li>"
+               f"<li>Ready for Implementation: {summary['ready']}</li>"
+               f"<li>Evaluation Errors: {summary['errors']}</li></ul>\n</body>\n</html>\n")
+    
+    @staticmethod
+    def _html_project(record: Dict) -> str:
+        """HTML section for one project's report record"""
+        parts = [f"<section>\n<h2>Project: {html.escape(record['project_name'])}</h2>\n"]
+        if "error" in record:
+            parts.append(f"<p>❌ Evaluation failed: {html.escape(record['error'])}</p>\n</section>\n")
+            return "".join(parts)
+        
+        parts.append(f"<p><strong>Overall Progress:</strong> {record['completion_percentage']:.1f}%</p>\n"
+                     "<table>\n<tr><th>Agent</th><th>Phase</th><th>Completed</th><th>Validation Score</th>"
+                     "<th>Dependencies Met</th><th>Missing Sections</th></tr>\n")
+        missing_sections = record.get("missing_sections", {})
+        for agent_name, agent_info in record["agents"].items():
+            score = f"{agent_info['validation_score']:.1%}" if agent_info["completed"] else "N/A"
+            parts.append(f"<tr><td>{html.escape(agent_name)}</td><td>{agent_info['phase']}</td>"
+                         f"<td>{'✅' if agent_info['completed'] else '❌'}</td><td>{score}</td>"
+                         f"<td>{agent_info['dependencies_met']}</td>"
+                         f"<td>{html.escape(', '.join(missing_sections.get(agent_name, [])))}</td></tr>\n")
+        parts.append("</table>\n")
+        
+        if record["blocking_issues"]:
+            parts.append("<h3>Blocking Issues</h3>\n<ul>")
+            parts.extend(f"<li>{html.escape(issue)}</li>" for issue in record["blocking_issues"])
+            parts.append("</ul>\n")
+        if record["next_action"]:
+            parts.append(f"<p>🎯 {html.escape(record['next_action'])}</p>\n")
+        readiness = '✅ Ready for Implementation' if record['ready_for_implementation'] else '❌ Design Phase Incomplete'
+        parts.append(f"<p>{readiness}</p>\n</section>\n")
+        return "".join(parts)
+
+class _RevisionEnforcer(SPARCWorkflowEnforcer):
+    """Workflow enforcer for one commit's design documents, replayed from git objects"""
+    
+    technology_lock: Optional[bytes] = None
+    
+    def _read_technology_lock(self) -> Optional[bytes]:
+        return self.technology_lock
+    
+    def _check_source_imports(self, tech_lock: Dict) -> List[WorkflowViolation]:
+        return []  # Only design documents are replayed, not the source tree
+    
+    def _check_dependency_manifests(self, tech_lock: Dict) -> List[WorkflowViolation]:
+        return []
+    
+    def _check_design_consistency(self) -> List[WorkflowViolation]:
+        return []  # Working-tree documents do not describe this commit
+
+def replay_history(revision_range: str, project_name: str = "",
+                   design_docs_path: str = "docs/design") -> Iterator[Dict]:
+    """Compute the workflow status at every commit in a range, oldest first
+    
+    Nothing is checked out: design documents are read as blobs through one
+    ``git cat-file --batch`` process. Commits that leave the design directory
+    tree unchanged reuse the previous status, and a document is only scored
+    the first time its blob id is seen.
+    """
+    enforcer = _RevisionEnforcer(project_name, design_docs_path)
+    toplevel = subprocess.run(["git", "rev-parse", "--show-toplevel"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    path_parts = Path(os.path.relpath(enforcer.design_docs_path.resolve(), toplevel)).parts
+    commits = subprocess.run(["git", "rev-list", "--reverse", "--timestamp", revision_range],
+                             capture_output=True, text=True, check=True).stdout.split()
+    
+    reader = GitObjectReader(toplevel)
+    scores: Dict[Tuple[str, str], float] = {}
+    previous_tree = status = None
+    try:
+        for timestamp, commit_id in zip(commits[::2], commits[1::2]):
+            tree_id = reader.directory_tree(commit_id, path_parts)
+            rescored = []
+            
+            if status is None or tree_id != previous_tree:
+                entries = GitObjectReader.parse_tree(reader.read(tree_id)[1]) if tree_id else {}
+                statuses: Dict[str, AgentStatus] = {}
+                for agent_config in enforcer._evaluation_order:
+                    name = agent_config["name"]
+                    blob_id = entries.get(agent_config["output_file"].encode())
+                    agent_status = statuses[name] = AgentStatus(
+                        name=name, phase=agent_config["phase"], completed=blob_id is not None
+                    )
+                    
+                    if blob_id:
+                        agent_status.output_file = str(enforcer.design_docs_path / agent_config["output_file"])
+                        if (name, blob_id) not in scores:
+                            outline = MarkdownOutline.from_buffer(reader.read(blob_id)[1])
+                            scores[(name, blob_id)] = enforcer._score_outline(
+                                outline, agent_config["required_sections"], enforcer.section_match_threshold,
+                                enforcer._section_depths[name]
+                            )
+                            rescored.append(name)
+                        agent_status.validation_score = scores[(name, blob_id)]
+                    
+                    agent_status.dependencies_met = all(
+                        enforcer._dependency_satisfied(statuses[dep]) for dep in agent_config["dependencies"]
+                    )
+                
+                lock_id = entries.get(b"technology-lock.json")
+                enforcer.technology_lock = reader.read(lock_id)[1] if lock_id else None
+                status = enforcer.get_workflow_status(statuses)
+                previous_tree = tree_id
+            
+            yield {"commit": commit_id, "timestamp": int(timestamp), "rescored": rescored, "status": status}
+    finally:
+        reader.close()
+
+def _option_value(args: List[str], name: str, default: Optional[str] = None) -> Optional[str]:
+    """Value following a ``--name`` option, default when absent; exits when the value is missing"""
+    if name not in args:
+        return default
+    index = args.index(name) + 1
+    if index >= len(args) or args[index].startswith("--"):
+        print(f"❌ {name} needs a value")
+        sys.exit(1)
+    return args[index]
+
+def _workers_option(args: List[str]) -> Optional[int]:
+    """Worker count from ``--workers N``, None when absent; exits unless N is a positive integer"""
+    workers = _option_value(args, "--workers")
+    if workers is not None and (not workers.isdigit() or int(workers) < 1):
+        print(f"❌ --workers takes a positive integer, got: {workers}")
+        sys.exit(1)
+    return int(workers) if workers else None
+
 def main():
     """CLI interface for workflow enforcement"""
-    import sys
-    
     if len(sys.argv) < 2:
         print("Usage: python sparc-workflow-enforcer.py <command> [args...]")
         print("Commands:")
         print("  status [project_name]")
+        print("  status --all [--workers N]")
         print("  validate-agent <agent_name> [project_name]") 
         print("  validate-phase <phase_number> [project_name]")
         print("  compliance-report [project_name]")
+        print("  compliance-report --all [--format markdown|json|html] [--output FILE] [--workers N]")
         print("  check-readiness <agent_name> [project_name]")
+        print("  check-document <file_path>")
+        print("  watch [project_name] [--json]")
+        print("  what-if <agent_name> [project_name]")
+        print("  schedule [project_name] [--json]")
+        print("  history <agent_name> [project_name]")
+        print("  phase-times [project_name]")
+        print("  replay <revision_range> [project_name] [--json]")
+        print("  check-imports [project_name] [--workers N]")
+        print("  check-dependencies [project_name]")
+        print("  check-consistency [project_name]")
         sys.exit(1)
     
     command = sys.argv[1]
     project_name = sys.argv[2] if len(sys.argv) > 2 and not command.startswith("validate-") else ""
     
-    enforcer = SPARCWorkflowEnforcer(project_name)
+    # Status, report and watch runs are appended to the local snapshot history; history queries read it
+    snapshot_store = None
+    records_history = command in ("status", "compliance-report", "watch")
+    if records_history or (command in ("history", "phase-times") and DEFAULT_SNAPSHOT_DB.exists()):
+        snapshot_store = StatusSnapshotStore()
+    enforcer = SPARCWorkflowEnforcer(project_name, snapshot_store=snapshot_store)
+    
+    if command == "status" and "--all" in sys.argv:
+        workers = _workers_option(sys.argv)
+        
+        # One NDJSON record per project, in completion order
+        for record in iter_project_statuses(max_workers=workers):
+            print(json.dumps(record), flush=True)
     
-    if command == "status":
+    elif command == "status":
         status = enforcer.get_workflow_status()
         print(f"Project: {status['project_name'] or 'Default'}")
         print(f"Progress: {status['completion_percentage']:.1f}%")
@@ -540,6 +1909,21 @@ def main():
             for violation in violations:
                 print(f"  • {violation.agent}: {violation.description}")
     
+    elif command == "compliance-report" and "--all" in sys.argv:
+        report_format = _option_value(sys.argv, "--format", "markdown")
+        if report_format not in ComplianceReportRenderer.FORMATS:
+            print(f"❌ Unknown report format: {report_format}")
+            sys.exit(1)
+        
+        records = iter_project_statuses(max_workers=_workers_option(sys.argv), report=True)
+        output_path = _option_value(sys.argv, "--output")
+        if not output_path:
+            ComplianceReportRenderer(sys.stdout, report_format).render(records)
+        else:
+            with open(output_path, 'w', encoding='utf-8') as output:
+                count = ComplianceReportRenderer(output, report_format).render(records)
+            print(f"📄 Report for {count} projects written to {output_path}")
+    
     elif command == "compliance-report":
         report = enforcer.generate_compliance_report()
         print(report)
@@ -561,6 +1945,204 @@ def main():
             print("❌ BLOCKED")
             sys.exit(1)
     
+    elif command == "watch":
+        args = sys.argv[2:]
+        as_json = "--json" in args
+        project_args = [a for a in args if not a.startswith("--")]
+        enforcer = SPARCWorkflowEnforcer(project_args[0] if project_args else "", snapshot_store=snapshot_store)
+        
+        def print_update(recomputed: Dict[str, AgentStatus], status: Dict):
+            if as_json:
+                print(json.dumps({
+                    "timestamp": datetime.now().isoformat(),
+                    "recomputed": sorted(recomputed),
+                    "status": status
+                }), flush=True)
+                return
+            
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] Progress: {status['completion_percentage']:.1f}% | "
+                  f"Next Action: {status['next_action'] or 'All phases complete'}")
+            for name, agent_status in recomputed.items():
+                emoji = "✅" if enforcer._dependency_satisfied(agent_status) else "❌"
+                print(f"  {emoji} {name}: {agent_status.validation_score:.1%} "
+                      f"(dependencies met: {agent_status.dependencies_met})")
+            sys.stdout.flush()
+        
+        try:
+            enforcer.watch(print_update)
+        except KeyboardInterrupt:
+            pass
+    
+    elif command == "schedule":
+        project_args = [a for a in sys.argv[2:] if not a.startswith("--")]
+        enforcer = SPARCWorkflowEnforcer(project_args[0] if project_args else "")
+        plan = enforcer.get_execution_plan()
+        
+        if "--json" in sys.argv:
+            print(json.dumps(plan))
+        elif not plan["waves"]:
+            print("✅ All agents complete")
+        else:
+            print(f"Ready Now: {', '.join(plan['ready'])}")
+            for number, wave in enumerate(plan["waves"], 1):
+                print(f"  Wave {number}: {', '.join(wave)}")
+            hours = plan["critical_path_seconds"] / 3600
+            print(f"Critical Path: {' → '.join(plan['critical_path'])} (~{hours:.1f}h)")
+    
+    elif command == "what-if":
+        if len(sys.argv) < 3:
+            print("Usage: what-if <agent_name> [project_name]")
+            sys.exit(1)
+        
+        agent_name = sys.argv[2]
+        project_name = sys.argv[3] if len(sys.argv) > 3 else ""
+        enforcer = SPARCWorkflowEnforcer(project_name)
+        
+        try:
+            unblocked = enforcer.what_if(agent_name)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        
+        if unblocked:
+            print(f"Completing {agent_name} unblocks: {', '.join(unblocked)}")
+        else:
+            print(f"Completing {agent_name} unblocks no additional agents")
+    
+    elif command == "history":
+        if len(sys.argv) < 3:
+            print("Usage: history <agent_name> [project_name]")
+            sys.exit(1)
+        
+        agent_name = sys.argv[2]
+        project_name = sys.argv[3] if len(sys.argv) > 3 else None
+        history = snapshot_store.score_history(agent_name, project_name) if snapshot_store else []
+        if not history:
+            print(f"No recorded snapshots for {agent_name}")
+            sys.exit(0)
+        
+        # Only print the points where the score changed
+        previous = None
+        for entry in history:
+            if entry["validation_score"] == previous:
+                continue
+            previous = entry["validation_score"]
+            recorded = datetime.fromtimestamp(entry["recorded_at"]).strftime('%Y-%m-%d %H:%M:%S')
+            score = f"{entry['validation_score']:.1%}" if entry["completed"] else "N/A"
+            print(f"{recorded}  {score}")
+    
+    elif command == "phase-times":
+        durations = snapshot_store.time_in_phase(project_name) if snapshot_store else {}
+        if not durations:
+            print(f"No recorded snapshots for {project_name or 'Default'}")
+            sys.exit(0)
+        
+        for phase, seconds in sorted(durations.items()):
+            print(f"Phase {phase}: {seconds / 3600:.1f}h")
+    
+    elif command == "replay":
+        args = [a for a in sys.argv[2:] if not a.startswith("--")]
+        if not args:
+            print("Usage: replay <revision_range> [project_name] [--json]")
+            sys.exit(1)
+        
+        try:
+            previous = None
+            for record in replay_history(args[0], args[1] if len(args) > 1 else ""):
+                status = record["status"]
+                if "--json" in sys.argv:
+                    print(json.dumps(record), flush=True)
+                elif status is not previous:
+                    committed = datetime.fromtimestamp(record["timestamp"]).strftime('%Y-%m-%d %H:%M')
+                    print(f"{record['commit'][:10]} {committed}  Progress: {status['completion_percentage']:5.1f}%  "
+                          f"Phase: {status['current_phase']}")
+                previous = status
+        except subprocess.CalledProcessError as e:
+            print(f"❌ git failed: {(e.stderr or '').strip()}")
+            sys.exit(1)
+    
+    elif command == "check-imports":
+        args = sys.argv[2:]
+        workers = _workers_option(args)
+        if "--workers" in args:
+            del args[args.index("--workers"):args.index("--workers") + 2]
+        enforcer = SPARCWorkflowEnforcer(args[0] if args else "")
+        if workers:
+            enforcer.import_scanner.max_workers = workers
+        
+        violations = [v for v in enforcer._check_technology_lock_compliance()
+                      if v.violation_type == "unauthorized_technology_import"]
+        rescanned = len(enforcer.import_scanner.rescanned)
+        if not violations:
+            print(f"✅ All imports allowed by technology-lock.json ({rescanned} files re-scanned)")
+        else:
+            print(f"❌ {len(violations)} unauthorized imports ({rescanned} files re-scanned):")
+            for violation in violations:
+                print(f"  • {violation.description}")
+            sys.exit(1)
+    
+    elif command == "check-dependencies":
+        violations = [v for v in enforcer._check_technology_lock_compliance()
+                      if v.violation_type == "unauthorized_technology_dependency"]
+        reparsed = len(enforcer.manifest_scanner.reparsed)
+        if not violations:
+            print(f"✅ All dependencies match technology-lock.json ({reparsed} manifests re-parsed)")
+        else:
+            print(f"❌ {len(violations)} dependency violations ({reparsed} manifests re-parsed):")
+            for violation in violations:
+                print(f"  • {violation.description}")
+            sys.exit(1)
+    
+    elif command == "check-consistency":
+        violations = enforcer._check_design_consistency()
+        reindexed = len(enforcer.design_index.reindexed)
+        if not violations:
+            print(f"✅ API specification, database design and implementation plan agree "
+                  f"({reindexed} documents re-indexed)")
+        else:
+            print(f"⚠️ {len(violations)} cross-document mismatches ({reindexed} documents re-indexed):")
+            for violation in violations:
+                print(f"  • {violation.description}")
+    
+    elif command == "check-document":
+        if len(sys.argv) < 3:
+            print("Usage: check-document <file_path>")
+            sys.exit(1)
+        
+        file_path = Path(sys.argv[2])
+        enforcer = SPARCWorkflowEnforcer()
+        agent_name = enforcer.get_agent_for_document(str(file_path))
+        if not agent_name:
+            print(f"ℹ️  {file_path} is not a SPARC design document")
+            sys.exit(0)
+        if not file_path.exists():
+            print(f"❌ File not found: {file_path}")
+            sys.exit(1)
+        
+        required_sections = enforcer._get_agent_config(agent_name)["required_sections"]
+        depths = enforcer._section_depths[agent_name]
+        outline = enforcer.get_document_outline(file_path)
+        found = outline.find_sections(required_sections, enforcer.section_match_threshold)
+        score = enforcer._score_outline(outline, required_sections, enforcer.section_match_threshold, depths)
+        
+        print(f"{agent_name}: {score:.1%} of required sections present")
+        for section in required_sections:
+            node = found.get(section)
+            if node:
+                matched_as = f" as \"{node.title}\"" if section.lower() not in node.title.lower() else ""
+                depth = (f"{node.word_count} words, {node.bullet_count} bullets, "
+                         f"{node.code_block_count} code blocks, {node.table_count} tables")
+                shortfalls = depths[section].shortfalls(node) if section in depths else []
+                if shortfalls:
+                    print(f"  ⚠️  {section}{matched_as} too shallow: {', '.join(shortfalls)} (byte {node.start})")
+                else:
+                    print(f"  ✅ {section}{matched_as} (byte {node.start}, {depth})")
+            else:
+                print(f"  ❌ {section} missing")
+        
+        if score < VALIDATION_THRESHOLD:
+            sys.exit(1)
+    
     else:
         print(f"Unknown command: {command}")
         sys.exit(1)
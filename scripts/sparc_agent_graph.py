@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+SPARC Agent Graph
+Single definition of the SPARC agent workflow, compiled for constant-time dependency queries
+"""
+
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_CONFIG_PATH = Path(__file__).parent / "sparc-agent-graph.json"
+DEFAULT_CACHE_DIR = Path(".claude") / "cache"
+
+class AgentGraph:
+    """Compiled SPARC agent graph
+
+    Agents are indexed by position in the declared sequence. For every agent
+    the transitive closure of "depends on" and "blocks" is stored as an
+    integer bitset, so dependency and blocked-agent queries are O(1) bit tests.
+    """
+
+    def __init__(self, agents: List[Dict], topological_order: List[int],
+                 depends_on_bits: List[int], blocks_bits: List[int], section_match_threshold: float = 1.0):
+        self.agents = agents
+        self.section_match_threshold = section_match_threshold
+        self.index = {agent["name"]: i for i, agent in enumerate(agents)}
+        self.topological_order = topological_order
+        self.depends_on_bits = depends_on_bits
+        self.blocks_bits = blocks_bits
+        self.documents = {agent["output_file"]: agent["name"] for agent in agents}
+
+        # Direct edges: dependency bitsets and the reverse-dependency index
+        self.dependency_bits = [sum(1 << self.index[d] for d in agent["dependencies"]) for agent in agents]
+        self.dependents: Dict[str, List[str]] = {agent["name"]: [] for agent in agents}
+        for agent in agents:
+            for dep in agent["dependencies"]:
+                self.dependents[dep].append(agent["name"])
+
+    @classmethod
+    def compile(cls, agents: List[Dict], section_match_threshold: float = 1.0) -> "AgentGraph":
+        """Validate the agent definitions and precompute transitive closures"""
+        index = {agent["name"]: i for i, agent in enumerate(agents)}
+        for agent in agents:
+            unknown = [d for d in agent["dependencies"] if d not in index]
+            if unknown:
+                raise ValueError(f"Agent '{agent['name']}' depends on unknown agents: {', '.join(unknown)}")
+
+        # Kahn's algorithm, keeping the declared sequence order among ready agents
+        remaining = {i: {index[d] for d in agent["dependencies"]} for i, agent in enumerate(agents)}
+        order = []
+        while remaining:
+            ready = [i for i in sorted(remaining) if not remaining[i]]
+            if not ready:
+                names = sorted(agents[i]["name"] for i in remaining)
+                raise ValueError(f"Circular agent dependencies: {', '.join(names)}")
+            order.extend(ready)
+            for i in ready:
+                del remaining[i]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+        depends_on = [0] * len(agents)
+        for i in order:
+            for dep in agents[i]["dependencies"]:
+                depends_on[i] |= (1 << index[dep]) | depends_on[index[dep]]
+
+        blocks = [0] * len(agents)
+        for i in order:
+            for j in range(len(agents)):
+                if depends_on[i] >> j & 1:
+                    blocks[j] |= 1 << i
+
+        return cls(agents, order, depends_on, blocks, section_match_threshold)
+
+    @classmethod
+    def load(cls, config_path: Optional[Path] = None, cache_dir: Optional[Path] = None) -> "AgentGraph":
+        """Load the agent graph, reusing the compiled form cached for this exact config"""
+        config_path = Path(config_path or DEFAULT_CONFIG_PATH)
+        return cls._load_cached(str(config_path.resolve()), str(cache_dir or DEFAULT_CACHE_DIR))
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _load_cached(cls, config_path: str, cache_dir: str) -> "AgentGraph":
+        """Load and compile a config once per process and once per config hash on disk"""
+        with open(config_path, 'rb') as f:
+            raw_config = f.read()
+
+        config_hash = hashlib.sha256(raw_config).hexdigest()
+        cache_file = Path(cache_dir) / f"agent-graph-{config_hash[:16]}.json"
+
+        try:
+            with open(cache_file) as f:
+                cached = json.load(f)
+            if cached.get("config_hash") == config_hash:
+                return cls(cached["agents"], cached["topological_order"], cached["depends_on_bits"],
+                           cached["blocks_bits"], cached["section_match_threshold"])
+        except (OSError, ValueError, KeyError):
+            pass
+
+        config = json.loads(raw_config)
+        graph = cls.compile(config["agents"], config.get("section_match_threshold", 1.0))
+
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'w') as f:
+                json.dump({
+                    "config_hash": config_hash,
+                    "agents": graph.agents,
+                    "topological_order": graph.topological_order,
+                    "depends_on_bits": graph.depends_on_bits,
+                    "blocks_bits": graph.blocks_bits,
+                    "section_match_threshold": graph.section_match_threshold
+                }, f)
+        except OSError:
+            pass  # Caching is an optimization only
+
+        return graph
+
+    def _names(self, bits: int) -> List[str]:
+        """Expand a bitset into agent names in topological order"""
+        return [self.agents[i]["name"] for i in self.topological_order if bits >> i & 1]
+
+    def get_agent(self, agent_name: str) -> Dict:
+        """Look up an agent's configuration by name"""
+        if agent_name not in self.index:
+            raise ValueError(f"Unknown agent: {agent_name}")
+        return self.agents[self.index[agent_name]]
+
+    def depends_on(self, agent_name: str, other_agent: str) -> bool:
+        """Check if an agent transitively depends on another"""
+        return bool(self.depends_on_bits[self.index[agent_name]] >> self.index[other_agent] & 1)
+
+    def dependencies_of(self, agent_name: str) -> List[str]:
+        """All agents an agent transitively depends on"""
+        return self._names(self.depends_on_bits[self.index[agent_name]])
+
+    def blocked_by(self, agent_name: str) -> List[str]:
+        """All agents that transitively depend on (are blocked by) an agent"""
+        return self._names(self.blocks_bits[self.index[agent_name]])
+
+    def closure_bits(self, agent_names, downstream: bool = False) -> int:
+        """Bitset of the given agents plus their dependencies (or dependents)"""
+        closure = self.blocks_bits if downstream else self.depends_on_bits
+        bits = 0
+        for name in agent_names:
+            i = self.index[name]
+            bits |= (1 << i) | closure[i]
+        return bits
+
+    def agent_for_document(self, file_name: str) -> Optional[str]:
+        """Get the agent responsible for a design document"""
+        return self.documents.get(Path(file_name).name)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+SPARC Design Consistency Index
+Indexes the entities, tables and endpoints of the design documents and cross-checks them
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = Path(".claude") / "cache"
+
+HTTP_METHODS = "GET|POST|PUT|PATCH|DELETE|HEAD|OPTIONS"
+ENDPOINT_RE = re.compile(rf"\b({HTTP_METHODS})\b[\s|]+`?(/[^\s`|)\"'<>,]*)")
+ROUTE_DECORATOR_RE = re.compile(r"@(\w+)\.(get|post|put|patch|delete|head|options)\(\s*[\"']((?:/[^\"']*)?)[\"']")
+ROUTER_PREFIX_RE = re.compile(r"(\w+)\s*=\s*(?:\w+\.)?(?:APIRouter|Blueprint)\(.*?\b(?:url_)?prefix\s*=\s*[\"']([^\"']*)[\"']")
+PATH_PARAMETER_RE = re.compile(r"^(?:\{[^}]*\}|<[^>]*>|:\w+)$")
+
+MODEL_CLASS_RE = re.compile(r"^\s*class\s+([A-Za-z_]\w*)\s*\(([^)]*)\)")
+TABLE_NAME_RE = re.compile(r"^\s*__tablename__\s*=\s*[\"'](\w+)[\"']")
+CREATE_TABLE_RE = re.compile(r"\bCREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?[`\"\[]?(\w+)", re.IGNORECASE)
+PRISMA_MODEL_RE = re.compile(r"^\s*model\s+([A-Za-z_]\w*)\s*\{")
+ER_RELATION_RE = re.compile(r"^\s*([A-Za-z_][\w-]*)\s*[|}][|o](?:--|\.\.)[|o][|{]\s*([A-Za-z_][\w-]*)")
+BOLD_ITEM_RE = re.compile(r"^\s*(?:\d+[.)]|[-*+])\s+\*\*([A-Za-z][\w ]*?)\*\*")
+HEADING_RE = re.compile(r"^ {0,3}#{1,6}\s")
+
+MODEL_BASES = {"SQLModel", "BaseModel", "db.Model", "DeclarativeBase"}
+# Suffixes of the CRUD models an API derives from an entity (UserCreate, OrderRead, ...)
+CRUD_SUFFIXES = ("Create", "Update", "Read", "Public")
+
+def normalize_entity(name: str) -> str:
+    """Case-, separator- and plural-insensitive form of an entity or table name"""
+    key = re.sub(r"[^a-z0-9]", "", name.lower())
+    if key.endswith("ies") and len(key) > 4:
+        return key[:-3] + "y"
+    if key.endswith(("sses", "xes", "zes", "ches", "shes")):
+        return key[:-2]
+    if key.endswith("s") and not key.endswith(("ss", "us", "is")) and len(key) > 3:
+        return key[:-1]
+    return key
+
+def normalize_endpoint(method: str, path: str) -> str:
+    """``METHOD /path`` with parameters as ``{}``, no query string and no trailing slash"""
+    segments = [s for s in path.split("?")[0].split("#")[0].lower().split("/") if s]
+    segments = ["{}" if PATH_PARAMETER_RE.match(s) else s for s in segments]
+    return f"{method.upper()} /{'/'.join(segments)}"
+
+def addresses_collection(segment: str, parameter: str) -> bool:
+    """Whether a path segment followed by a parameter addresses entities: /orders/{id} or /user/{user_id}"""
+    key = re.sub(r"[^a-z0-9]", "", segment.lower())
+    entity = normalize_entity(segment)
+    return bool(entity) and (entity != key or re.sub(r"[^a-z0-9]", "", parameter.lower()).startswith(entity))
+
+def extract_design_index(content: bytes) -> Dict[str, Dict[str, list]]:
+    """Index a design document in one pass over its lines
+
+    Returns ``entities`` (data model classes, tables, ER diagram and entity
+    list names), ``exposed`` (entities an API surfaces through resource paths,
+    table models and CRUD models) and ``endpoints``. Each maps a normalized key
+    to ``[name as written, line number]`` of its first occurrence.
+    """
+    entities: Dict[str, list] = {}
+    exposed: Dict[str, list] = {}
+    endpoints: Dict[str, list] = {}
+    in_entity_section = False
+    prefixes: Dict[str, str] = {}  # router variable -> prefix
+
+    for number, line in enumerate(content.decode("utf-8", errors="replace").splitlines(), 1):
+        if HEADING_RE.match(line):
+            in_entity_section = "entit" in line.lower()
+
+        for router, prefix in ROUTER_PREFIX_RE.findall(line):
+            prefixes[router] = prefix.rstrip("/")
+        routes = ENDPOINT_RE.findall(line)
+        routes.extend((method, prefixes.get(router, "") + path or "/")
+                      for router, method, path in ROUTE_DECORATOR_RE.findall(line))
+        for method, path in routes:
+            endpoints.setdefault(normalize_endpoint(method, path), [f"{method.upper()} {path}", number])
+
+        names = []
+        model = MODEL_CLASS_RE.match(line)
+        if model:
+            bases = {b.split("=")[0].strip() for b in model.group(2).split(",")}
+            if bases & MODEL_BASES:
+                name = model.group(1)
+                names.append(name)
+                wrapped = next((name[:-len(suffix)] for suffix in CRUD_SUFFIXES
+                                if name.endswith(suffix) and len(name) > len(suffix)), None)
+                if wrapped or "table=True" in model.group(2).replace(" ", ""):
+                    exposed.setdefault(normalize_entity(wrapped or name), [wrapped or name, number])
+        for match in (TABLE_NAME_RE.match(line), PRISMA_MODEL_RE.match(line)):
+            if match:
+                names.append(match.group(1))
+        names.extend(CREATE_TABLE_RE.findall(line))
+        relation = ER_RELATION_RE.match(line)
+        if relation:
+            names.extend(relation.groups())
+        bold = BOLD_ITEM_RE.match(line) if in_entity_section else None
+        if bold:
+            names.append(bold.group(1))
+
+        for name in names:
+            entities.setdefault(normalize_entity(name), [name, number])
+
+    # Collections addressed by an identifier (/orders/{order_id}) are exposed entities
+    for endpoint, number in endpoints.values():
+        segments = [s for s in endpoint.split(" ", 1)[1].split("?")[0].split("/") if s]
+        for segment, following in zip(segments, segments[1:]):
+            if (PATH_PARAMETER_RE.match(following) and not PATH_PARAMETER_RE.match(segment)
+                    and addresses_collection(segment, following)):
+                exposed.setdefault(normalize_entity(segment), [segment, number])
+
+    return {"entities": entities, "exposed": exposed, "endpoints": endpoints}
+
+def find_mismatches(api: Optional[Dict], database: Optional[Dict],
+                    plan: Optional[Dict]) -> List[Tuple[str, int, str]]:
+    """Cross-reference mismatches as (kind, line, description) tuples
+
+    Every lookup is a dict probe, so the check is linear in the number of
+    indexed names. Checks whose documents are missing are skipped.
+    """
+    mismatches = []
+    if api is not None and database is not None:
+        for key, (name, line) in api["exposed"].items():
+            if key not in database["entities"]:
+                mismatches.append(("api_entity_not_in_data_model", line,
+                                   f"entity '{name}' is not defined in the data model"))
+    if plan is not None and api is not None:
+        for key, (endpoint, line) in plan["endpoints"].items():
+            if key not in api["endpoints"]:
+                mismatches.append(("plan_endpoint_not_in_api", line,
+                                   f"endpoint '{endpoint}' is not in the API specification"))
+    return mismatches
+
+class DesignIndexCache:
+    """Design document indexes and cross-check reports, cached by content hash
+
+    A document is only re-indexed when its SHA-256 changes, and the mismatch
+    report is reused outright while all three document hashes are unchanged.
+    """
+
+    CACHE_VERSION = 2
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_file = Path(cache_dir or DEFAULT_CACHE_DIR) / "design-index.json"
+        self._documents: Optional[Dict[str, list]] = None  # path -> [sha256, index]
+        self._reports: Dict[str, list] = {}                # joined paths -> [[sha256, ...], mismatches]
+        self.reindexed: List[str] = []
+
+    def _load(self):
+        """Read the on-disk cache once"""
+        self._documents, self._reports = {}, {}
+        try:
+            with open(self.cache_file) as f:
+                cached = json.load(f)
+            if cached.get("version") == self.CACHE_VERSION:
+                self._documents, self._reports = cached["documents"], cached["reports"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _index(self, path: Path) -> Tuple[Optional[str], Optional[Dict]]:
+        """Content hash and index of a document, or (None, None) if it does not exist"""
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except OSError:
+            return None, None
+
+        digest = hashlib.sha256(content).hexdigest()
+        cached = self._documents.get(str(path))
+        if cached and cached[0] == digest:
+            return digest, cached[1]
+
+        index = extract_design_index(content)
+        self._documents[str(path)] = [digest, index]
+        self.reindexed.append(str(path))
+        return digest, index
+
+    def check(self, api_path: Path, database_path: Path, plan_path: Path) -> List[Tuple[str, str, int, str]]:
+        """Mismatches between the API specification, database design and implementation plan
+
+        Returns (kind, document path, line, description) tuples.
+        """
+        if self._documents is None:
+            self._load()
+        self.reindexed = []
+
+        paths = (api_path, database_path, plan_path)
+        report_key = "\n".join(str(path) for path in paths)
+        hashes, indexes = zip(*(self._index(path) for path in paths))
+        cached = self._reports.get(report_key)
+        if cached and cached[0] == list(hashes):
+            return [tuple(m) for m in cached[1]]
+
+        document_of = {"api_entity_not_in_data_model": str(api_path), "plan_endpoint_not_in_api": str(plan_path)}
+        mismatches = [(kind, document_of[kind], line, description)
+                      for kind, line, description in find_mismatches(*indexes)]
+
+        self._reports[report_key] = [list(hashes), [list(m) for m in mismatches]]
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, 'w') as f:
+                json.dump({"version": self.CACHE_VERSION, "documents": self._documents, "reports": self._reports}, f)
+            os.replace(tmp_file, self.cache_file)
+        except OSError:
+            pass  # Caching is an optimization only
+
+        return mismatches
@@ -0,0 +1,735 @@
+#!/usr/bin/env python3
+"""
+SPARC Technology Lock Checks
+Extracts imports from the source tree and checks them against technology-lock.json
+"""
+
+import ast
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11: pyproject.toml and TOML lockfiles are skipped
+    tomllib = None
+
+try:
+    from packaging.specifiers import InvalidSpecifier, SpecifierSet
+except ImportError:  # Without packaging, PEP 440 range specs are not checked against pins
+    SpecifierSet = None
+
+DEFAULT_CACHE_DIR = Path(".claude") / "cache"
+
+SOURCE_LANGUAGES = {
+    ".py": "python",
+    ".js": "javascript", ".jsx": "javascript", ".mjs": "javascript", ".cjs": "javascript",
+    ".ts": "javascript", ".tsx": "javascript", ".mts": "javascript", ".cts": "javascript"
+}
+# Directories holding a project's source code; top-level Python packages and modules count too
+DEFAULT_SOURCE_ROOTS = ("src", "lib", "app")
+SKIP_DIRS = {".git", ".hg", ".svn", ".claude", "node_modules", "__pycache__", ".venv", "venv",
+             ".tox", ".nox", ".mypy_cache", ".pytest_cache", "dist", "build", "site-packages"}
+
+NODE_BUILTINS = {
+    "assert", "async_hooks", "buffer", "child_process", "cluster", "console", "constants", "crypto",
+    "dgram", "diagnostics_channel", "dns", "domain", "events", "fs", "http", "http2", "https",
+    "inspector", "module", "net", "os", "path", "perf_hooks", "process", "punycode", "querystring",
+    "readline", "repl", "stream", "string_decoder", "sys", "timers", "tls", "trace_events", "tty",
+    "url", "util", "v8", "vm", "wasi", "worker_threads", "zlib"
+}
+
+# Tokens that end an import/export clause before any "from"
+JS_CLAUSE_END = {";", "=", "(", "import", "export", "function", "class", "const", "let", "var",
+                 "interface", "enum", "async"}
+
+# JS/TS tokenizer that only emits the tokens import extraction needs. Comments and
+# template literals are matched so their contents are skipped; other identifiers and
+# punctuation are never materialized.
+JS_TOKEN_RE = re.compile(r"""
+      (?P<comment>//[^\n]*|/\*.*?\*/)
+    | (?P<string>'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*")
+    | (?P<template>`(?:[^`\\]|\\.)*`)
+    | (?<![\w$])(?P<word>require|from|%s)(?![\w$])
+    | (?P<punct>[;=(.])
+""" % "|".join(sorted(w for w in JS_CLAUSE_END if w.isalpha())), re.VERBOSE | re.DOTALL)
+JS_LOOKAHEAD = 64
+
+VERSION_RE = re.compile(r"\d+(?:\.\d+)*")
+PYTHON_EXACT_RE = re.compile(r"^(?:===?)?\s*v?(\d+(?:\.\d+)*)$")
+NPM_EXACT_RE = re.compile(r"^=?\s*v?(\d+\.\d+\.\d+)(?:[-+][\w.+-]*)?$")
+NPM_COMPARATOR_RE = re.compile(r"(<=|>=|<|>|=|\^|~>?)?\s*v?([\dxX*]+(?:\.[\dxX*]+)*)(?:[-+][\w.+-]*)?")
+
+# Package and ecosystem of well-known frameworks named in technology-lock.json entries
+FRAMEWORK_PACKAGES = {
+    "react": ("javascript", "react"), "vue": ("javascript", "vue"), "vue.js": ("javascript", "vue"),
+    "angular": ("javascript", "@angular/core"), "next.js": ("javascript", "next"), "nextjs": ("javascript", "next"),
+    "svelte": ("javascript", "svelte"), "express": ("javascript", "express"), "nestjs": ("javascript", "@nestjs/core"),
+    "fastapi": ("python", "fastapi"), "django": ("python", "django"), "flask": ("python", "flask"),
+    "sqlmodel": ("python", "sqlmodel"), "sqlalchemy": ("python", "sqlalchemy")
+}
+
+# Files to re-scan before the work is spread over a process pool
+PARALLEL_THRESHOLD = 256
+
+def extract_python_imports(source: bytes) -> List[Tuple[str, int]]:
+    """Absolute imports of a Python module as (module, line) pairs"""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+
+    imports = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend((alias.name, node.lineno) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            imports.append((node.module, node.lineno))
+    return sorted(imports, key=lambda item: item[1])
+
+def _next_char(text: str, pos: int, step: int) -> str:
+    """First non-whitespace character from ``pos`` in direction ``step``"""
+    while 0 <= pos < len(text) and text[pos].isspace():
+        pos += step
+    return text[pos] if 0 <= pos < len(text) else ""
+
+def extract_js_imports(source: bytes) -> List[Tuple[str, int]]:
+    """Module specifiers of a JS/TS file's import, export-from and require() statements"""
+    text = source.decode("utf-8", errors="replace")
+    if "import" not in text and "require" not in text:
+        return []
+
+    tokens = [(m.lastgroup, m.group(), m.start()) for m in JS_TOKEN_RE.finditer(text) if m.lastgroup != "comment"]
+    imports = []
+    line, line_pos = 1, 0
+
+    for i, (kind, value, pos) in enumerate(tokens):
+        if kind != "word" or value not in ("import", "export", "require"):
+            continue
+        if _next_char(text, pos - 1, -1) == "." or _next_char(text, pos + len(value), 1) == ".":
+            continue  # member access such as module.require or import.meta
+
+        following = tokens[i + 1:i + 3]
+        spec = None
+        if value != "export" and len(following) == 2 and following[0][1] == "(" and following[1][0] == "string" \
+                and not text[following[0][2] + 1:following[1][2]].strip():
+            spec = following[1]  # require("x") or import("x")
+        elif value == "import" and following and following[0][0] == "string":
+            spec = following[0]  # import "x"
+        elif value != "require" and following:
+            for j in range(i + 1, min(i + JS_LOOKAHEAD, len(tokens) - 1)):
+                if tokens[j][1] == "from" and tokens[j][0] == "word":
+                    if tokens[j + 1][0] == "string":
+                        spec = tokens[j + 1]
+                    break
+                if tokens[j][1] in JS_CLAUSE_END:
+                    break
+
+        if spec:
+            line += text.count("\n", line_pos, spec[2])
+            line_pos = spec[2]
+            imports.append((spec[1][1:-1], line))
+
+    return imports
+
+def extract_imports(language: str, source: bytes) -> List[Tuple[str, int]]:
+    """Extract (module, line) imports for a source language"""
+    if language == "python":
+        return extract_python_imports(source)
+    return extract_js_imports(source)
+
+def package_name(language: str, module: str) -> Optional[str]:
+    """Third-party package an import refers to, or None for relative/built-in imports"""
+    if language == "python":
+        top_level = module.split(".", 1)[0]
+        return None if top_level in sys.stdlib_module_names else top_level.lower()
+
+    if module.startswith((".", "/", "#", "~/", "@/", "node:")) or "://" in module:
+        return None
+    module = module.split("?", 1)[0]
+    parts = module.split("/")
+    name = "/".join(parts[:2]) if module.startswith("@") else parts[0]
+    return None if name in NODE_BUILTINS else name.lower()
+
+def walk_files(root: Path) -> Iterator[os.DirEntry]:
+    """Yield every regular file under root with one os.scandir walk, skipping vendored and tool directories"""
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS and not entry.name.endswith(".egg-info"):
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry
+        except OSError:
+            continue
+
+def _scan_file(path: str, language: str, previous_hash: Optional[str]) -> Tuple[str, Optional[str], Optional[list]]:
+    """Hash a source file and extract its imports unless its contents are unchanged (process pool worker)"""
+    try:
+        with open(path, 'rb') as f:
+            source = f.read()
+    except OSError:
+        return path, None, None
+
+    content_hash = hashlib.sha256(source).hexdigest()
+    if content_hash == previous_hash:
+        return path, content_hash, None
+    return path, content_hash, extract_imports(language, source)
+
+class PackageRuleTrie:
+    """Allow/deny package rules compiled into a character trie
+
+    Entries are exact package names or prefixes ending in ``*`` (for example
+    ``@types/*``). A lookup walks the package name once, so checking every
+    entry of a large lockfile is a single linear pass. The longest matching
+    entry wins, an exact entry beats a prefix of the same length, and deny
+    beats allow for identical entries.
+    """
+
+    EXACT = "\0exact"
+    PREFIX = "\0prefix"
+
+    def __init__(self, allow: Optional[List[str]], deny: List[str], normalize: Callable[[str], str] = str.lower):
+        self.normalize = normalize
+        self.has_allow_list = allow is not None
+        self._root: Dict[str, dict] = {}
+        for verdict, patterns in (("allow", allow or []), ("deny", deny)):
+            for pattern in patterns:
+                node = self._root
+                for char in normalize(pattern.rstrip("*")):
+                    node = node.setdefault(char, {})
+                node[self.PREFIX if pattern.endswith("*") else self.EXACT] = verdict
+
+    def match(self, package: str) -> Optional[str]:
+        """Verdict of the most specific matching entry ("allow"/"deny"), or None"""
+        node = self._root
+        verdict = node.get(self.PREFIX)
+        for char in self.normalize(package):
+            node = node.get(char)
+            if node is None:
+                return verdict
+            verdict = node.get(self.PREFIX, verdict)
+        return node.get(self.EXACT, verdict)
+
+    def check(self, package: str) -> Optional[str]:
+        """Reason a package is not allowed, or None if it is"""
+        verdict = self.match(package)
+        if verdict == "deny":
+            return "denied by technology-lock.json"
+        if verdict is None and self.has_allow_list:
+            return "not in the technology-lock.json allow list"
+        return None
+
+def normalize_package(language: str, name: str) -> str:
+    """Canonical package name: PEP 503 for Python, lowercase for npm"""
+    if language == "python":
+        return re.sub(r"[-_.]+", "-", name).lower()
+    return name.lower()
+
+def _release(version: str) -> Tuple[int, ...]:
+    """Numeric release of an exact version, padded so that 18.2 and 18.2.0 compare equal"""
+    parts = [int(part) for part in VERSION_RE.search(version).group().split(".")]
+    return tuple(parts + [0] * (3 - len(parts)))
+
+def exact_version(language: str, spec: str) -> Optional[str]:
+    """The version an exact pin or resolved version names, or None for a range spec"""
+    match = (PYTHON_EXACT_RE if language == "python" else NPM_EXACT_RE).match(spec.strip())
+    return match.group(1) if match else None
+
+def _npm_bound(parts: List[Optional[int]], index: int) -> Tuple[int, ...]:
+    """The version above a partial version at a position: ^1.2.3 at 0 gives 2.0.0"""
+    bumped = [part or 0 for part in parts[:index]] + [(parts[index] or 0) + 1]
+    return tuple(bumped + [0] * (3 - len(bumped)))
+
+def _npm_comparator_allows(operator: str, text: str, version: Tuple[int, ...]) -> bool:
+    """Whether one npm comparator, caret/tilde range or x-range allows a release"""
+    parts: List[Optional[int]] = [None if part in ("x", "X", "*") else int(part) for part in text.split(".")][:3]
+    specified = next((i for i, part in enumerate(parts) if part is None), len(parts))
+    parts = parts[:specified]
+    if not parts:
+        return operator not in ("<", ">")
+    lower = tuple(parts + [0] * (3 - len(parts)))
+
+    if operator == "^":
+        significant = next((i for i, part in enumerate(parts) if part), len(parts) - 1)
+        return lower <= version < _npm_bound(parts, significant)
+    if operator in ("~", "~>"):
+        return lower <= version < _npm_bound(parts, min(1, len(parts) - 1))
+    if operator == ">=":
+        return version >= lower
+    if operator == "<":
+        return version < lower
+    if operator == ">":
+        return version > lower if len(parts) == 3 else version >= _npm_bound(parts, len(parts) - 1)
+    if operator == "<=":
+        return version <= lower if len(parts) == 3 else version < _npm_bound(parts, len(parts) - 1)
+    return lower <= version < _npm_bound(parts, len(parts) - 1) if len(parts) < 3 else version == lower
+
+def npm_range_allows(spec: str, version: str) -> Optional[bool]:
+    """Whether an npm semver range (||, hyphen, comparators, ^, ~, x-ranges) allows a version; None if unparseable"""
+    release = _release(version)
+    for alternative in spec.split("||"):
+        alternative = alternative.strip()
+        hyphen = re.fullmatch(r"(\S+)\s+-\s+(\S+)", alternative)
+        if hyphen:
+            comparators = [(">=", hyphen.group(1)), ("<=", hyphen.group(2))]
+        elif alternative in ("", "*", "latest", "x", "X"):
+            return True
+        else:
+            comparators = [(m.group(1) or "", m.group(2)) for m in NPM_COMPARATOR_RE.finditer(alternative)]
+            if not comparators or NPM_COMPARATOR_RE.sub("", alternative).strip(" ,"):
+                return None  # tags, URLs, git and workspace references
+        if all(_npm_comparator_allows(op, text.lstrip("v"), release) for op, text in comparators):
+            return True
+    return False
+
+def python_spec_allows(spec: str, version: str) -> Optional[bool]:
+    """Whether a PEP 440 or Poetry version spec allows a version; None if it cannot be evaluated"""
+    spec = spec.strip()
+    if spec in ("", "*"):
+        return True
+    if spec.startswith(("^", "~")) and not spec.startswith("~="):
+        return npm_range_allows(spec, version)  # Poetry caret and tilde follow npm semantics
+    if SpecifierSet is None:
+        return None
+    try:
+        return SpecifierSet(spec).contains(version, prereleases=True)
+    except InvalidSpecifier:
+        return None
+
+def framework_package(entry: Dict) -> Optional[Tuple[str, str]]:
+    """(language, package) a technology-lock.json framework entry pins, or None if its ecosystem is unknown"""
+    name = str(entry["framework"])
+    known = FRAMEWORK_PACKAGES.get(name.lower())
+    language = entry.get("language")
+    if language in ("python", "javascript"):
+        return language, known[1] if known and known[0] == language else name
+    return known
+
+class PackagePolicy:
+    """Package rules per language from one section of technology-lock.json
+
+    The lock file's optional ``imports`` and ``dependencies`` sections map a
+    language (``python`` or ``javascript``, which also covers TypeScript) to
+    ``allow`` and ``deny`` lists. With an allow list, every other third-party
+    package is a violation; denied packages always are. ``dependencies`` may
+    also pin ``versions``, and every ``{"framework", "version"}`` entry of the
+    lock (such as the backend framework) is pinned as well, in the ecosystem
+    its optional ``language`` key or the framework's known package names.
+    Range specs conflict with a pin only when they exclude the pinned version.
+    """
+
+    def __init__(self, rules: Dict[str, Dict], versions: Optional[Dict[str, Dict[str, str]]] = None):
+        self.rules = {
+            language: PackageRuleTrie(language_rules.get("allow"), language_rules.get("deny", []),
+                                      lambda name, language=language: normalize_package(language, name))
+            for language, language_rules in rules.items()
+        }
+        self.versions = {
+            language: {normalize_package(language, name): version for name, version in pins.items()}
+            for language, pins in (versions or {}).items()
+        }
+
+    @classmethod
+    def from_technology_lock(cls, tech_lock: Dict, section: str) -> Optional["PackagePolicy"]:
+        """Build the policy for a lock file section, or None if there is nothing to check"""
+        if not isinstance(tech_lock, dict):
+            return None
+        rules = tech_lock.get(section)
+        rules = {language: r for language, r in rules.items() if isinstance(r, dict)} if isinstance(rules, dict) else {}
+
+        versions: Dict[str, Dict[str, str]] = {}
+        if section == "dependencies":
+            for spec in tech_lock.values():
+                if isinstance(spec, dict) and "framework" in spec and "version" in spec:
+                    pin = framework_package(spec)
+                    if pin:
+                        versions.setdefault(pin[0], {})[pin[1]] = str(spec["version"])
+            for language in ("python", "javascript"):
+                versions[language] = dict(versions.get(language, {}), **rules.get(language, {}).get("versions", {}))
+
+        if not rules and not any(versions.values()):
+            return None
+        return cls(rules, versions)
+
+    def check(self, language: str, package: str) -> Optional[str]:
+        """Reason a package is not allowed, or None if it is"""
+        trie = self.rules.get(language)
+        return trie.check(package) if trie else None
+
+    def check_version(self, language: str, package: str, version: str) -> Optional[str]:
+        """Reason a declared or locked version conflicts with the pinned version, or None"""
+        pinned = self.versions.get(language, {}).get(normalize_package(language, package))
+        if pinned is None or not version.strip():
+            return None
+        declared, expected = exact_version(language, version), exact_version(language, pinned)
+        if declared and expected:
+            conflict = _release(declared) != _release(expected)
+        elif expected:
+            allows = python_spec_allows if language == "python" else npm_range_allows
+            conflict = allows(version, expected) is False
+        else:
+            conflict = False  # A range pin is not compared against declared specs
+        return f"version {version} does not match the locked {pinned}" if conflict else None
+
+class ImportScanner:
+    """Extracts imports from every source file in a project's source roots
+
+    Results are cached on disk per file content hash. A file is only read
+    again when its mtime or size changed, and only re-parsed when its
+    contents did; large re-scans are spread over a process pool.
+    """
+
+    CACHE_VERSION = 1
+
+    def __init__(self, root: str = ".", cache_dir: Optional[Path] = None, max_workers: Optional[int] = None,
+                 source_roots: Tuple[str, ...] = DEFAULT_SOURCE_ROOTS):
+        self.root = Path(root)
+        self.source_roots = source_roots
+        self.cache_file = Path(cache_dir or DEFAULT_CACHE_DIR) / "import-scan.json"
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._files: Dict[str, list] = {}      # path -> [mtime_ns, size, content hash]
+        self._imports: Dict[str, list] = {}    # "language:hash" -> [[module, line], ...]
+        self._cache_loaded = False
+        self.rescanned: List[str] = []
+
+    def _load_cache(self):
+        """Load the on-disk cache once per scanner"""
+        if self._cache_loaded:
+            return
+        self._cache_loaded = True
+        try:
+            with open(self.cache_file) as f:
+                cached = json.load(f)
+            if cached.get("version") == self.CACHE_VERSION:
+                self._files, self._imports = cached["files"], cached["imports"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _save_cache(self):
+        """Persist the cache; caching is an optimization only"""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, 'w') as f:
+                json.dump({"version": self.CACHE_VERSION, "files": self._files, "imports": self._imports}, f)
+            os.replace(tmp_file, self.cache_file)
+        except OSError:
+            pass
+
+    def source_files(self) -> Iterator[Tuple[str, str, os.stat_result]]:
+        """Walk the source roots once, yielding (path, language, stat) for each source file
+
+        Source roots are the configured directories, top-level Python packages
+        and the source files at the project root.
+        """
+        try:
+            with os.scandir(self.root) as entries:
+                top_level = sorted(entries, key=lambda entry: entry.name)
+        except OSError:
+            return
+
+        for entry in top_level:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name in SKIP_DIRS or not (entry.name in self.source_roots
+                                                   or os.path.isfile(os.path.join(entry.path, "__init__.py"))):
+                    continue
+                files = walk_files(Path(entry.path))
+            elif entry.is_file():
+                files = [entry]
+            else:
+                continue
+            for file_entry in files:
+                language = SOURCE_LANGUAGES.get(os.path.splitext(file_entry.name)[1])
+                if language:
+                    yield os.path.relpath(file_entry.path, self.root), language, file_entry.stat()
+
+    def scan(self) -> Dict[str, Tuple[str, List[Tuple[str, int]]]]:
+        """Map every source file to its language and (module, line) imports"""
+        self._load_cache()
+        files: Dict[str, list] = {}
+        languages: Dict[str, str] = {}
+        changed = []
+
+        for path, language, stat in self.source_files():
+            languages[path] = language
+            cached = self._files.get(path)
+            known_hash = cached[2] if cached and f"{language}:{cached[2]}" in self._imports else None
+            if known_hash and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                files[path] = cached
+            else:
+                files[path] = [stat.st_mtime_ns, stat.st_size, known_hash]
+                changed.append(path)
+
+        # Workers skip parsing when the contents hash to the known value
+        jobs = [(str(self.root / path), languages[path], files[path][2]) for path in changed]
+        if len(jobs) >= PARALLEL_THRESHOLD and self.max_workers > 1:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                chunk_size = max(1, len(jobs) // (self.max_workers * 8))
+                results = list(executor.map(_scan_file, *zip(*jobs), chunksize=chunk_size))
+        else:
+            results = [_scan_file(*job) for job in jobs]
+
+        self.rescanned = []
+        for path, (_, content_hash, imports) in zip(changed, results):
+            if content_hash is None:
+                del files[path]
+                continue
+            files[path][2] = content_hash
+            if imports is not None:
+                self._imports[f"{languages[path]}:{content_hash}"] = [list(item) for item in imports]
+                self.rescanned.append(path)
+
+        # Keep only results still referenced by a file
+        live = {f"{languages[path]}:{entry[2]}" for path, entry in files.items()}
+        self._imports = {key: value for key, value in self._imports.items() if key in live}
+        modified = bool(changed) or files.keys() != self._files.keys()
+        self._files = files
+        if modified:
+            self._save_cache()
+
+        return {path: (languages[path], [tuple(item) for item in self._imports[f"{languages[path]}:{entry[2]}"]])
+                for path, entry in sorted(files.items())}
+
+    def first_party_modules(self, paths: List[str]) -> Set[str]:
+        """Top-level Python module names the project defines: root-level modules and packages, or those under src/"""
+        names = set()
+        for path in paths:
+            parts = Path(path).parts
+            if parts[0] == "src" and len(parts) > 1:
+                parts = parts[1:]
+            names.add(Path(parts[0]).stem.lower())
+        return names
+
+    def find_violations(self, policy: PackagePolicy) -> List[Tuple[str, int, str, str]]:
+        """Imports not allowed by a policy, as (path, line, package, reason) tuples"""
+        scanned = self.scan()
+        first_party = self.first_party_modules([p for p, (language, _) in scanned.items() if language == "python"])
+
+        violations = []
+        for path, (language, imports) in scanned.items():
+            for module, line in imports:
+                package = package_name(language, module)
+                if package is None or (language == "python" and package in first_party):
+                    continue
+                reason = policy.check(language, package)
+                if reason:
+                    violations.append((path, line, package, reason))
+        return violations
+
+REQUIREMENT_RE = re.compile(r"([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*(.*)")
+REQUIREMENTS_FILE_RE = re.compile(r"requirements.*\.txt$")
+
+def _parse_requirement(line: str) -> Optional[Tuple[str, str]]:
+    """Name and version spec of a PEP 508 requirement string"""
+    line = line.split("#", 1)[0].split(";", 1)[0].strip().rstrip("\\").strip()
+    if not line or line.startswith("-"):
+        return None
+    match = REQUIREMENT_RE.match(line)
+    if not match:
+        return None
+    spec = match.group(2).strip()
+    if "://" in line:  # direct references must be "name @ url"
+        return (match.group(1), "") if spec.startswith("@") else None
+    return match.group(1), spec
+
+def parse_requirements_txt(data: bytes) -> List[Tuple[str, str, str]]:
+    """requirements*.txt, including pip-compile output with hashes"""
+    requirements = (_parse_requirement(line) for line in data.decode("utf-8", errors="replace").splitlines())
+    return [("python", name, spec) for name, spec in filter(None, requirements)]
+
+def parse_pyproject_toml(data: bytes) -> List[Tuple[str, str, str]]:
+    """PEP 621 and Poetry dependency tables of pyproject.toml"""
+    document = tomllib.loads(data.decode("utf-8"))
+    project = document.get("project", {})
+    requirements = list(project.get("dependencies", []))
+    for group in project.get("optional-dependencies", {}).values():
+        requirements.extend(group)
+    found = [("python", name, spec) for name, spec in filter(None, map(_parse_requirement, requirements))]
+
+    poetry = document.get("tool", {}).get("poetry", {})
+    tables = [poetry.get("dependencies", {}), poetry.get("dev-dependencies", {})]
+    tables.extend(group.get("dependencies", {}) for group in poetry.get("group", {}).values())
+    for table in tables:
+        for name, spec in table.items():
+            if name.lower() != "python":
+                found.append(("python", name, spec.get("version", "") if isinstance(spec, dict) else str(spec)))
+    return found
+
+def parse_toml_lock(data: bytes) -> List[Tuple[str, str, str]]:
+    """poetry.lock and uv.lock: [[package]] tables with a name and resolved version"""
+    packages = tomllib.loads(data.decode("utf-8")).get("package", [])
+    return [("python", p["name"], str(p.get("version", ""))) for p in packages if "name" in p]
+
+def parse_pipfile_lock(data: bytes) -> List[Tuple[str, str, str]]:
+    """Pipfile.lock default and develop packages"""
+    document = json.loads(data)
+    return [("python", name, info.get("version", "") if isinstance(info, dict) else "")
+            for section in ("default", "develop") for name, info in document.get(section, {}).items()]
+
+def parse_package_json(data: bytes) -> List[Tuple[str, str, str]]:
+    """All dependency sections of package.json"""
+    document = json.loads(data)
+    return [("javascript", name, str(spec))
+            for section in ("dependencies", "devDependencies", "peerDependencies", "optionalDependencies")
+            for name, spec in (document.get(section) or {}).items()]
+
+def parse_package_lock_json(data: bytes) -> List[Tuple[str, str, str]]:
+    """package-lock.json v1 (nested dependencies) and v2/v3 (packages map)"""
+    document = json.loads(data)
+    if "packages" in document:  # lockfile v2/v3
+        return [("javascript", path.rsplit("node_modules/", 1)[1], info.get("version", ""))
+                for path, info in document["packages"].items() if "node_modules/" in path]
+
+    found = []
+    stack = [document.get("dependencies", {})]
+    while stack:
+        for name, info in stack.pop().items():
+            found.append(("javascript", name, info.get("version", "")))
+            stack.append(info.get("dependencies", {}))
+    return found
+
+def parse_yarn_lock(data: bytes) -> List[Tuple[str, str, str]]:
+    """Classic and Berry yarn.lock: unindented entry headers followed by an indented version"""
+    found = []
+    name = None
+    for line in data.decode("utf-8", errors="replace").splitlines():
+        if line and not line[0].isspace() and not line.startswith("#") and line.endswith(":"):
+            descriptor = line[:-1].split(",", 1)[0].strip().strip('"')
+            at = descriptor.find("@", 1)
+            name = descriptor[:at] if at > 0 else None
+        elif name and line.strip().startswith("version"):
+            version = line.strip()[len("version"):].lstrip(":").strip().strip('"')
+            found.append(("javascript", name, version))
+            name = None
+    return [entry for entry in found if entry[1] != "__metadata"]
+
+MANIFEST_PARSERS: Dict[str, Callable[[bytes], List[Tuple[str, str, str]]]] = {
+    "pyproject.toml": parse_pyproject_toml,
+    "poetry.lock": parse_toml_lock,
+    "uv.lock": parse_toml_lock,
+    "Pipfile.lock": parse_pipfile_lock,
+    "package.json": parse_package_json,
+    "package-lock.json": parse_package_lock_json,
+    "yarn.lock": parse_yarn_lock
+}
+TOML_MANIFESTS = {"pyproject.toml", "poetry.lock", "uv.lock"}
+# Resolved dependency trees: their entries include transitive packages, so only versions are checked
+LOCKFILES = {"poetry.lock", "uv.lock", "Pipfile.lock", "package-lock.json", "yarn.lock"}
+# Top-level directories holding documentation, samples or test data rather than a part of the project
+NON_PROJECT_DIRS = {"docs", "examples", "example", "fixtures", "samples", "test", "tests"}
+
+def manifest_parser(file_name: str) -> Optional[Callable[[bytes], List[Tuple[str, str, str]]]]:
+    """Parser for a dependency manifest or lockfile, or None for other files"""
+    if REQUIREMENTS_FILE_RE.match(file_name):
+        return parse_requirements_txt
+    if file_name in TOML_MANIFESTS and tomllib is None:
+        return None
+    return MANIFEST_PARSERS.get(file_name)
+
+class ManifestScanner:
+    """Parses the dependency manifests and lockfiles of a project
+
+    Only the project root and its top-level directories (``frontend/``,
+    ``backend/``) are searched, so nested example or fixture manifests are
+    not mistaken for the project's own. Parsed manifests are cached on disk
+    by mtime and size, so unchanged manifests are never read again.
+    """
+
+    CACHE_VERSION = 1
+
+    def __init__(self, root: str = ".", cache_dir: Optional[Path] = None):
+        self.root = Path(root)
+        self.cache_file = Path(cache_dir or DEFAULT_CACHE_DIR) / "manifest-scan.json"
+        self._manifests: Optional[Dict[str, list]] = None  # path -> [mtime_ns, size, [[language, name, spec], ...]]
+        self.reparsed: List[str] = []
+
+    def scan(self) -> Dict[str, List[Tuple[str, str, str]]]:
+        """Map every manifest to its (language, package, version spec) entries"""
+        if self._manifests is None:
+            self._manifests = {}
+            try:
+                with open(self.cache_file) as f:
+                    cached = json.load(f)
+                if cached.get("version") == self.CACHE_VERSION:
+                    self._manifests = cached["manifests"]
+            except (OSError, ValueError, KeyError):
+                pass
+
+        manifests = {}
+        self.reparsed = []
+        for entry in self._manifest_candidates():
+            parser = manifest_parser(entry.name)
+            if parser is None:
+                continue
+
+            path = os.path.relpath(entry.path, self.root)
+            stat = entry.stat()
+            cached = self._manifests.get(path)
+            if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                manifests[path] = cached
+                continue
+
+            try:
+                with open(entry.path, 'rb') as f:
+                    packages = parser(f.read())
+            except (OSError, ValueError, KeyError, TypeError, AttributeError, IndexError):
+                packages = []  # Unreadable or malformed manifests declare nothing
+            manifests[path] = [stat.st_mtime_ns, stat.st_size, [list(p) for p in packages]]
+            self.reparsed.append(path)
+
+        modified = bool(self.reparsed) or manifests.keys() != self._manifests.keys()
+        self._manifests = manifests
+        if modified:
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+                with open(tmp_file, 'w') as f:
+                    json.dump({"version": self.CACHE_VERSION, "manifests": manifests}, f)
+                os.replace(tmp_file, self.cache_file)
+            except OSError:
+                pass  # Caching is an optimization only
+
+        return {path: [tuple(p) for p in entry[2]] for path, entry in sorted(manifests.items())}
+
+    def _manifest_candidates(self) -> Iterator[os.DirEntry]:
+        """Files at the project root and directly inside its top-level project directories"""
+        directories = [str(self.root)]
+        while directories:
+            directory = directories.pop(0)
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in sorted(entries, key=lambda e: e.name):
+                        if entry.is_file():
+                            yield entry
+                        elif (directory == str(self.root) and entry.is_dir(follow_symlinks=False)
+                              and entry.name not in SKIP_DIRS and entry.name not in NON_PROJECT_DIRS
+                              and not entry.name.startswith(".")):
+                            directories.append(entry.path)
+            except OSError:
+                continue
+
+    def find_violations(self, policy: PackagePolicy) -> List[Tuple[str, str, str]]:
+        """Packages that break a policy, as (path, package, reason) tuples
+
+        Allow and deny rules apply to direct declarations only; lockfile
+        entries, which include every transitive package, are only checked
+        against version pins.
+        """
+        violations = []
+        for path, packages in self.scan().items():
+            locked = os.path.basename(path) in LOCKFILES
+            for language, package, version in packages:
+                reason = (None if locked else policy.check(language, package)) \
+                    or policy.check_version(language, package, version)
+                if reason:
+                    violations.append((path, package, reason))
+        return violations
@@ -7,13 +7,69 @@ Intercepts file operations and enforces test-driven development practices
 import os
 import sys
 import ast
+import bisect
+import hashlib
 import re
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+from dataclasses import asdict, dataclass, field
 import json
 
+import tdd_guard_index
+from tdd_guard_index import TestFileMap, TestIdentifierIndex, ViolationCache, matches_patterns
+
+def _rules_hash() -> str:
+    """Hash of the code that decides violations; any rule change yields a new hash"""
+    digest = hashlib.sha256()
+    for module_file in (__file__, tdd_guard_index.__file__):
+        with open(module_file, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+RULES_HASH = _rules_hash()
+
+SOURCE_SUFFIXES = ('.py', '.js', '.ts', '.jsx', '.tsx')
+
+HUNK_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+def parse_diff_hunks(diff: str) -> Dict[str, List[Tuple[int, int]]]:
+    """Changed line ranges on the new side of a ``--unified=0`` diff, by file, sorted and merged"""
+    changed: Dict[str, List[Tuple[int, int]]] = {}
+    ranges = None
+    in_header = False
+    for line in diff.splitlines():
+        if line.startswith("diff --git "):
+            in_header, ranges = True, None
+        elif in_header and line.startswith("+++ "):
+            path = line[4:]
+            ranges = None if path == "/dev/null" else changed.setdefault(path[2:] if path.startswith("b/") else path, [])
+        elif line.startswith("@@"):
+            in_header = False
+            hunk = HUNK_RE.match(line)
+            if hunk and ranges is not None:
+                start, count = int(hunk.group(1)), int(hunk.group(2) or 1)
+                # A pure deletion (count 0) touches the line it followed
+                ranges.append((max(start, 1), max(start + count - 1, start, 1)))
+    
+    for path, ranges in changed.items():
+        merged: List[Tuple[int, int]] = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        changed[path] = merged
+    return changed
+
+def lines_overlap(changed_lines: Optional[List[Tuple[int, int]]], start: int, end: int) -> bool:
+    """Whether sorted, merged changed line ranges touch lines start..end (always, when unscoped)"""
+    if changed_lines is None:
+        return True
+    i = bisect.bisect_right(changed_lines, (end, float("inf"))) - 1
+    return i >= 0 and changed_lines[i][1] >= start
+
 @dataclass
 class TDDViolation:
     """Represents a TDD violation that needs to be addressed"""
@@ -24,30 +80,234 @@ class TDDViolation:
     line_number: Optional[int] = None
     suggested_fix: Optional[str] = None
 
+@dataclass
+class FunctionMetrics:
+    """Size, complexity and nesting of one Python function or method"""
+    name: str
+    line_number: int
+    length: int
+    complexity: int = 1
+    nesting_depth: int = 0
+    class_name: Optional[str] = None
+    is_async: bool = False
+    
+    @property
+    def qualified_name(self) -> str:
+        """``Class.method`` for methods, the plain name otherwise"""
+        return f"{self.class_name}.{self.name}" if self.class_name else self.name
+
+@dataclass
+class ClassMetrics:
+    """Aggregate metrics of a class's methods"""
+    name: str
+    line_number: int
+    methods: int = 0
+    total_complexity: int = 0
+    max_complexity: int = 0
+
+@dataclass
+class ModuleMetrics:
+    """Everything the TDD checks need from one parse of a Python module"""
+    functions: List[FunctionMetrics] = field(default_factory=list)
+    classes: List[ClassMetrics] = field(default_factory=list)
+    
+    @property
+    def public_functions(self) -> List[FunctionMetrics]:
+        """Functions whose names do not start with an underscore"""
+        return [f for f in self.functions if not f.name.startswith('_')]
+
+class FunctionMetricsVisitor(ast.NodeVisitor):
+    """Collects function length, cyclomatic complexity and nesting depth in one traversal
+    
+    Every node is visited once. Open classes and functions are kept on a scope
+    stack and each decision point is credited to the innermost function only,
+    so nested functions are measured on their own. Decision points are
+    branches, loops, ``except`` handlers, ``match`` cases, conditional
+    expressions, comprehension loops and filters, and extra boolean operands.
+    """
+    
+    def __init__(self):
+        self.metrics = ModuleMetrics()
+        self.scopes: List[object] = []  # open ClassMetrics and FunctionMetrics, innermost last
+        self.function: Optional[FunctionMetrics] = None
+        self.depth = 0
+    
+    def _visit_function(self, node, is_async: bool):
+        owner = self.scopes[-1] if self.scopes and isinstance(self.scopes[-1], ClassMetrics) else None
+        function = FunctionMetrics(node.name, node.lineno, node.end_lineno - node.lineno,
+                                   class_name=owner.name if owner else None, is_async=is_async)
+        self.metrics.functions.append(function)
+        
+        outer = self.function, self.depth
+        self.scopes.append(function)
+        self.function, self.depth = function, 0
+        self.generic_visit(node)
+        self.scopes.pop()
+        self.function, self.depth = outer
+        
+        if owner:
+            owner.methods += 1
+            owner.total_complexity += function.complexity
+            owner.max_complexity = max(owner.max_complexity, function.complexity)
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        self._visit_function(node, is_async=False)
+    
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
+        self._visit_function(node, is_async=True)
+    
+    def visit_ClassDef(self, node: ast.ClassDef):
+        metrics = ClassMetrics(node.name, node.lineno)
+        self.metrics.classes.append(metrics)
+        self.scopes.append(metrics)
+        self.generic_visit(node)
+        self.scopes.pop()
+    
+    def _decision(self, count: int = 1):
+        if self.function is not None:
+            self.function.complexity += count
+    
+    def _visit_block(self, statements: List[ast.stmt]):
+        """Visit the statements of a nested block one level deeper"""
+        if not statements:
+            return
+        self.depth += 1
+        if self.function is not None and self.depth > self.function.nesting_depth:
+            self.function.nesting_depth = self.depth
+        for statement in statements:
+            self.visit(statement)
+        self.depth -= 1
+    
+    def visit_If(self, node: ast.If):
+        self._decision()
+        self.visit(node.test)
+        self._visit_block(node.body)
+        if len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If):
+            self.visit(node.orelse[0])  # elif stays at the same level
+        else:
+            self._visit_block(node.orelse)
+    
+    def visit_For(self, node: ast.For):
+        self._decision()
+        self.visit(node.target)
+        self.visit(node.iter)
+        self._visit_block(node.body)
+        self._visit_block(node.orelse)
+    
+    visit_AsyncFor = visit_For
+    
+    def visit_While(self, node: ast.While):
+        self._decision()
+        self.visit(node.test)
+        self._visit_block(node.body)
+        self._visit_block(node.orelse)
+    
+    def visit_Try(self, node: ast.Try):
+        self._visit_block(node.body)
+        for handler in node.handlers:
+            self._decision()
+            if handler.type is not None:
+                self.visit(handler.type)
+            self._visit_block(handler.body)
+        self._visit_block(node.orelse)
+        self._visit_block(node.finalbody)
+    
+    visit_TryStar = visit_Try
+    
+    def visit_With(self, node: ast.With):
+        for item in node.items:
+            self.visit(item)
+        self._visit_block(node.body)
+    
+    visit_AsyncWith = visit_With
+    
+    def visit_Match(self, node):
+        self.visit(node.subject)
+        for case in node.cases:
+            self._decision()
+            self.visit(case.pattern)
+            if case.guard is not None:
+                self.visit(case.guard)
+            self._visit_block(case.body)
+    
+    def visit_IfExp(self, node: ast.IfExp):
+        self._decision()
+        self.generic_visit(node)
+    
+    def visit_BoolOp(self, node: ast.BoolOp):
+        self._decision(len(node.values) - 1)
+        self.generic_visit(node)
+    
+    def visit_comprehension(self, node: ast.comprehension):
+        self._decision(1 + len(node.ifs))
+        self.generic_visit(node)
+
 class TDDGuardEnforcer:
     """Enforces TDD practices by analyzing file changes and test coverage"""
     
-    def __init__(self, project_root: str = "."):
+    def __init__(self, project_root: str = ".", test_map: Optional[TestFileMap] = None,
+                 test_index: Optional[TestIdentifierIndex] = None):
         self.project_root = Path(project_root)
         self.test_patterns = [
             "**/test_*.py", "**/tests/*.py", "**/*_test.py",
             "**/test*.js", "**/tests/*.js", "**/*.test.js",
             "**/test*.ts", "**/tests/*.ts", "**/*.test.ts"
         ]
-        self.src_patterns = [
-            "src/**/*.py", "lib/**/*.py", "app/**/*.py",
-            "src/**/*.js", "lib/**/*.js", "app/**/*.js",
-            "src/**/*.ts", "lib/**/*.ts", "app/**/*.ts"
-        ]
-        
-    def validate_tdd_compliance(self, file_path: str, content: str) -> List[TDDViolation]:
-        """Validate that file changes follow TDD practices"""
+        # Files the tree walk collects as candidate sources; _is_source_file has the final say
+        self.src_patterns = [f"**/*{suffix}" for suffix in SOURCE_SUFFIXES]
+        
+        # Metrics of the last parsed Python content, shared by all checks of one file
+        self._module_metrics: Optional[Tuple[str, Optional[ModuleMetrics]]] = None
+        
+        # Test files by the source stem they test, and the identifiers each references; both persisted.
+        # Indexes passed in were built by a coordinating process and are used as they are.
+        cache_dir = self.project_root / ".claude" / "cache"
+        self.test_map = test_map or TestFileMap(project_root, self.test_patterns, self.src_patterns, cache_dir)
+        self.test_index = test_index or TestIdentifierIndex(project_root, cache_dir)
+        self._shared_indexes = test_map is not None and test_index is not None
+        self.validated_files = 0
+        
+        # Violations per file, keyed by content, rules and the test files consulted. Enforcers
+        # working on shared indexes leave caching to the process that shared them.
+        self.rule_version = hashlib.sha256(
+            json.dumps([RULES_HASH, self.test_patterns, self.src_patterns]).encode()).hexdigest()
+        self.violation_cache = None if self._shared_indexes else ViolationCache(cache_dir)
+        
+    def validate_tdd_compliance(self, file_path: str, content: str,
+                                changed_lines: Optional[List[Tuple[int, int]]] = None) -> List[TDDViolation]:
+        """Validate that file changes follow TDD practices
+        
+        With ``changed_lines`` (sorted, merged line ranges), function checks
+        only cover functions overlapping a changed line.
+        """
         violations = []
         
         # Check if this is a source file
         if not self._is_source_file(file_path):
             return violations
         
+        # Pick up test files added or removed since the last check
+        if not self._shared_indexes:
+            self.test_map.refresh()
+        
+        # Diff-scoped results depend on the diff, so only whole-file results are cached
+        if self.violation_cache is None or changed_lines is not None:
+            return self._check_source(file_path, content, changed_lines)
+        
+        key = self._violation_key(file_path, content)
+        cached = self.violation_cache.get(key)
+        if cached is not None:
+            return self._expand_violations(file_path, cached)
+        
+        violations = self._check_source(file_path, content)
+        self.violation_cache.put(key, self._compact_violations(violations))
+        return violations
+    
+    def _check_source(self, file_path: str, content: str,
+                      changed_lines: Optional[List[Tuple[int, int]]] = None) -> List[TDDViolation]:
+        """Run the TDD checks on a source file"""
+        violations = []
+        
         # Check for tests before implementation
         if not self._has_corresponding_tests(file_path):
             violations.append(TDDViolation(
@@ -59,15 +319,37 @@ class TDDGuardEnforcer:
             ))
         
         # Check for over-implementation
-        complexity_violations = self._check_complexity(file_path, content)
+        complexity_violations = self._check_complexity(file_path, content, changed_lines)
         violations.extend(complexity_violations)
         
         # Check for untested functions
-        untested_violations = self._check_untested_functions(file_path, content)
+        untested_violations = self._check_untested_functions(file_path, content, changed_lines)
         violations.extend(untested_violations)
         
         return violations
     
+    def _violation_key(self, file_path: str, content: str) -> str:
+        """Cache key of a file's violations: its path and content, the rules, and its test files' state"""
+        digest = hashlib.sha256(f"{self.rule_version}\0{file_path}\0".encode())
+        for test_file in self.test_map.tests_for(file_path):
+            try:
+                stat = os.stat(self.project_root / test_file)
+                digest.update(f"{test_file}\0{stat.st_mtime_ns}\0{stat.st_size}\0".encode())
+            except OSError:
+                digest.update(f"{test_file}\0\0".encode())
+        digest.update(content.encode('utf-8', errors='surrogatepass'))
+        return digest.hexdigest()[:32]
+    
+    @staticmethod
+    def _compact_violations(violations: List[TDDViolation]) -> list:
+        """Violations as path-less lists, for the violation cache"""
+        return [[v.violation_type, v.description, v.severity, v.line_number, v.suggested_fix] for v in violations]
+    
+    @staticmethod
+    def _expand_violations(file_path: str, compact: list) -> List[TDDViolation]:
+        """Violations of a file from their cached form"""
+        return [TDDViolation(file_path, *entry) for entry in compact]
+    
     def _is_source_file(self, file_path: str) -> bool:
         """Check if file is a source file that requires tests"""
         file_path = Path(file_path)
@@ -77,83 +359,75 @@ class TDDGuardEnforcer:
             return False
         
         # Check if it's a source file
-        return file_path.suffix in ['.py', '.js', '.ts', '.jsx', '.tsx']
+        return file_path.suffix in SOURCE_SUFFIXES
+    
+    def _is_test_file(self, file_path: str) -> bool:
+        """Check if a file matches the test file patterns"""
+        if os.path.isabs(file_path):
+            file_path = os.path.relpath(file_path, self.project_root)
+        return matches_patterns(file_path, self.test_patterns)
     
     def _has_corresponding_tests(self, file_path: str) -> bool:
-        """Check if source file has corresponding test file"""
-        file_path = Path(file_path)
-        base_name = file_path.stem
-        
-        # Possible test file patterns
-        test_patterns = [
-            f"test_{base_name}.py",
-            f"{base_name}_test.py",
-            f"test{base_name}.py",
-            f"tests/{base_name}.py",
-            f"test_{base_name}.js",
-            f"{base_name}.test.js",
-            f"tests/{base_name}.js",
-            f"test_{base_name}.ts",
-            f"{base_name}.test.ts",
-            f"tests/{base_name}.ts"
-        ]
-        
-        # Check in same directory and tests directory
-        search_dirs = [file_path.parent, file_path.parent / "tests", self.project_root / "tests"]
-        
-        for search_dir in search_dirs:
-            if search_dir.exists():
-                for pattern in test_patterns:
-                    if (search_dir / pattern).exists():
-                        return True
-        
-        return False
+        """Check if source file has corresponding test file (a lookup in the test-file map)"""
+        return bool(self.test_map.tests_for(file_path))
     
-    def _check_complexity(self, file_path: str, content: str) -> List[TDDViolation]:
+    def _check_complexity(self, file_path: str, content: str,
+                          changed_lines: Optional[List[Tuple[int, int]]] = None) -> List[TDDViolation]:
         """Check for over-implementation (too complex for TDD cycle)"""
         violations = []
         
         if file_path.endswith('.py'):
-            violations.extend(self._check_python_complexity(file_path, content))
+            violations.extend(self._check_python_complexity(file_path, content, changed_lines))
         elif file_path.endswith(('.js', '.ts')):
-            violations.extend(self._check_javascript_complexity(file_path, content))
+            violations.extend(self._check_javascript_complexity(file_path, content, changed_lines))
         
         return violations
     
-    def _check_python_complexity(self, file_path: str, content: str) -> List[TDDViolation]:
+    def _check_python_complexity(self, file_path: str, content: str,
+                                 changed_lines: Optional[List[Tuple[int, int]]] = None) -> List[TDDViolation]:
         """Check Python code complexity"""
         violations = []
         
-        try:
-            tree = ast.parse(content)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    # Check function length (should be small in TDD)
-                    func_lines = node.end_lineno - node.lineno
-                    if func_lines > 20:
-                        violations.append(TDDViolation(
-                            file_path=file_path,
-                            violation_type="over_implementation",
-                            description=f"Function '{node.name}' is too long ({func_lines} lines)",
-                            severity="medium",
-                            line_number=node.lineno,
-                            suggested_fix="Break function into smaller, testable units"
-                        ))
-                    
-                    # Check cyclomatic complexity
-                    complexity = self._calculate_cyclomatic_complexity(node)
-                    if complexity > 5:
-                        violations.append(TDDViolation(
-                            file_path=file_path,
-                            violation_type="high_complexity",
-                            description=f"Function '{node.name}' has high complexity ({complexity})",
-                            severity="medium",
-                            line_number=node.lineno,
-                            suggested_fix="Simplify function logic and add more unit tests"
-                        ))
+        metrics = self._python_metrics(content)
+        if metrics is not None:
+            for function in metrics.functions:
+                if not lines_overlap(changed_lines, function.line_number, function.line_number + function.length):
+                    continue
+                
+                # Check function length (should be small in TDD)
+                if function.length > 20:
+                    violations.append(TDDViolation(
+                        file_path=file_path,
+                        violation_type="over_implementation",
+                        description=f"Function '{function.qualified_name}' is too long ({function.length} lines)",
+                        severity="medium",
+                        line_number=function.line_number,
+                        suggested_fix="Break function into smaller, testable units"
+                    ))
+                
+                # Check cyclomatic complexity
+                if function.complexity > 5:
+                    violations.append(TDDViolation(
+                        file_path=file_path,
+                        violation_type="high_complexity",
+                        description=f"Function '{function.qualified_name}' has high complexity ({function.complexity})",
+                        severity="medium",
+                        line_number=function.line_number,
+                        suggested_fix="Simplify function logic and add more unit tests"
+                    ))
+                
+                # Check nesting depth
+                if function.nesting_depth > 4:
+                    violations.append(TDDViolation(
+                        file_path=file_path,
+                        violation_type="deep_nesting",
+                        description=f"Function '{function.qualified_name}' nests {function.nesting_depth} blocks deep",
+                        severity="medium",
+                        line_number=function.line_number,
+                        suggested_fix="Return early or extract nested blocks into helper functions"
+                    ))
         
-        except SyntaxError:
+        else:
             violations.append(TDDViolation(
                 file_path=file_path,
                 violation_type="syntax_error",
@@ -164,7 +438,8 @@ class TDDGuardEnforcer:
         
         return violations
     
-    def _check_javascript_complexity(self, file_path: str, content: str) -> List[TDDViolation]:
+    def _check_javascript_complexity(self, file_path: str, content: str,
+                                     changed_lines: Optional[List[Tuple[int, int]]] = None) -> List[TDDViolation]:
         """Check JavaScript/TypeScript code complexity"""
         violations = []
         
@@ -193,7 +468,7 @@ class TDDGuardEnforcer:
                 # Function ended
                 if brace_count <= 0 and i > function_start:
                     func_length = i - function_start
-                    if func_length > 20:
+                    if func_length > 20 and lines_overlap(changed_lines, function_start, i):
                         violations.append(TDDViolation(
                             file_path=file_path,
                             violation_type="over_implementation",
@@ -206,75 +481,172 @@ class TDDGuardEnforcer:
         
         return violations
     
-    def _calculate_cyclomatic_complexity(self, node: ast.FunctionDef) -> int:
-        """Calculate cyclomatic complexity of a Python function"""
-        complexity = 1  # Base complexity
+    def _python_metrics(self, content: str) -> Optional[ModuleMetrics]:
+        """Parse Python content once and collect its function metrics (None on syntax errors)"""
+        if self._module_metrics is not None and self._module_metrics[0] == content:
+            return self._module_metrics[1]
         
-        for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.AsyncFor)):
-                complexity += 1
-            elif isinstance(child, ast.ExceptHandler):
-                complexity += 1
-            elif isinstance(child, ast.BoolOp):
-                complexity += len(child.values) - 1
+        try:
+            visitor = FunctionMetricsVisitor()
+            visitor.visit(ast.parse(content))
+            metrics = visitor.metrics
+        except SyntaxError:
+            metrics = None
         
-        return complexity
+        self._module_metrics = (content, metrics)
+        return metrics
     
-    def _check_untested_functions(self, file_path: str, content: str) -> List[TDDViolation]:
+    def _check_untested_functions(self, file_path: str, content: str,
+                                  changed_lines: Optional[List[Tuple[int, int]]] = None) -> List[TDDViolation]:
         """Check for functions that appear to be untested"""
         violations = []
         
         if not file_path.endswith('.py'):
             return violations
         
-        try:
-            tree = ast.parse(content)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef) and not node.name.startswith('_'):
-                    # This is a simplified check - in reality, we'd cross-reference with test files
-                    # For now, we'll just check if there are obvious test indicators
-                    if not self._function_appears_tested(node.name, file_path):
-                        violations.append(TDDViolation(
-                            file_path=file_path,
-                            violation_type="untested_function",
-                            description=f"Function '{node.name}' appears to have no tests",
-                            severity="high",
-                            line_number=node.lineno,
-                            suggested_fix=f"Write tests for function '{node.name}' before implementation"
-                        ))
-        
-        except SyntaxError:
-            pass  # Already caught in complexity check
+        metrics = self._python_metrics(content)
+        if metrics is None:
+            return violations  # Already caught in complexity check
+        
+        public_functions = [f for f in metrics.public_functions
+                            if lines_overlap(changed_lines, f.line_number, f.line_number + f.length)]
+        if public_functions:
+            self._refresh_test_index()
+            test_files = self._corresponding_test_files(file_path)
+        
+        for function in public_functions:
+            # A function counts as tested when a corresponding test file references it
+            if not self._function_appears_tested(function.name, file_path, test_files):
+                violations.append(TDDViolation(
+                    file_path=file_path,
+                    violation_type="untested_function",
+                    description=f"Function '{function.name}' appears to have no tests",
+                    severity="high",
+                    line_number=function.line_number,
+                    suggested_fix=f"Write tests for function '{function.name}' before implementation"
+                ))
         
         return violations
     
-    def _function_appears_tested(self, function_name: str, file_path: str) -> bool:
-        """Check if function appears to be tested (simplified heuristic)"""
-        # Find corresponding test files
-        file_path = Path(file_path)
-        base_name = file_path.stem
-        
-        test_files = []
-        search_dirs = [file_path.parent, file_path.parent / "tests", self.project_root / "tests"]
+    def _refresh_test_index(self):
+        """Re-tokenize the test files that changed since the index was last saved"""
+        if self._shared_indexes:
+            return
+        if self.test_map.test_files is None:
+            self.test_map.refresh()
+        self.test_index.refresh(self.test_map.test_files)
+    
+    def _corresponding_test_files(self, file_path: str) -> set:
+        """Project-relative test files named after a source file"""
+        return set(self.test_map.tests_for(file_path))
+    
+    def _function_appears_tested(self, function_name: str, file_path: str, test_files: Optional[set] = None) -> bool:
+        """Check if a corresponding test file references the function (an index lookup)"""
+        if test_files is None:
+            self._refresh_test_index()
+            test_files = self._corresponding_test_files(file_path)
         
-        for search_dir in search_dirs:
-            if search_dir.exists():
-                test_files.extend(search_dir.glob(f"test_{base_name}.*"))
-                test_files.extend(search_dir.glob(f"{base_name}_test.*"))
-                test_files.extend(search_dir.glob(f"test{base_name}.*"))
+        return not self.test_index.references(function_name).isdisjoint(test_files)
+    
+    def _read_source(self, file_path: str) -> Optional[str]:
+        """Content of a project-relative source file, or None if it cannot be read"""
+        try:
+            with open(self.project_root / file_path, 'r', encoding='utf-8', errors='replace') as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def validate_files(self, file_paths: List[str]) -> List[Tuple[Optional[str], List[TDDViolation]]]:
+        """Validate project-relative source files, giving each one's cache key (None if unreadable) and violations"""
+        results = []
+        for file_path in file_paths:
+            content = self._read_source(file_path)
+            if content is None:
+                results.append((None, []))
+            else:
+                results.append((self._violation_key(file_path, content), self.validate_tdd_compliance(file_path, content)))
+        return results
+    
+    def validate_tree(self, max_workers: Optional[int] = None, chunk_size: Optional[int] = None) -> Iterator[TDDViolation]:
+        """Validate every source file in the project, yielding violations in file order
+        
+        The test-file map and identifier index are refreshed once here and
+        handed to each worker process when it starts; workers then validate
+        chunks of files without touching the indexes again. Files whose
+        violations are cached are answered here and never reach a worker.
+        Results are collected in submission order, so output is deterministic.
+        """
+        self.test_map.refresh()
+        self._refresh_test_index()
+        file_paths = [path for path in self.test_map.source_files if self._is_source_file(path)]
+        self.validated_files = len(file_paths)
+        
+        lookups = []
+        for file_path in file_paths:
+            content = self._read_source(file_path)
+            key = None if content is None else self._violation_key(file_path, content)
+            lookups.append((key, None if key is None else self.violation_cache.get(key)))
+        misses = [path for path, (key, cached) in zip(file_paths, lookups) if key is not None and cached is None]
+        
+        results = self._validate_uncached(misses, max_workers, chunk_size)
+        try:
+            for file_path, (key, cached) in zip(file_paths, lookups):
+                if key is None:
+                    continue
+                if cached is not None:
+                    yield from self._expand_violations(file_path, cached)
+                    continue
+                key, violations = next(results)
+                if key is not None:
+                    self.violation_cache.put(key, self._compact_violations(violations))
+                yield from violations
+        finally:
+            results.close()
+            self.violation_cache.save()
+    
+    def _validate_uncached(self, file_paths: List[str], max_workers: Optional[int],
+                           chunk_size: Optional[int]) -> Iterator[Tuple[Optional[str], List[TDDViolation]]]:
+        """Per-file results for files missing from the violation cache, in order, from a process pool"""
+        max_workers = max_workers or os.cpu_count() or 1
+        chunk_size = chunk_size or max(1, min(256, len(file_paths) // (max_workers * 8)))
+        chunks = [file_paths[i:i + chunk_size] for i in range(0, len(file_paths), chunk_size)]
+        
+        if max_workers == 1 or len(chunks) < 2:
+            worker = TDDGuardEnforcer(str(self.project_root), self.test_map, self.test_index)
+            for chunk in chunks:
+                yield from worker.validate_files(chunk)
+            return
+        
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_tree_worker,
+                                 initargs=(str(self.project_root), self.test_map, self.test_index)) as executor:
+            for results in executor.map(_validate_chunk, chunks):
+                yield from results
+    
+    def validate_diff(self, base_ref: Optional[str] = None, staged: bool = False) -> List[TDDViolation]:
+        """Validate the source files changed against a base ref (default HEAD), or in the staged index
+        
+        Function checks only cover functions overlapping a changed hunk, so
+        untouched code in an edited file is neither analysed nor reported.
+        """
+        cmd = ["git", "-c", "core.quotepath=off", "diff", "--unified=0", "--no-color", "--no-ext-diff",
+               "--relative", "--diff-filter=AMR", "--cached" if staged else (base_ref or "HEAD"), "--"]
+        result = subprocess.run(cmd, capture_output=True, text=True, cwd=self.project_root)
+        if result.returncode != 0:
+            raise ValueError(f"git diff failed: {result.stderr.strip()}")
         
-        # Check if function name appears in test files
-        for test_file in test_files:
-            try:
-                with open(test_file, 'r') as f:
-                    test_content = f.read()
-                    if function_name in test_content:
-                        return True
-            except Exception:
+        violations = []
+        for file_path, changed_lines in sorted(parse_diff_hunks(result.stdout).items()):
+            if not self._is_source_file(file_path):
                 continue
-        
-        return False
+            content = self._staged_source(file_path) if staged else self._read_source(file_path)
+            if content is not None:
+                violations.extend(self.validate_tdd_compliance(file_path, content, changed_lines))
+        return violations
+    
+    def _staged_source(self, file_path: str) -> Optional[str]:
+        """Content of a source file as staged in the git index, or None if it is not there"""
+        result = subprocess.run(["git", "show", f":./{file_path}"], capture_output=True, cwd=self.project_root)
+        return result.stdout.decode('utf-8', errors='replace') if result.returncode == 0 else None
     
     def run_tests_and_check_coverage(self) -> Tuple[bool, Dict]:
         """Run tests and check coverage"""
@@ -352,7 +724,12 @@ class TDDGuardEnforcer:
     
     def enforce_tdd_on_file_change(self, file_path: str, content: str) -> Tuple[bool, List[TDDViolation]]:
         """Main enforcement function called when files are modified"""
+        if self._is_test_file(file_path):
+            # Only the edited test file is re-tokenized; the rest of the index stays as saved
+            self.test_index.update_file(file_path)
         violations = self.validate_tdd_compliance(file_path, content)
+        if self.violation_cache is not None:
+            self.violation_cache.save()
         
         # Critical violations block the operation
         critical_violations = [v for v in violations if v.severity == "critical"]
@@ -395,12 +772,36 @@ class TDDGuardEnforcer:
         
         return "\n".join(guidance)
 
+# Per-process enforcer for validate_tree workers, built from the coordinator's indexes
+_tree_worker: Optional[TDDGuardEnforcer] = None
+
+def _init_tree_worker(project_root: str, test_map: TestFileMap, test_index: TestIdentifierIndex):
+    """Process pool initializer: receive the shared indexes once per worker"""
+    global _tree_worker
+    _tree_worker = TDDGuardEnforcer(project_root, test_map, test_index)
+
+def _validate_chunk(file_paths: List[str]) -> List[Tuple[Optional[str], List[TDDViolation]]]:
+    """Validate a chunk of source files (process pool worker)"""
+    return _tree_worker.validate_files(file_paths)
+
+def _positive_int_option(args: List[str], name: str) -> Optional[int]:
+    """Value of a ``--name N`` option, None when absent; exits with usage when N is missing or not positive"""
+    if name not in args:
+        return None
+    index = args.index(name) + 1
+    if index >= len(args) or not args[index].isdigit() or int(args[index]) < 1:
+        print(f"Usage: validate-tree [--workers N] [--chunk-size N] ({name} takes a positive integer)")
+        sys.exit(1)
+    return int(args[index])
+
 def main():
     """CLI interface for TDD-Guard enforcement"""
     if len(sys.argv) < 2:
         print("Usage: python tdd-guard-enforcer.py <command> [args...]")
         print("Commands:")
         print("  validate-file <file_path>")
+        print("  validate-tree [--workers N] [--chunk-size N]")
+        print("  validate-diff [<base_ref> | --staged]")
         print("  validate-commit")
         print("  check-coverage")
         print("  run-tests")
@@ -430,6 +831,42 @@ def main():
             print(enforcer.generate_tdd_guidance(violations))
             sys.exit(1)
     
+    elif command == "validate-tree":
+        args = sys.argv[2:]
+        workers = _positive_int_option(args, "--workers")
+        chunk_size = _positive_int_option(args, "--chunk-size")
+        
+        # One NDJSON violation per line, in file order
+        violations = 0
+        critical = 0
+        for violation in enforcer.validate_tree(workers, chunk_size):
+            print(json.dumps(asdict(violation)))
+            violations += 1
+            critical += violation.severity == "critical"
+        
+        print(f"{'❌' if critical else '✅'} {enforcer.validated_files} source files validated "
+              f"({enforcer.violation_cache.hits} from cache): {violations} violations, {critical} critical",
+              file=sys.stderr)
+        if critical:
+            sys.exit(1)
+    
+    elif command == "validate-diff":
+        staged = "--staged" in sys.argv[2:]
+        base_ref = next((arg for arg in sys.argv[2:] if arg != "--staged"), None)
+        
+        try:
+            violations = enforcer.validate_diff(base_ref, staged)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        
+        if not violations:
+            print("✅ Changed functions pass TDD validation")
+        else:
+            print(enforcer.generate_tdd_guidance(violations))
+            if any(v.severity == "critical" for v in violations):
+                sys.exit(1)
+    
     elif command == "validate-commit":
         ready, violations = enforcer.validate_commit_readiness()
         
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+TDD-Guard Test Indexes
+Persistent indexes over a project's test files, so TDD checks become hash lookups,
+and a content-addressed cache of the violations found per source file
+"""
+
+import json
+import os
+import re
+import sqlite3
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_CACHE_DIR = Path(".claude") / "cache"
+SKIP_DIRS = {".git", ".hg", ".svn", ".claude", "node_modules", "__pycache__", ".venv", "venv",
+             ".tox", ".nox", ".mypy_cache", ".pytest_cache", "dist", "build", "site-packages"}
+
+IDENTIFIER_RE = re.compile(rb"[A-Za-z_][A-Za-z0-9_]*")
+TEST_NAME_PREFIXES = ("test_", "test")
+TEST_NAME_SUFFIXES = ("_test", "_spec")
+# Suffixes whose tests may cover each other: a .ts test can exercise a .js module, never a .py one
+LANGUAGE_FAMILIES = {".py": "python", ".js": "javascript", ".jsx": "javascript",
+                     ".ts": "javascript", ".tsx": "javascript"}
+# Package markers and fixture modules, never the subject of a test named after them
+UNMATCHED_STEMS = {"__init__", "conftest"}
+SOURCE_ROOTS = ("src", "lib", "app")
+TEST_ROOTS = ("tests", "test", "__tests__", "spec")
+
+@lru_cache(maxsize=None)
+def _compile_patterns(patterns: Tuple[str, ...]) -> "re.Pattern":
+    """One regex for a set of path globs; ``**/`` matches zero or more directories, ``*`` stays within one"""
+    alternatives = []
+    for pattern in patterns:
+        regex, i = "", 0
+        while i < len(pattern):
+            if pattern.startswith("**/", i):
+                regex, i = regex + "(?:.*/)?", i + 3
+            elif pattern.startswith("**", i):
+                regex, i = regex + ".*", i + 2
+            elif pattern[i] == "*":
+                regex, i = regex + "[^/]*", i + 1
+            elif pattern[i] == "?":
+                regex, i = regex + "[^/]", i + 1
+            else:
+                regex, i = regex + re.escape(pattern[i]), i + 1
+        alternatives.append(regex)
+    return re.compile("(?:" + "|".join(alternatives) + r")\Z")
+
+def matches_patterns(rel_path: str, patterns: Iterable[str]) -> bool:
+    """Check a project-relative path against glob patterns such as ``**/test_*.py``"""
+    return bool(_compile_patterns(tuple(patterns)).match(rel_path.replace(os.sep, "/")))
+
+def normalize_stem(file_name: str) -> str:
+    """Source stem a file name refers to: ``test_user_service.py``, ``userService.test.ts``
+    and ``user_service.py`` all give ``userservice``
+    """
+    stem = file_name.split(".", 1)[0]
+    lowered = stem.lower()
+    for prefix in TEST_NAME_PREFIXES:
+        if lowered.startswith(prefix) and len(stem) > len(prefix):
+            stem = stem[len(prefix):]
+            break
+    for suffix in TEST_NAME_SUFFIXES:
+        if stem.lower().endswith(suffix) and len(stem) > len(suffix):
+            stem = stem[:-len(suffix)]
+            break
+    return re.sub(r"[^a-z0-9]", "", stem.lower())
+
+def tokenize_test_file(content: bytes) -> Set[str]:
+    """Identifiers a test file references
+
+    Test function names also contribute the function names they are named
+    after: ``test_parse_empty_input`` indexes ``parse``, ``parse_empty`` and
+    ``parse_empty_input``.
+    """
+    identifiers = {token.decode("ascii") for token in IDENTIFIER_RE.findall(content)}
+    for identifier in list(identifiers):
+        for prefix in TEST_NAME_PREFIXES:
+            if identifier.startswith(prefix) and len(identifier) > len(prefix):
+                parts = identifier[len(prefix):].split("_")
+                identifiers.update("_".join(parts[:i]) for i in range(1, len(parts) + 1))
+                break
+    identifiers.discard("")
+    return identifiers
+
+def _is_nearby(source_dir: Tuple[str, ...], test_dir: Tuple[str, ...]) -> bool:
+    """Whether a test directory sits beside a source directory or mirrors it under a test root"""
+    if test_dir[:len(source_dir)] == source_dir and len(test_dir) - len(source_dir) <= 1:
+        return len(test_dir) == len(source_dir) or test_dir[-1] in TEST_ROOTS
+    source_rest = source_dir[1:] if source_dir[:1] and source_dir[0] in SOURCE_ROOTS else source_dir
+    return bool(test_dir) and test_dir[0] in TEST_ROOTS and test_dir[1:] == source_rest
+
+class TestFileMap:
+    """Test and source files of a project, found in one directory walk
+
+    Each directory's relevant entries are cached with its mtime. A directory
+    whose mtime is unchanged is not listed again, so a warm refresh costs one
+    stat per directory. Test files are keyed by the normalized source stem
+    they are named after.
+    """
+
+    __test__ = False  # Not a pytest test class despite the name
+    CACHE_VERSION = 1
+
+    def __init__(self, root: str, test_patterns: List[str], src_patterns: List[str],
+                 cache_dir: Optional[Path] = None):
+        self.root = Path(root)
+        self.test_patterns = list(test_patterns)
+        self.src_patterns = list(src_patterns)
+        self.cache_file = Path(cache_dir or DEFAULT_CACHE_DIR) / "test-file-map.json"
+        self._dirs: Optional[Dict[str, list]] = None  # dir -> [mtime_ns, [subdir, ...], [test, ...], [source, ...]]
+        self.test_files: Optional[List[str]] = None
+        self.source_files: List[str] = []
+        self.by_stem: Dict[str, List[str]] = {}
+        self.listed: List[str] = []
+
+    def _load(self):
+        """Read the cached directory listings once, if they were made with the same patterns"""
+        self._dirs = {}
+        try:
+            with open(self.cache_file) as f:
+                cached = json.load(f)
+            if (cached.get("version") == self.CACHE_VERSION
+                    and cached["patterns"] == [self.test_patterns, self.src_patterns]):
+                self._dirs = cached["dirs"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _classify(self, rel_path: str) -> Tuple[bool, bool]:
+        """Whether a project-relative file is a test file and whether it is a source file"""
+        is_test = matches_patterns(rel_path, self.test_patterns)
+        return is_test, not is_test and matches_patterns(rel_path, self.src_patterns)
+
+    def refresh(self) -> "TestFileMap":
+        """Walk the project, re-listing only directories whose mtime changed"""
+        if self._dirs is None:
+            self._load()
+        self.listed = []
+        try:
+            # Created up front: creating it after the walk would change the mtime of the directory holding it
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            pass
+
+        dirs: Dict[str, list] = {}
+        pending = ["."]
+        while pending:
+            rel_dir = pending.pop()
+            full_dir = self.root / rel_dir
+            try:
+                mtime = os.stat(full_dir).st_mtime_ns
+            except OSError:
+                continue
+
+            cached = self._dirs.get(rel_dir)
+            if cached and cached[0] == mtime:
+                dirs[rel_dir] = cached
+            else:
+                subdirs, tests, sources = [], [], []
+                try:
+                    with os.scandir(full_dir) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in SKIP_DIRS:
+                                    subdirs.append(entry.name)
+                            elif entry.is_file():
+                                is_test, is_source = self._classify(os.path.normpath(os.path.join(rel_dir, entry.name)))
+                                if is_test:
+                                    tests.append(entry.name)
+                                elif is_source:
+                                    sources.append(entry.name)
+                except OSError:
+                    continue
+                dirs[rel_dir] = [mtime, sorted(subdirs), sorted(tests), sorted(sources)]
+                self.listed.append(rel_dir)
+
+            pending.extend(os.path.normpath(os.path.join(rel_dir, d)) for d in dirs[rel_dir][1])
+
+        modified = bool(self.listed) or dirs.keys() != self._dirs.keys()
+        self._dirs = dirs
+        if modified:
+            try:
+                tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+                with open(tmp_file, 'w') as f:
+                    json.dump({"version": self.CACHE_VERSION, "patterns": [self.test_patterns, self.src_patterns],
+                               "dirs": dirs}, f)
+                os.replace(tmp_file, self.cache_file)
+            except OSError:
+                pass  # Caching is an optimization only
+
+        self.test_files, self.source_files, self.by_stem = [], [], {}
+        for rel_dir in sorted(dirs):
+            prefix = "" if rel_dir == "." else rel_dir + os.sep
+            _, _, tests, sources = dirs[rel_dir]
+            for name in tests:
+                self.test_files.append(prefix + name)
+                if name.split(".", 1)[0] not in UNMATCHED_STEMS:
+                    self.by_stem.setdefault(normalize_stem(name), []).append(prefix + name)
+            self.source_files.extend(prefix + name for name in sources)
+        return self
+
+    def tests_for(self, source_path: str) -> List[str]:
+        """Test files named after a source file, in the same language
+
+        Tests next to the source (or in its ``__tests__``/``tests`` directory)
+        and tests at the mirrored path under a test root are preferred; only
+        when there are none do same-named tests elsewhere in the project count.
+        """
+        if self.test_files is None:
+            self.refresh()
+        source = Path(source_path)
+        if source.stem in UNMATCHED_STEMS:
+            return []
+        language = LANGUAGE_FAMILIES.get(source.suffix)
+        candidates = [test_file for test_file in self.by_stem.get(normalize_stem(source.name), [])
+                      if LANGUAGE_FAMILIES.get(Path(test_file).suffix) == language]
+        nearby = [test_file for test_file in candidates if _is_nearby(source.parent.parts, Path(test_file).parent.parts)]
+        return nearby or candidates
+
+class TestIdentifierIndex:
+    """Inverted index from identifiers to the test files that reference them
+
+    Each test file is tokenized once; its identifiers are cached on disk by
+    mtime and size, so later runs only re-read test files that changed, and
+    the postings are patched per changed file rather than rebuilt.
+    """
+
+    __test__ = False  # Not a pytest test class despite the name
+    CACHE_VERSION = 1
+
+    def __init__(self, root: str = ".", cache_dir: Optional[Path] = None):
+        self.root = Path(root)
+        self.cache_file = Path(cache_dir or DEFAULT_CACHE_DIR) / "test-identifiers.json"
+        self._files: Optional[Dict[str, list]] = None  # path -> [mtime_ns, size, [identifier, ...]]
+        self.postings: Dict[str, Set[str]] = {}
+        self.retokenized: List[str] = []
+
+    def _load(self):
+        """Read the on-disk index once and build its postings"""
+        self._files = {}
+        try:
+            with open(self.cache_file) as f:
+                cached = json.load(f)
+            if cached.get("version") == self.CACHE_VERSION:
+                self._files = cached["files"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        for path, (_, _, identifiers) in self._files.items():
+            for identifier in identifiers:
+                self.postings.setdefault(identifier, set()).add(path)
+
+    def _remove(self, path: str):
+        """Drop a test file and its postings"""
+        for identifier in self._files.pop(path, [0, 0, []])[2]:
+            files = self.postings.get(identifier)
+            if files is not None:
+                files.discard(path)
+                if not files:
+                    del self.postings[identifier]
+
+    def _refresh_file(self, path: str) -> bool:
+        """Re-tokenize one test file (project-relative) if its mtime or size changed"""
+        try:
+            stat = os.stat(self.root / path)
+        except OSError:
+            if path not in self._files:
+                return False
+            self._remove(path)
+            return True
+
+        cached = self._files.get(path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return False
+
+        try:
+            with open(self.root / path, 'rb') as f:
+                identifiers = tokenize_test_file(f.read())
+        except OSError:
+            identifiers = set()
+
+        self._remove(path)
+        self._files[path] = [stat.st_mtime_ns, stat.st_size, sorted(identifiers)]
+        for identifier in identifiers:
+            self.postings.setdefault(identifier, set()).add(path)
+        self.retokenized.append(path)
+        return True
+
+    def refresh(self, test_files: Iterable[str]) -> "TestIdentifierIndex":
+        """Bring the index in line with the given project-relative test files"""
+        if self._files is None:
+            self._load()
+        self.retokenized = []
+
+        current = set(test_files)
+        modified = False
+        for path in [p for p in self._files if p not in current]:
+            self._remove(path)
+            modified = True
+        for path in sorted(current):
+            modified |= self._refresh_file(path)
+
+        if modified:
+            self.save()
+        return self
+
+    def update_file(self, path: str) -> bool:
+        """Re-index a single test file after it was edited, created or deleted"""
+        if self._files is None:
+            self._load()
+        self.retokenized = []
+        path = os.path.relpath(path, self.root) if os.path.isabs(path) else str(Path(path))
+        if self._refresh_file(path):
+            self.save()
+            return True
+        return False
+
+    def save(self):
+        """Persist the per-file identifiers"""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, 'w') as f:
+                json.dump({"version": self.CACHE_VERSION, "files": self._files}, f)
+            os.replace(tmp_file, self.cache_file)
+        except OSError:
+            pass  # Caching is an optimization only
+
+    def references(self, identifier: str) -> Set[str]:
+        """Test files that reference an identifier"""
+        return self.postings.get(identifier, set())
+
+class ViolationCache:
+    """Violations of a source file, keyed by a hash of everything they depend on
+
+    The key covers the file's path and content, the enforcer's rule version
+    and the test files the checks consult, so a hit is valid by construction
+    and no entry ever needs invalidating. Entries live in SQLite, one row per
+    key, so a lookup or an insert touches only its own row. New rows are held
+    in memory and written in one short transaction by ``save``, so no write
+    lock is held between checks. Each row carries a last-use time, refreshed
+    at most once a day, and the least recently used rows beyond
+    ``max_entries`` are evicted whenever new rows are written.
+    """
+
+    SCHEMA_VERSION = 1
+    MAX_ENTRIES = 20000
+    RESTAMP_AFTER = 24 * 3600
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = MAX_ENTRIES):
+        self.db_path = Path(cache_dir or DEFAULT_CACHE_DIR) / "violations.db"
+        self.max_entries = max_entries
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pending: Dict[str, str] = {}  # key -> violations JSON, not yet written
+        self._restamped: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def modified(self) -> bool:
+        """Whether save() has anything to write"""
+        return bool(self._pending or self._restamped)
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the store on first use; None if it cannot be opened"""
+        if self._connection is None:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                self._connection = sqlite3.connect(str(self.db_path), timeout=30)
+                if self._connection.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+                    self._connection.executescript(f"""
+                        DROP TABLE IF EXISTS violations;
+                        CREATE TABLE violations (key TEXT PRIMARY KEY, used INTEGER NOT NULL, violations TEXT NOT NULL);
+                        CREATE INDEX violations_used ON violations (used);
+                        PRAGMA user_version = {self.SCHEMA_VERSION};
+                    """)
+            except (OSError, sqlite3.Error):
+                self._connection = None  # Caching is an optimization only
+        return self._connection
+
+    def get(self, key: str) -> Optional[list]:
+        """Cached violations for a key, or None on a miss"""
+        if key in self._pending:
+            self.hits += 1
+            return json.loads(self._pending[key])
+
+        connection = self._connect()
+        try:
+            row = connection.execute("SELECT used, violations FROM violations WHERE key = ?", (key,)).fetchone() \
+                if connection else None
+        except sqlite3.Error:
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if int(time.time()) - row[0] > self.RESTAMP_AFTER:
+            self._restamped.add(key)
+        return json.loads(row[1])
+
+    def put(self, key: str, violations: list):
+        """Store the violations found for a key (written by the next save)"""
+        self._pending[key] = json.dumps(violations, separators=(",", ":"))
+
+    def save(self):
+        """Write pending rows and use times in one transaction, evicting beyond the bound after inserts"""
+        if not self.modified:
+            return
+        connection = self._connect()
+        now = int(time.time())
+        try:
+            if connection is not None:
+                with connection:
+                    connection.executemany("INSERT OR REPLACE INTO violations VALUES (?, ?, ?)",
+                                           [(key, now, value) for key, value in self._pending.items()])
+                    connection.executemany("UPDATE violations SET used = ? WHERE key = ?",
+                                           [(now, key) for key in self._restamped])
+                    if self._pending:
+                        connection.execute(
+                            "DELETE FROM violations WHERE key IN "
+                            "(SELECT key FROM violations ORDER BY used DESC, rowid DESC LIMIT -1 OFFSET ?)",
+                            (self.max_entries,))
+        except sqlite3.Error:
+            pass  # Caching is an optimization only
+        self._pending, self._restamped = {}, set()
@@ -6,10 +6,13 @@ Tests end-to-end functionality of all framework components
 
 import os
 import sys
+import ast
 import json
 import tempfile
+import io
 import shutil
 import subprocess
+import sqlite3
 from pathlib import Path
 import pytest
 from typing import Dict, List
@@ -18,8 +21,16 @@ from typing import Dict, List
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
 from git_issue_automation import SPARCGitIssueManager, FrameworkViolation
-from tdd_guard_enforcer import TDDGuardEnforcer, TDDViolation
-from sparc_workflow_enforcer import SPARCWorkflowEnforcer, WorkflowViolation
+from framework_integration_hooks import FrameworkIntegrationHooks
+from tdd_guard_enforcer import TDDGuardEnforcer, TDDViolation, parse_diff_hunks
+from tdd_guard_index import TestFileMap, ViolationCache
+from sparc_agent_graph import AgentGraph
+from sparc_design_index import DesignIndexCache, extract_design_index
+from sparc_tech_lock import ImportScanner, ManifestScanner, PackagePolicy, PackageRuleTrie, extract_js_imports
+import sparc_workflow_enforcer
+from sparc_workflow_enforcer import (SPARCWorkflowEnforcer, WorkflowViolation, SectionMatcher, MarkdownOutline,
+                                     DesignDocumentWatcher, StatusSnapshotStore, ComplianceReportRenderer,
+                                     iter_project_statuses, replay_history)
 
 class TestFrameworkIntegration:
     """Integration tests for SPARC Framework"""
@@ -230,6 +241,573 @@ Modern, responsive web interface with clean design.
         ready, violations = enforcer.validate_agent_execution_readiness("solution-architect")
         assert ready or len([v for v in violations if v.severity == "critical"]) == 0
     
+    def test_workflow_status_scores_each_document_once(self, temp_project):
+        """Test that one status evaluation scores each design document once"""
+        enforcer = SPARCWorkflowEnforcer("test-project", "docs/design")
+        design_dir = Path("docs/design/test-project")
+        (design_dir / "product_requirements.md").write_text("## Elevator Pitch\nPitch.\n")
+        (design_dir / "architecture_guide.md").write_text("## Architecture Overview\nOverview.\n")
+
+        scored = []
+        original = enforcer._validate_document_completeness
+        enforcer._validate_document_completeness = lambda path, sections: scored.append(path.name) or original(path, sections)
+
+        enforcer.get_workflow_status()
+        assert sorted(scored) == ["architecture_guide.md", "product_requirements.md"]
+
+        # Unchanged documents are not re-scored on later calls
+        enforcer.get_workflow_status()
+        enforcer.get_agent_status("ux-designer")
+        assert len(scored) == 2
+
+    def test_section_matcher_reports_offsets(self, temp_project):
+        """Test single-scan section matching and hit offsets"""
+        enforcer = SPARCWorkflowEnforcer("test-project", "docs/design")
+        content = "# Guide\n\n## Architecture Overview\nÜber fast.\n\n## 2. **Technology Stack**\n\nsystemdesign notes\n"
+        Path("docs/design/test-project/architecture_guide.md").write_text(content, encoding="utf-8")
+
+        offsets = enforcer.locate_document_sections("solution-architect")
+        encoded = content.encode("utf-8")
+        assert set(offsets) == {"Architecture Overview", "Technology Stack"}
+        assert encoded[offsets["Technology Stack"]:].startswith(b"## 2. **Technology Stack**")
+        assert enforcer.get_agent_status("solution-architect").validation_score == 2 / 6
+
+        # Only headings count: bold labels and "Section:" lines in body text no longer do
+        Path("docs/design/test-project/architecture_guide.md").write_text(content + "**System Design**\nSecurity: TLS\n")
+        assert set(enforcer.locate_document_sections("solution-architect")) == {"Architecture Overview", "Technology Stack"}
+        matcher = SectionMatcher(["System Design", "Security"])
+        assert matcher.scan("Security Model\nSystem Design Notes") == {"Security": 0, "System Design": 15}
+
+    def test_markdown_outline_index(self, temp_project):
+        """Test heading tree, byte ranges and code-fence handling"""
+        content = (
+            "# Architecture Guide\n"
+            "Intro text here.\n"
+            "## Security Considerations\n"
+            "Use TLS everywhere.\n"
+            "```markdown\n"
+            "## Deployment Strategy\n"
+            "```\n"
+            "### Secrets\n"
+            "Vault.\n"
+            "## Performance Requirements\n"
+            "Fast.\n"
+        )
+        path = Path("docs/design/test-project/architecture_guide.md")
+        path.write_text(content)
+
+        outline = MarkdownOutline.from_file(path)
+        titles = [(n.level, n.title) for n in outline.headings()]
+        assert titles == [(1, "Architecture Guide"), (2, "Security Considerations"),
+                          (3, "Secrets"), (2, "Performance Requirements")]
+
+        security = outline.root.children[0].children[0]
+        assert content.encode()[security.start:security.end].startswith(b"## Security Considerations")
+        assert content.encode()[security.end:].startswith(b"## Performance Requirements")
+        assert security.word_count == 3 + 3 + 1
+
+        # Sections mentioned only in body text or code blocks do not count
+        found = outline.find_sections(["Security Considerations", "Deployment Strategy"])
+        assert list(found) == ["Security Considerations"]
+
+    def test_memory_mapped_outline_matches_line_reader(self, temp_project):
+        """Test that the chunked memory-map reader builds the same outline"""
+        content = (
+            "# Data Design\r\n"
+            "intro words split across chunks\r\n"
+            "## Database Schema\n"
+            "   ```\n"
+            "## not a heading\n"
+            "  ````  \n"
+            "### Tables ###\n"
+            + "longwordthatcrosseschunkboundaries " * 50 + "\n"
+            "~~~\n"
+            "# still code\n"
+        )
+        path = Path("docs/design/test-project/database_design.md")
+        path.write_bytes(content.encode())
+
+        expected = MarkdownOutline.from_file(path, use_mmap=False)
+        assert MarkdownOutline.from_file(path, use_mmap=True).root == expected.root
+        for chunk_size in (1, 5, 64):
+            assert MarkdownOutline.from_buffer(content.encode(), chunk_size).root == expected.root
+        assert [n.title for n in expected.headings()] == ["Data Design", "Database Schema", "Tables"]
+
+    def test_incremental_refresh_and_watcher(self, temp_project):
+        """Test that a document change re-evaluates only downstream agents"""
+        enforcer = SPARCWorkflowEnforcer("test-project", "docs/design")
+        design_dir = Path("docs/design/test-project")
+        watcher = DesignDocumentWatcher(design_dir, poll_interval=0.05)
+
+        assert len(enforcer.refresh_statuses()) == len(enforcer.agent_sequence)
+
+        (design_dir / "visual_concepts.md").write_text("## Visual Style Concepts\n## Color Palettes\n")
+        changed = watcher.wait_for_changes(timeout=5)
+        watcher.close()
+        assert "visual_concepts.md" in changed
+
+        recomputed = enforcer.refresh_statuses([enforcer.get_agent_for_document(name) for name in changed])
+        assert set(recomputed) == {"visual-style-specialist", "project-planner", "senior-coder", "tdd-guard-tester"}
+        assert recomputed["visual-style-specialist"].completed
+        assert not recomputed["project-planner"].dependencies_met
+
+    def test_parallel_multi_project_status(self, temp_project):
+        """Test concurrent status evaluation across all projects"""
+        for project in ["alpha", "beta", "gamma"]:
+            Path(f"docs/design/{project}").mkdir(parents=True, exist_ok=True)
+        Path("docs/design/beta/product_requirements.md").write_text("## Elevator Pitch\n")
+
+        records = list(iter_project_statuses("docs/design", max_workers=2))
+        by_project = {r["project_name"]: r for r in records}
+        assert set(by_project) == {"alpha", "beta", "gamma", "test-project"}
+        assert by_project["beta"]["agents"]["product-manager"]["completed"]
+        assert not by_project["alpha"]["agents"]["product-manager"]["completed"]
+
+    def test_streaming_compliance_report(self, temp_project):
+        """Test that multi-project reports stream each project as it is evaluated"""
+        for project in ["alpha", "beta"]:
+            Path(f"docs/design/{project}").mkdir(parents=True, exist_ok=True)
+        Path("docs/design/beta/product_requirements.md").write_text("## Elevator Pitch\n")
+
+        output = io.StringIO()
+        written_before = []
+
+        def records():
+            for record in iter_project_statuses("docs/design", max_workers=1, report=True):
+                written_before.append(len(output.getvalue()))
+                yield record
+
+        assert ComplianceReportRenderer(output, "json").render(records()) == 3
+        assert written_before[0] > 0 and written_before[1] > written_before[0]
+        report = json.loads(output.getvalue())
+        beta = next(p for p in report["projects"] if p["project_name"] == "beta")
+        assert "Who is this app for" in beta["missing_sections"]["product-manager"]
+        assert report["summary"] == {"projects": 3, "ready": 0, "errors": 0}
+
+        markdown = io.StringIO()
+        ComplianceReportRenderer(markdown).render(iter_project_statuses("docs/design", max_workers=1, report=True))
+        assert "## Project: beta" in markdown.getvalue() and "### Agent Status Overview" in markdown.getvalue()
+        html_report = io.StringIO()
+        ComplianceReportRenderer(html_report, "html").render([{"project_name": "<x>", "error": "boom"}])
+        assert "<h2>Project: &lt;x&gt;</h2>" in html_report.getvalue()
+
+    def test_fuzzy_section_matching(self, temp_project):
+        """Test that near-miss section headings match above the configured threshold"""
+        content = b"# Design\n## Tech Stack\n## API Endpoints\n## Typograpy\n## Performance Considerations\n"
+        outline = MarkdownOutline.from_lines(content.splitlines(True))
+        required = ["Technology Stack", "Endpoint Specifications", "Typography", "Security Considerations"]
+
+        found = outline.find_sections(required, threshold=0.75)
+        assert found["Technology Stack"].title == "Tech Stack"
+        assert found["Endpoint Specifications"].title == "API Endpoints"
+        assert found["Typography"].title == "Typograpy"
+        assert "Security Considerations" not in found
+        assert outline.find_sections(required, threshold=1.0) == {}
+
+        enforcer = SPARCWorkflowEnforcer("test-project", "docs/design")
+        assert enforcer.section_match_threshold == 0.75
+
+    def test_section_depth_metrics(self, temp_project):
+        """Test per-section depth metrics and configured minimums"""
+        content = ("# Guide\n## Technology Stack\n- Python\n- SQLite\n1. Later\n| a | b |\n|---|---|\n\n"
+                   "| c |\n```\n- not a bullet\n| not a table\n```\n### Notes\n* nested\n## Security Considerations\n")
+        outline = MarkdownOutline.from_lines(content.encode().splitlines(True))
+        stack = outline.find_sections(["Technology Stack"])["Technology Stack"]
+        assert (stack.bullet_count, stack.code_block_count, stack.table_count) == (4, 1, 2)
+        for chunk_size in (3, 64):
+            assert MarkdownOutline.from_buffer(content.encode(), chunk_size).root == outline.root
+
+        config = json.loads((Path(__file__).parent.parent / "scripts" / "sparc-agent-graph.json").read_text())
+        architect = next(a for a in config["agents"] if a["name"] == "solution-architect")
+        architect["section_depth"] = {"Security Considerations": {"min_words": 5}}
+        Path("graph.json").write_text(json.dumps(config))
+
+        design_dir = Path("docs/design/test-project")
+        (design_dir / "architecture_guide.md").write_text("".join(f"## {s}\n" for s in architect["required_sections"]))
+        enforcer = SPARCWorkflowEnforcer("test-project", "docs/design", config_path=Path("graph.json"))
+        assert enforcer.get_agent_status("solution-architect").validation_score == 5 / 6
+        missing = enforcer.get_missing_sections(enforcer._evaluate_statuses())["solution-architect"]
+        assert missing == ["Security Considerations (too shallow: 0/5 words)"]
+
+    def test_design_consistency_index(self, temp_project):
+        """Test cross-document entity and endpoint checks and their content-hash cache"""
+        design_dir = Path("docs/design/test-project")
+        (design_dir / "api_specification.md").write_text(
+            "| GET | `/api/v1/users/{user_id}` |\n| GET | /api/v1/invoices/{id} |\n"
+            "```python\nclass ProductCreate(BaseModel):\n    pass\n"
+            "@router.post(\"/api/v1/orders/\")\n```\n")
+        (design_dir / "database_design.md").write_text(
+            "## Key Entities\n1. **User**\n```mermaid\nerDiagram\n    USER ||--o{ INVOICES : receives\n```\n")
+        (design_dir / "implementation_plan.md").write_text("- POST /api/v1/orders\n- PUT /api/v1/users/:id\n")
+
+        cache = DesignIndexCache(Path("design-cache"))
+        paths = [design_dir / name for name in ["api_specification.md", "database_design.md", "implementation_plan.md"]]
+        mismatches = cache.check(*paths)
+        assert [(kind, line) for kind, _, line, _ in mismatches] == [
+            ("api_entity_not_in_data_model", 4), ("plan_endpoint_not_in_api", 2)
+        ]
+        assert "'Product'" in mismatches[0][3] and "PUT /api/v1/users/:id" in mismatches[1][3]
+
+        second = DesignIndexCache(Path("design-cache"))
+        assert second.check(*paths) == mismatches and second.reindexed == []
+
+        enforcer = SPARCWorkflowEnforcer("test-project", "docs/design")
+        violations = enforcer._check_design_consistency()
+        assert [v.agent for v in violations] == ["senior-api-developer", "project-planner"]
+        assert not any(v.blocking for v in violations)
+
+        # Router prefixes apply to their routes; parameters only expose collections
+        index = extract_design_index(
+            b'router = APIRouter(prefix="/users")\n@router.get("/{user_id}")\n| GET | /api/{version}/health/{check} |\n')
+        assert list(index["endpoints"]) == ["GET /users/{}", "GET /api/{}/health/{}"]
+        assert list(index["exposed"]) == ["user"]
+
+    def test_tdd_guard_single_parse_metrics(self, temp_project, monkeypatch):
+        """Test that all TDD checks of a file share one parse and one metrics traversal"""
+        code = "def public(x):\n    if x and x > 1:\n        return 1\n    return 0\n\ndef _private():\n    pass\n"
+        parses = []
+        real_parse = ast.parse
+        monkeypatch.setattr(ast, "parse", lambda *args, **kwargs: parses.append(1) or real_parse(*args, **kwargs))
+
+        enforcer = TDDGuardEnforcer(temp_project)
+        violations = enforcer.validate_tdd_compliance("src/calc.py", code)
+        assert len(parses) == 1
+        assert [v.description for v in violations if v.violation_type == "untested_function"] == [
+            "Function 'public' appears to have no tests"
+        ]
+
+        metrics = enforcer._python_metrics(code)
+        assert [(f.name, f.length, f.complexity) for f in metrics.functions] == [("public", 3, 3), ("_private", 1, 1)]
+        assert enforcer._python_metrics("def broken(:\n") is None
+
+    def test_tdd_guard_complexity_visitor(self, temp_project):
+        """Test innermost-function attribution, async, match, comprehensions, handlers and class aggregates"""
+        code = """
+class Service:
+    async def fetch(self, items):
+        try:
+            return [i for i in items if i]
+        except ValueError:
+            return []
+        except KeyError:
+            return None
+
+    def route(self, command):
+        def inner(x):
+            return x if x else 0
+        match command:
+            case "a":
+                return 1
+            case _:
+                for c in command:
+                    with open(c):
+                        while c:
+                            if c:
+                                if c == "x":
+                                    pass
+                                elif c == "y":
+                                    pass
+"""
+        metrics = TDDGuardEnforcer(temp_project)._python_metrics(code)
+        functions = {f.qualified_name: f for f in metrics.functions}
+        assert functions["Service.fetch"].is_async
+        assert functions["Service.fetch"].complexity == 5  # comprehension loop + filter, two handlers
+        assert functions["inner"].complexity == 2 and functions["inner"].class_name is None
+        assert functions["Service.route"].complexity == 8  # inner's conditional is not counted here
+        assert functions["Service.route"].nesting_depth == 6
+        assert [(c.name, c.methods, c.total_complexity, c.max_complexity) for c in metrics.classes] == [
+            ("Service", 2, 13, 8)
+        ]
+
+        violations = TDDGuardEnforcer(temp_project).validate_tdd_compliance("src/service.py", code)
+        assert {(v.violation_type, v.description) for v in violations} >= {
+            ("high_complexity", "Function 'Service.route' has high complexity (8)"),
+            ("deep_nesting", "Function 'Service.route' nests 6 blocks deep")
+        }
+
+    def test_tdd_guard_test_identifier_index(self, temp_project):
+        """Test that untested-function checks use the persisted identifier index"""
+        code = "def add(x, y):\n    return x + y\n\ndef address():\n    pass\n\ndef multiply(x, y):\n    return x * y\n"
+        Path("src/calc.py").write_text(code)
+        Path("tests/test_calc.py").write_text("def test_add_handles_negatives():\n    assert True\n")
+        Path("tests/test_other.py").write_text("from src.calc import multiply\n")
+
+        enforcer = TDDGuardEnforcer(temp_project)
+        untested = [v.description for v in enforcer.validate_tdd_compliance("src/calc.py", code)
+                    if v.violation_type == "untested_function"]
+        assert untested == ["Function 'address' appears to have no tests", "Function 'multiply' appears to have no tests"]
+        assert sorted(enforcer.test_index.retokenized) == ["tests/test_calc.py", "tests/test_other.py"]
+
+        Path("tests/test_calc.py").write_text("from src.calc import add, multiply\n\ndef test_address(): pass\n")
+        second = TDDGuardEnforcer(temp_project)
+        assert [v for v in second.validate_tdd_compliance("src/calc.py", code)
+                if v.violation_type == "untested_function"] == []
+        assert second.test_index.retokenized == ["tests/test_calc.py"]
+        assert second.test_index.references("multiply") == {"tests/test_calc.py", "tests/test_other.py"}
+
+        # A test file edit re-indexes only that file, so later checks find nothing left to re-tokenize
+        Path("tests/test_other.py").write_text("from src.calc import address\n")
+        edited = TDDGuardEnforcer(temp_project)
+        edited.enforce_tdd_on_file_change("tests/test_other.py", Path("tests/test_other.py").read_text())
+        assert edited.test_index.retokenized == ["tests/test_other.py"]
+        assert edited.test_index.references("address") == {"tests/test_calc.py", "tests/test_other.py"}
+        third = TDDGuardEnforcer(temp_project)
+        third.validate_tdd_compliance("src/calc.py", code)
+        assert third.test_index.retokenized == []
+
+    def test_tdd_guard_test_file_map(self, temp_project):
+        """Test the cached single-walk map from source stems to test files"""
+        Path("src/services").mkdir()
+        Path("src/services/user_service.py").write_text("")
+        Path("src/app.ts").write_text("")
+        Path("tests/unit").mkdir()
+        Path("tests/unit/test_user_service.py").write_text("")
+        Path("node_modules/pkg").mkdir(parents=True)
+        Path("node_modules/pkg/test_app.js").write_text("")
+
+        enforcer = TDDGuardEnforcer(temp_project)
+        test_map = enforcer.test_map.refresh()
+        assert test_map.source_files == ["src/app.ts", os.path.join("src", "services", "user_service.py")]
+        assert test_map.tests_for("src/services/user_service.py") == [os.path.join("tests", "unit", "test_user_service.py")]
+        assert enforcer._has_corresponding_tests("src/services/user_service.py")
+        assert not enforcer._has_corresponding_tests("src/app.ts")
+
+        warm = TestFileMap(temp_project, enforcer.test_patterns, enforcer.src_patterns, Path(".claude/cache")).refresh()
+        assert warm.listed == [] and warm.by_stem == test_map.by_stem
+
+        Path("src/app.test.ts").write_text("")
+        rewalked = TestFileMap(temp_project, enforcer.test_patterns, enforcer.src_patterns, Path(".claude/cache")).refresh()
+        assert rewalked.listed == ["src"]
+        assert rewalked.tests_for("src/app.ts") == [os.path.join("src", "app.test.ts")]
+
+        Path("src/services/__init__.py").write_text("")
+        Path("tests/unit/test_init.py").write_text("")
+        Path("tests/unit/conftest.py").write_text("")
+        Path("src/services/userService.test.js").write_text("")
+        Path("tests/services").mkdir()
+        Path("tests/services/test_user_service.py").write_text("")
+        scoped = TestFileMap(temp_project, enforcer.test_patterns, enforcer.src_patterns, Path(".claude/cache")).refresh()
+        assert scoped.tests_for("src/services/user_service.py") == [os.path.join("tests", "services", "test_user_service.py")]
+        assert scoped.tests_for("src/services/__init__.py") == [] and scoped.tests_for("conftest.py") == []
+        assert scoped.tests_for("src/lib/user_service.py") == [os.path.join("tests", "services", "test_user_service.py"),
+                                                               os.path.join("tests", "unit", "test_user_service.py")]
+
+    def test_tdd_guard_validate_tree(self, temp_project):
+        """Test that tree validation gives the same ordered violations serially and in a process pool"""
+        for i in range(12):
+            body = "".join(f"    if x > {j}:\n        x -= 1\n" for j in range(12))
+            Path(f"src/module_{i:02d}.py").write_text(f"def handler_{i}(x):\n{body}    return x\n")
+        Path("tests/test_module_03.py").write_text("from module_03 import handler_3\n")
+        Path("components").mkdir()
+        Path("components/Button.tsx").write_text("export function Button() {\n  return null;\n}\n")
+
+        serial = list(TDDGuardEnforcer(temp_project).validate_tree(max_workers=1))
+        pooled = list(TDDGuardEnforcer(temp_project).validate_tree(max_workers=2, chunk_size=3))
+
+        assert pooled == serial
+        assert [v.file_path for v in serial if v.violation_type == "high_complexity"] == \
+            [os.path.join("src", f"module_{i:02d}.py") for i in range(12)]
+        assert os.path.join("src", "module_03.py") not in {v.file_path for v in serial
+                                                            if v.violation_type == "missing_tests"}
+        assert os.path.join("components", "Button.tsx") in {v.file_path for v in serial
+                                                             if v.violation_type == "missing_tests"}
+
+    def test_tdd_guard_violation_cache(self, temp_project):
+        """Test that unchanged files are answered from the violation cache and edits invalidate it"""
+        for i in range(4):
+            Path(f"src/module_{i}.py").write_text(f"def handler_{i}(x):\n    return x\n")
+
+        cold = TDDGuardEnforcer(temp_project)
+        first = list(cold.validate_tree(max_workers=1))
+        assert cold.violation_cache.hits == 0 and cold.violation_cache.misses == 4
+
+        warm = TDDGuardEnforcer(temp_project)
+        assert list(warm.validate_tree(max_workers=1)) == first
+        assert warm.violation_cache.hits == 4 and not warm.violation_cache.modified
+
+        Path("tests/test_module_2.py").write_text("from module_2 import handler_2\n")
+        Path("src/module_3.py").write_text("def handler_3(x):\n    return -x\n")
+        edited = TDDGuardEnforcer(temp_project)
+        violations = list(edited.validate_tree(max_workers=1))
+        assert edited.violation_cache.hits == 2
+        assert os.path.join("src", "module_2.py") not in {v.file_path for v in violations}
+
+        edited.rule_version = "changed"
+        edited.violation_cache = ViolationCache(Path(".claude/cache"), max_entries=3)
+        assert edited.validate_tdd_compliance("src/module_0.py", Path("src/module_0.py").read_text()) == \
+            [v for v in first if v.file_path == "src/module_0.py"]
+        assert edited.violation_cache.hits == 0
+        edited.violation_cache.save()
+        with sqlite3.connect(".claude/cache/violations.db") as connection:
+            assert connection.execute("SELECT COUNT(*) FROM violations").fetchone()[0] == 3
+
+    def test_tdd_guard_diff_scoped_validation(self, temp_project):
+        """Test that diff-scoped validation only checks functions overlapping changed hunks"""
+        body = "".join(f"    if x > {j}:\n        x -= 1\n" for j in range(6))
+        source = Path("src/service.py")
+        source.write_text(f"def alpha(x):\n{body}    return x\n\n\ndef beta(x):\n{body}    return x\n")
+        subprocess.run(["git", "add", "."], check=True)
+        subprocess.run(["git", "commit", "-m", "Add service"], check=True, capture_output=True)
+
+        enforcer = TDDGuardEnforcer(temp_project)
+        assert enforcer.validate_diff() == []
+
+        source.write_text(source.read_text().replace("def beta(x):\n", "def beta(x):\n    x += 1\n"))
+        changed = {v.description for v in enforcer.validate_diff()}
+        assert any("'beta'" in d for d in changed) and not any("'alpha'" in d for d in changed)
+        assert enforcer.validate_diff(staged=True) == []
+
+        subprocess.run(["git", "add", "src/service.py"], check=True)
+        assert {v.description for v in enforcer.validate_diff(staged=True)} == changed
+
+        diff = "diff --git a/m.py b/m.py\n--- a/m.py\n+++ b/m.py\n@@ -3,0 +4,2 @@\n+a\n+b\n@@ -9 +10,0 @@\n-c\n"
+        assert parse_diff_hunks(diff) == {"m.py": [(4, 5), (10, 10)]}
+
+    def test_incomplete_draft_does_not_block_edit(self, temp_project, monkeypatch):
+        """Test that an incomplete design document is reported without rejecting the edit"""
+        commands = []
+        def fake_run(cmd, **kwargs):
+            commands.append(cmd[2])
+            return subprocess.CompletedProcess(cmd, 1 if cmd[2] == "check-document" else 0, "score 40%", "")
+        monkeypatch.setattr(subprocess, "run", fake_run)
+
+        hooks = FrameworkIntegrationHooks()
+        assert hooks._validate_workflow_post_edit("docs/design/test-project/product_requirements.md", "")
+        assert commands == ["check-document", "validate-agent"]
+
+    def test_hooks_design_document_set(self, temp_project):
+        """Test that only design-phase outputs and the technology lock trigger design-document hooks"""
+        hooks = FrameworkIntegrationHooks()
+        design_dir = "docs/design/test-project"
+        assert hooks._is_design_document(f"{design_dir}/implementation_plan.md")
+        assert hooks._is_design_document(f"{design_dir}/technology-lock.json")
+        assert hooks._get_agent_for_document(f"{design_dir}/api_specification.md") == "senior-api-developer"
+        for report in ["implementation_status.md", "testing_report.md"]:
+            assert not hooks._is_design_document(f"{design_dir}/{report}")
+            assert hooks._get_agent_for_document(f"{design_dir}/{report}") is None
+
+    def test_agent_graph_closure_and_cache(self, temp_project):
+        """Test the compiled agent graph and its on-disk cache"""
+        config = Path(__file__).parent.parent / "scripts" / "sparc-agent-graph.json"
+        graph = AgentGraph.load(config, cache_dir=Path("graph-cache"))
+
+        assert graph.depends_on("project-planner", "product-manager")
+        assert not graph.depends_on("visual-style-specialist", "data-architect")
+        assert graph.blocked_by("visual-style-specialist") == ["project-planner", "senior-coder", "tdd-guard-tester"]
+        assert graph.agent_for_document("docs/design/x/api_specification.md") == "senior-api-developer"
+        assert len(list(Path("graph-cache").glob("agent-graph-*.json"))) == 1
+
+        issue_manager = SPARCGitIssueManager("test-project")
+        violation = FrameworkViolation("design_gap", "high", "design", "ux-designer", "Gap")
+        assert issue_manager._get_blocked_agents(violation).startswith("visual-style-specialist, data-architect")
+
+        with pytest.raises(ValueError):
+            AgentGraph.compile([
+                {"name": "a", "output_file": "a.md", "dependencies": ["b"]},
+                {"name": "b", "output_file": "b.md", "dependencies": ["a"]}
+            ])
+
+    def test_what_if_reports_unblocked_agents(self, temp_project):
+        """Test the reverse-dependency what-if query"""
+        enforcer = SPARCWorkflowEnforcer("test-project", "docs/design")
+        design_dir = Path("docs/design/test-project")
+        prd_sections = enforcer.agent_graph.get_agent("product-manager")["required_sections"]
+        (design_dir / "product_requirements.md").write_text("".join(f"## {s}\n" for s in prd_sections))
+        arch_sections = enforcer.agent_graph.get_agent("solution-architect")["required_sections"]
+        (design_dir / "architecture_guide.md").write_text("".join(f"## {s}\n" for s in arch_sections[:4]))
+
+        assert enforcer.what_if("solution-architect") == ["ux-designer"]
+        assert enforcer.what_if("product-manager") == []
+        # ux-designer alone cannot unblock data-architect while the architecture guide is incomplete
+        assert enforcer.what_if("ux-designer") == ["visual-style-specialist"]
+
+        # Edits made after the first query are picked up without an explicit refresh
+        (design_dir / "architecture_guide.md").write_text("".join(f"## {s}\n" for s in arch_sections))
+        assert enforcer.what_if("solution-architect") == []
+
+    def test_execution_plan_waves_and_critical_path(self, temp_project):
+        """Test concurrent execution waves and the weighted critical path"""
+        enforcer = SPARCWorkflowEnforcer("test-project", "docs/design")
+        design_dir = Path("docs/design/test-project")
+        for agent_name in ["product-manager", "solution-architect", "ux-designer"]:
+            agent = enforcer.agent_graph.get_agent(agent_name)
+            (design_dir / agent["output_file"]).write_text("".join(f"## {s}\n" for s in agent["required_sections"]))
+
+        durations = {"visual-style-specialist": 10.0, "data-architect": 100.0, "senior-api-developer": 50.0}
+        plan = enforcer.get_execution_plan(durations=durations)
+
+        assert plan["ready"] == ["visual-style-specialist", "data-architect"]
+        assert plan["waves"][1] == ["senior-api-developer"]
+        assert plan["critical_path"][:3] == ["data-architect", "senior-api-developer", "project-planner"]
+
+        # History comes from document mtimes: ux-designer finished 60s after its latest dependency
+        os.utime(design_dir / "architecture_guide.md", (1000, 1000))
+        os.utime(design_dir / "product_requirements.md", (900, 900))
+        os.utime(design_dir / "ux_design.md", (1060, 1060))
+        assert enforcer.historical_durations()["ux-designer"] == 60.0
+
+    def test_status_snapshot_store_history(self, temp_project, monkeypatch):
+        """Test snapshot recording, score reuse by content hash and trend queries"""
+        store = StatusSnapshotStore(Path("status.db"))
+        design_dir = Path("docs/design/test-project")
+        prd = design_dir / "product_requirements.md"
+        prd_sections = AgentGraph.load().get_agent("product-manager")["required_sections"]
+        prd.write_text("".join(f"## {s}\n" for s in prd_sections[:2]))
+
+        SPARCWorkflowEnforcer("test-project", "docs/design", snapshot_store=store).get_workflow_status()
+        prd.write_text("".join(f"## {s}\n" for s in prd_sections))
+        SPARCWorkflowEnforcer("test-project", "docs/design", snapshot_store=store).get_workflow_status()
+
+        history = store.score_history("product-manager", "test-project")
+        assert [h["validation_score"] for h in history] == [2 / len(prd_sections), 1.0]
+        assert history[0]["content_hash"] != history[1]["content_hash"]
+        assert [phase for _, phase in store.phase_history("test-project")] == [0, 1]
+        assert set(store.time_in_phase("test-project")) == {0, 1}
+
+        # Unchanged contents reuse the stored score without re-scoring
+        enforcer = SPARCWorkflowEnforcer("test-project", "docs/design", snapshot_store=store)
+        enforcer._validate_document_completeness = lambda path, sections: pytest.fail("document re-scored")
+        assert enforcer.get_agent_status("product-manager").validation_score == 1.0
+        store.close()
+
+        # Only the latest passes are kept, and a scorer change invalidates stored scores
+        pruned = StatusSnapshotStore(Path("pruned.db"), max_passes=2)
+        status = enforcer.get_agent_status("product-manager")
+        for recorded_at in range(5):
+            pruned.record("test-project", {"product-manager": status}, {}, {"product-manager": "rules"}, recorded_at)
+        assert [h["recorded_at"] for h in pruned.score_history("product-manager")] == [3, 4]
+        pruned.close()
+
+        rules_hash = StatusSnapshotStore.sections_hash(prd_sections)
+        monkeypatch.setattr(sparc_workflow_enforcer, "SCORER_VERSION", sparc_workflow_enforcer.SCORER_VERSION + 1)
+        assert StatusSnapshotStore.sections_hash(prd_sections) != rules_hash
+
+    def test_replay_history_rescores_changed_blobs_only(self, temp_project):
+        """Test per-commit status replay from git objects without checkouts"""
+        design_dir = Path("docs/design/test-project")
+        prd = design_dir / "product_requirements.md"
+        prd_sections = AgentGraph.load().get_agent("product-manager")["required_sections"]
+
+        def commit(message):
+            subprocess.run(["git", "add", "-A"], check=True)
+            subprocess.run(["git", "commit", "-qm", message], check=True)
+
+        prd.write_text("".join(f"## {s}\n" for s in prd_sections[:4]))
+        commit("Draft PRD")
+        Path("src/app.py").write_text("print('hi')\n")
+        commit("Unrelated change")
+        prd.write_text("".join(f"## {s}\n" for s in prd_sections))
+        (design_dir / "architecture_guide.md").write_text("## Architecture Overview\n")
+        commit("Complete PRD")
+        prd.write_text("".join(f"## {s}\n" for s in prd_sections[:4]))
+        commit("Revert PRD")
+
+        records = list(replay_history("HEAD", "test-project", "docs/design"))
+        assert [r["rescored"] for r in records] == [["product-manager"], [], ["product-manager", "solution-architect"], []]
+        assert [r["status"]["agents"]["product-manager"]["validation_score"] for r in records] == [0.5, 0.5, 1.0, 0.5]
+        assert records[2]["status"]["current_phase"] == 1
+        assert records[1]["status"] is records[0]["status"]
+
     def test_technology_lock_compliance(self, temp_project):
         """Test technology lock compliance validation"""
         enforcer = SPARCWorkflowEnforcer("test-project", "docs/design")
@@ -259,6 +837,93 @@ Modern, responsive web interface with clean design.
         critical_violations = [v for v in violations if v.severity == "critical"]
         assert len(critical_violations) == 0
     
+    def test_source_import_scanner(self, temp_project):
+        """Test import extraction, lock enforcement and the per-file scan cache"""
+        Path("src/api.py").write_text("import os\nimport fastapi\nfrom requests.adapters import HTTPAdapter\nfrom . import models\n")
+        Path("src/models.py").write_text("import api\n")
+        Path("src/app.tsx").write_text(
+            "// import x from 'commented'\n"
+            "import React from 'react';\n"
+            "export { Button } from './Button';\n"
+            "const v = require('vue/dist');\n"
+            "const s = `import y from 'template'`;\n"
+        )
+        assert [m for m, _ in extract_js_imports(Path("src/app.tsx").read_bytes())] == ["react", "./Button", "vue/dist"]
+
+        tech_lock_path = Path("docs/design/test-project/technology-lock.json")
+        tech_lock_path.write_text(json.dumps({
+            "frontend": {"framework": "React"}, "backend": {"framework": "FastAPI"},
+            "database": {"type": "PostgreSQL"}, "deployment": {"platform": "AWS"},
+            "imports": {"python": {"allow": ["fastapi"]}, "javascript": {"deny": ["vue"]}}
+        }))
+        enforcer = SPARCWorkflowEnforcer("test-project", "docs/design")
+        violations = [v.description for v in enforcer._check_technology_lock_compliance()]
+        assert violations == [
+            "src/api.py:3 imports 'requests', which is not in the technology-lock.json allow list",
+            "src/app.tsx:4 imports 'vue', which is denied by technology-lock.json"
+        ]
+
+        # Later scans only re-read changed files
+        scanner = ImportScanner(".")
+        scanner.scan()
+        assert scanner.rescanned == []
+        Path("src/models.py").write_text("import api\nimport flask\n")
+        assert ImportScanner(".").scan()["src/models.py"] == ("python", [("api", 1), ("flask", 2)])
+
+        # Only top-level packages are first party, and only source roots are scanned
+        Path("app/clients/requests").mkdir(parents=True)
+        Path("app/clients/requests/helper.py").write_text("import requests\n")
+        Path("docs/tool.py").write_text("import django\n")
+        assert "requests" not in ImportScanner(".").first_party_modules(["app/clients/requests/helper.py"])
+        assert [v.description.split(" ")[0] for v in enforcer._check_technology_lock_compliance()] == [
+            "app/clients/requests/helper.py:1", "src/api.py:3", "src/app.tsx:4", "src/models.py:2"
+        ]
+
+    def test_dependency_manifest_validation(self, temp_project):
+        """Test manifest and lockfile checks against the technology lock"""
+        trie = PackageRuleTrie(["@types/*", "lodash.get"], ["lodash*"])
+        assert [trie.check(p) is None for p in ["@types/node", "lodash.get", "lodash-es", "vue"]] == [True, True, False, False]
+
+        Path("requirements.txt").write_text("FastAPI==0.104.1\nsqlmodel>=0.0.8 ; python_version > '3.8'\nFlask==3.0\n")
+        Path("web").mkdir()
+        Path("web/package.json").write_text(json.dumps({"dependencies": {
+            "react": "^17.0.2", "@types/react": "18.2.0", "left-pad": "1.3.0"}}))
+        Path("web/package-lock.json").write_text(json.dumps({"packages": {
+            "": {}, "node_modules/react": {"version": "17.0.2"}, "node_modules/left-pad": {"version": "1.3.0"},
+            "node_modules/loose-envify": {"version": "1.4.0"}
+        }}))
+        # Nested example manifests are not the project's
+        Path("web/examples").mkdir()
+        Path("web/examples/package.json").write_text(json.dumps({"dependencies": {"vue": "3.0.0"}}))
+        Path("docs/design/test-project/technology-lock.json").write_text(json.dumps({
+            "frontend": {"framework": "React", "version": "18.2.0"},
+            "backend": {"framework": "FastAPI", "version": "0.104.1"},
+            "database": {"type": "PostgreSQL"}, "deployment": {"platform": "AWS"},
+            "dependencies": {"python": {"allow": ["fastapi", "SQLModel"]}, "javascript": {"allow": ["react", "@types/*"], "deny": ["left-pad"]}}
+        }))
+
+        enforcer = SPARCWorkflowEnforcer("test-project", "docs/design")
+        violations = [v.description for v in enforcer._check_technology_lock_compliance()]
+        assert violations == [
+            "requirements.txt declares 'Flask': not in the technology-lock.json allow list",
+            "web/package-lock.json declares 'react': version 17.0.2 does not match the locked 18.2.0",
+            "web/package.json declares 'react': version ^17.0.2 does not match the locked 18.2.0",
+            "web/package.json declares 'left-pad': denied by technology-lock.json"
+        ]
+
+        # Unchanged manifests are served from the cache
+        scanner = ManifestScanner(".")
+        scanner.scan()
+        assert scanner.reparsed == []
+
+        # Ranges conflict only when they exclude the pin, and pins stay in their own ecosystem
+        policy = PackagePolicy.from_technology_lock(
+            json.loads(Path("docs/design/test-project/technology-lock.json").read_text()), "dependencies")
+        assert [policy.check_version("javascript", "react", s) for s in ["^18.0.0", ">=18,<19", "18.x"]] == [None] * 3
+        assert [policy.check_version("python", "fastapi", s) for s in [">=0.104,<0.105", "~=0.104.0"]] == [None] * 2
+        assert policy.check_version("javascript", "react", ">=18 <18.2") is not None
+        assert "react" not in policy.versions["python"]
+
     def test_framework_setup_script(self, temp_project):
         """Test framework setup script functionality"""
         # Copy setup script to temp directory